@@ -0,0 +1,129 @@
+import time
+import asyncio
+
+from lxml import html
+from PySide6.QtCore import QThread, Signal
+
+from app.src.batch_scrape_engine import BatchScrapeEngine, ScrapeJob
+from app.src.rule_matcher import RuleMatcher
+from app.src.xpath_extractor import extract_rules
+from app.services.http_client import HttpClient
+from app.services.image_downloader import ImageDownloader
+from app.utils import Logger, tr
+
+
+class RequestsFetcher:
+    """
+    Fetch function of the BatchScrapeEngine: loads a page with the shared HttpClient (keep-alive
+    per host) and applies the job's rules.
+    """
+
+    def __init__(self, http_client: HttpClient, images: ImageDownloader = None):
+        self.http_client = http_client
+        self.images = images
+
+    def __call__(self, job: ScrapeJob) -> dict:
+        response = self.http_client.get(job.url, cached=True)
+        response.raise_for_status()
+
+        tree = html.fromstring(response.content)
+        image_sources = []
+        data = extract_rules(tree, job.rules, on_image=lambda src, count: image_sources.append((src, count)))
+        if image_sources and self.images is not None:
+            # downloaded in the ImageDownloader's own pool, the next page doesn't wait for them
+            self.images.download(job.url_hash, image_sources, referer=response.url)
+        return data
+
+
+class BatchScrapeWorker(QThread):
+    """
+    Scrapes a list of tabs (group, window, session) with the BatchScrapeEngine.
+
+    The rules are resolved per tab with the RuleMatcher; tabs without rules are skipped. Each
+    result is emitted as it comes in (the UI hands it to the DBWriter), the counters at most every
+    PROGRESS_INTERVAL seconds.
+    """
+    tab_scraped = Signal(object)                   # dict: url, url_hash, uuid, rules, data
+    tab_failed = Signal(str, str)                  # url, error
+    scrape_progress = Signal(int, int, int, int)   # scraped, failed, skipped, total
+    scrape_finished = Signal(object)               # dict: scraped, failed, skipped, total, cancelled
+
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, matcher: RuleMatcher, tabs: list, fetch, concurrency: int = 8, per_domain: int = 2, parent=None):
+        super().__init__(parent)
+        self.matcher = matcher
+        self.tabs = tabs
+        self.engine = BatchScrapeEngine(fetch, concurrency=concurrency, per_domain=per_domain)
+        self.logger = Logger.get_logger("BatchScrapeWorker")
+        self.scraped = 0
+        self.failed = 0
+        self.skipped = 0
+        self._last_progress = 0.0
+
+    @property
+    def paused(self) -> bool:
+        return self.engine.paused
+
+    def pause(self):
+        self.engine.pause()
+
+    def resume(self):
+        self.engine.resume()
+
+    def cancel(self):
+        self.engine.cancel()
+
+    def run(self):
+        cancelled = True
+        try:
+            jobs = self._jobs()
+            self._emit_progress(force=True)
+            started = time.perf_counter()
+            cancelled = not asyncio.run(self.engine.run(jobs, self._on_result))
+            self.logger.info(
+                f"Batch scrape of {len(jobs)} tabs: {self.scraped} scraped, {self.failed} failed "
+                f"({time.perf_counter() - started:.1f} s, up to {self.engine.max_in_flight} parallel)"
+            )
+        except Exception as e:
+            self.logger.error(f"{tr('Batch scraping failed', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+        self._emit_progress(force=True)
+        self.scrape_finished.emit({
+            "scraped": self.scraped,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "total": len(self.tabs),
+            "cancelled": cancelled,
+        })
+
+    def _jobs(self) -> list:
+        jobs = []
+        for tab in self.tabs:
+            url = tab.get("url", "")
+            url_hash = tab.get("url_hash")
+            if not url or not url_hash:
+                self.skipped += 1
+                continue
+            _domain, _url_contains, rules = self.matcher.resolve(url)
+            if not rules:
+                self.skipped += 1
+                continue
+            # limited per host, with and without www. counting as one
+            jobs.append(ScrapeJob(url, url_hash, tab.get("uuid"), RuleMatcher.normalized_domain(url), rules))
+        return jobs
+
+    def _on_result(self, job: ScrapeJob, data, error):
+        if error is None:
+            self.scraped += 1
+            self.tab_scraped.emit({"url": job.url, "url_hash": job.url_hash, "uuid": job.uuid, "rules": job.rules, "data": data})
+        else:
+            self.failed += 1
+            self.logger.debug(f"Scraping {job.url} failed: {error}")
+            self.tab_failed.emit(job.url, error)
+        self._emit_progress()
+
+    def _emit_progress(self, force=False):
+        now = time.monotonic()
+        if force or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.scrape_progress.emit(self.scraped, self.failed, self.skipped, len(self.tabs))
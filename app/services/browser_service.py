@@ -0,0 +1,268 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright, Error as PlaywrightError
+from PySide6.QtCore import QThread
+
+from app.services.http_cache import HttpCache
+from app.utils import Logger, tr
+
+
+class PageResult:
+    """A page loaded by the BrowserService: final URL, rendered HTML and the cookies of its context"""
+    __slots__ = ("url", "html", "cookies")
+
+    def __init__(self, url: str, html: str, cookies: list):
+        self.url = url
+        self.html = html
+        self.cookies = cookies
+
+
+class _ContextSlot:
+    """A warm browser context of one domain and the page it reuses"""
+    __slots__ = ("browser", "context", "page")
+
+    def __init__(self, browser, context, page=None):
+        self.browser = browser
+        self.context = context
+        self.page = page
+
+
+class BrowserService(QThread):
+    """
+    Keeps one headless Chromium alive for all Playwright scrapes, driven by an event loop in this
+    thread. fetch() may be called from any thread and returns a concurrent.futures.Future.
+
+    Each domain gets up to CONTEXTS_PER_DOMAIN browser contexts with one page each; the page is
+    reused for the next URL of the domain. Contexts stay open between scrapes, so cookies (a
+    passed Cloudflare check, a login) are kept. Of more than MAX_DOMAINS domains the least recently
+    used ones are closed, their storage state (cookies, localStorage) goes to their next context.
+
+    If Chromium crashes it is started again, and the fetch that hit the crash is retried once.
+
+    With an HttpCache the documents (not the scripts, images, ...) are routed through it: a fresh
+    entry is fulfilled without a request, an older one is revalidated with its ETag/Last-Modified.
+    """
+    CONTEXTS_PER_DOMAIN = 2
+    MAX_DOMAINS = 8
+    MAX_STORAGE_STATES = 100
+    PAGE_TIMEOUT = 30000   # ms
+
+    def __init__(self, headers: dict = None, cache: HttpCache = None, parent=None):
+        super().__init__(parent)
+        self.headers = headers or {}
+        self.cache = cache if cache is not None and cache.enabled else None
+        self.logger = Logger.get_logger("BrowserService")
+        self._loop = None
+        self._ready = threading.Event()
+        # Only used in the service thread
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._idle = OrderedDict()            # domain -> idle _ContextSlots, least recently used first
+        self._slots = {}                      # domain -> asyncio.Semaphore(CONTEXTS_PER_DOMAIN)
+        self._storage_states = OrderedDict()  # domain -> storage state of its closed contexts
+
+    # ---------- Any thread ----------
+
+    def fetch(self, url: str) -> Future:
+        """Loads a page, the Future resolves to a PageResult (or raises the Playwright error)"""
+        if not self._ready.wait(10) or self._loop is None:
+            raise RuntimeError("Browser service is not running")
+        return asyncio.run_coroutine_threadsafe(self._fetch(url), self._loop)
+
+    def stop(self):
+        """Closes the browser and ends the thread (blocks until then)"""
+        if not self.isRunning():
+            return
+        self._ready.wait()
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        self.wait()
+
+    # ---------- Service thread ----------
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._browser_lock = asyncio.Lock()
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._loop = None
+            # fetches that are still running are cancelled, then the browser is closed
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+            self._ready.clear()
+
+    async def _fetch(self, url: str) -> PageResult:
+        domain = (urlsplit(url).hostname or "").lower()
+        for attempt in range(2):
+            await self._ensure_browser()
+            slot = await self._acquire(domain)
+            loaded = False
+            try:
+                result = await self._load(slot.page, url)
+                loaded = True
+                return result
+            except PlaywrightError as e:
+                if attempt == 0 and not slot.browser.is_connected():
+                    self.logger.warning(f"Browser crashed while loading {url}, restarting it: {e}")
+                    continue
+                raise
+            finally:
+                await self._release(domain, slot, loaded)
+
+    async def _load(self, page, url: str) -> PageResult:
+        await page.goto(url, wait_until='domcontentloaded', timeout=self.PAGE_TIMEOUT)
+
+        # Handle Cloudflare or similar protection
+        title = await page.title()
+        if "just a moment" in title.lower() or "bitte warten" in title.lower():
+            await page.wait_for_timeout(5000)
+
+        return PageResult(page.url, await page.content(), await page.context.cookies())
+
+    async def _route(self, route):
+        """Answers page requests from the HttpCache, everything else goes to the network"""
+        request = route.request
+        if request.resource_type != "document" or request.method != "GET":
+            await route.continue_()
+            return
+
+        loop = asyncio.get_running_loop()
+        url = request.url
+        entry = await loop.run_in_executor(None, self.cache.load, url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.logger.debug(f"Cache hit: {url}")
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=entry["body"])
+            return
+
+        headers = dict(request.headers)
+        if entry is not None:
+            headers.update({k.lower(): v for k, v in self.cache.validators(entry).items()})
+        try:
+            # redirects are left to the browser, so page.url ends up where they lead
+            response = await route.fetch(headers=headers, max_redirects=0)
+            body = await response.body()
+        except PlaywrightError as e:
+            self.logger.debug(f"Fetching {url} for the cache failed, handing it to the browser: {e}")
+            await route.continue_()
+            return
+
+        if response.status == 304 and entry is not None:
+            self.logger.debug(f"Cache revalidated: {url}")
+            await loop.run_in_executor(None, self.cache.renew, url, entry, response.headers)
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=entry["body"])
+            return
+        await loop.run_in_executor(None, self.cache.store, url, url, response.status, response.headers, body)
+        # the body is already decoded, the browser must not decode it again
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._browser is not None:
+                self.logger.warning("Browser disconnected, starting a new one")
+            await self._close_browser()
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except PlaywrightError:
+                # the driver itself may be gone - start it again once
+                await self._stop_playwright()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            self.logger.info("Browser started")
+
+    async def _acquire(self, domain: str) -> _ContextSlot:
+        semaphore = self._slots.setdefault(domain, asyncio.Semaphore(self.CONTEXTS_PER_DOMAIN))
+        await semaphore.acquire()
+        try:
+            idle = self._idle.get(domain)
+            if idle:
+                slot = idle.pop()
+            else:
+                context = await self._browser.new_context(
+                    extra_http_headers=self.headers,
+                    storage_state=self._storage_states.pop(domain, None)
+                )
+                if self.cache is not None:
+                    await context.route("**/*", self._route)
+                slot = _ContextSlot(self._browser, context)
+            if slot.page is None or slot.page.is_closed():
+                slot.page = await slot.context.new_page()
+            return slot
+        except BaseException:
+            semaphore.release()
+            raise
+
+    async def _release(self, domain: str, slot: _ContextSlot, loaded: bool):
+        """Puts a slot back into the pool, or drops it if its browser is gone"""
+        try:
+            if slot.browser is not self._browser or not slot.browser.is_connected():
+                return
+            if not loaded and slot.page is not None:
+                # keep the context (cookies), but start over with a fresh page
+                try:
+                    await slot.page.close()
+                except PlaywrightError:
+                    pass
+                slot.page = None
+            self._idle.setdefault(domain, []).append(slot)
+            self._idle.move_to_end(domain)
+            await self._evict()
+        finally:
+            self._slots[domain].release()
+
+    async def _evict(self):
+        while len(self._idle) > self.MAX_DOMAINS:
+            domain, slots = self._idle.popitem(last=False)
+            for slot in slots:
+                try:
+                    self._storage_states[domain] = await slot.context.storage_state()
+                    self._storage_states.move_to_end(domain)
+                    await slot.context.close()
+                except PlaywrightError as e:
+                    self.logger.debug(f"Closing the context of {domain} failed: {e}")
+            while len(self._storage_states) > self.MAX_STORAGE_STATES:
+                self._storage_states.popitem(last=False)
+
+    async def _close_browser(self):
+        self._idle.clear()
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except PlaywrightError as e:
+                self.logger.debug(f"Closing the browser failed: {e}")
+
+    async def _stop_playwright(self):
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                self.logger.debug(f"Stopping Playwright failed: {e}")
+
+    async def _shutdown(self):
+        try:
+            await self._close_browser()
+            await self._stop_playwright()
+            self.logger.info("Browser closed")
+        except Exception as e:
+            self.logger.error(f"{tr('Error closing the browser', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
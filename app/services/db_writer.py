@@ -0,0 +1,118 @@
+import time
+import queue
+
+from PySide6.QtCore import QThread, Signal
+
+from app.utils.db_handler import DBHandler
+from app.utils import Logger, tr
+
+_STOP = object()
+
+
+class ExtractedDataJob:
+    """Extracted values of one tab, waiting for the DBWriter. rows are (rule_id, value) pairs."""
+    __slots__ = ("session_id", "url", "url_hash", "rows")
+
+    def __init__(self, session_id: int, url: str, url_hash: str, rows: list):
+        self.session_id = session_id
+        self.url = url
+        self.url_hash = url_hash
+        self.rows = rows
+
+
+class DBWriter(QThread):
+    """
+    The only thread that writes scraper results, so the GUI thread never waits on SQLite.
+
+    Jobs go into a bounded queue. The writer takes everything that is queued when it wakes up
+    (or arrives within GROUP_WINDOW, up to MAX_BATCH jobs) and saves it in one transaction, then
+    reads the stored data of each tab back and reports it with write_finished.
+    """
+    write_finished = Signal(object)   # dict: url, url_hash, tab_id, saved, stored_data
+    write_failed = Signal(str, str)   # url, error
+    batch_committed = Signal(int)     # number of jobs in the transaction
+
+    QUEUE_SIZE = 256
+    MAX_BATCH = 64
+    GROUP_WINDOW = 0.02   # seconds to wait for more jobs before committing
+
+    def __init__(self, db: DBHandler, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.logger = Logger.get_logger("DBWriter")
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._overflow = []   # jobs that did not fit into the queue (GUI thread only)
+        self.batch_committed.connect(self._requeue_overflow)
+
+    def submit(self, job: ExtractedDataJob):
+        """Queues a job without blocking. If the queue is full it is queued after the next commit."""
+        if self._overflow:
+            self._overflow.append(job)
+            return
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._overflow.append(job)
+            self.logger.debug(f"Write queue full, {len(self._overflow)} job(s) waiting")
+
+    def stop(self):
+        """Writes everything that is still queued, then ends the thread (blocks until then)"""
+        if not self.isRunning():
+            return
+        for job in self._overflow:
+            self._queue.put(job)
+        self._overflow.clear()
+        self._queue.put(_STOP)
+        self.wait()
+
+    def _requeue_overflow(self):
+        while self._overflow:
+            try:
+                self._queue.put_nowait(self._overflow[0])
+            except queue.Full:
+                return
+            self._overflow.pop(0)
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            batch = [job]
+            deadline = time.monotonic() + self.GROUP_WINDOW
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    job = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._write(batch)
+
+    def _write(self, batch: list):
+        try:
+            saved = self.db.save_extracted_results([(job.session_id, job.url_hash, job.url, job.rows) for job in batch])
+        except Exception as e:
+            self.logger.error(f"{tr('Failed to save extracted data', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+            for job in batch:
+                self.write_failed.emit(job.url, str(e))
+            self.batch_committed.emit(len(batch))
+            return
+
+        for job, (tab_id, count) in zip(batch, saved):
+            try:
+                stored_data = self.db.load_extracted_data_for_url(job.url)
+            except Exception as e:
+                self.logger.error(f"{tr('Failed to load extracted data', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+                stored_data = None
+            self.write_finished.emit({
+                "url": job.url,
+                "url_hash": job.url_hash,
+                "tab_id": tab_id,
+                "saved": count,
+                "stored_data": stored_data,
+            })
+        self.batch_committed.emit(len(batch))
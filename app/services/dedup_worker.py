@@ -0,0 +1,30 @@
+from PySide6.QtCore import QThread, Signal
+
+from app.src.dedup_engine import DedupEngine
+from app.utils import Logger, tr
+
+
+class DedupWorker(QThread):
+    """
+    Runs the DedupEngine outside of the GUI thread. The clusters are rendered by the UI afterwards.
+    """
+    dedup_finished = Signal(object)   # list of DuplicateCluster
+    dedup_failed = Signal(str)
+
+    def __init__(self, engine: DedupEngine, tabs: list, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.tabs = tabs
+        self.logger = Logger.get_logger("DedupWorker")
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            clusters = self.engine.find(self.tabs, cancel_check=self.isInterruptionRequested)
+            if not self.isInterruptionRequested():
+                self.dedup_finished.emit(clusters)
+        except Exception as e:
+            self.logger.error(f"{tr('Error finding duplicates', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+            self.dedup_failed.emit(str(e))
@@ -0,0 +1,130 @@
+import base64
+import binascii
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PySide6.QtCore import QObject, QBuffer, QByteArray, Qt, Signal, Slot
+from PySide6.QtGui import QIcon, QImage, QPixmap
+
+from app.services.favicon_store import FaviconStore
+from app.utils import Logger, tr
+
+# Memory entry of a domain without favicon file that was looked up without a data: URI -
+# a later tab of that domain that has one is loaded again
+_NO_FILE = object()
+
+
+class FaviconCache(QObject):
+    """
+    Favicons of the session tabs, one per domain.
+
+    A favicon comes from the FaviconStore or, the first time, from the data: URI Firefox stored
+    with the tab (decoded, scaled down to MAX_SIZE and put into the store as PNG). Both happen in a
+    small pool: icon() answers from memory only and starts the load, icon_loaded tells when to
+    repaint. The memory holds the icons as an LRU bounded by MAX_BYTES, domains without a favicon
+    are remembered too.
+    """
+    icon_loaded = Signal(str)                 # domain (found a favicon or not)
+    _loaded = Signal(str, QImage, bool)       # domain, image (null if none), a data: URI was given
+
+    MAX_SIZE = 32
+    MAX_BYTES = 32 * 1024 * 1024
+    MISSING_BYTES = 64   # what a "no favicon" entry is counted as
+
+    def __init__(self, store: FaviconStore, parent=None):
+        super().__init__(parent)
+        self.logger = Logger.get_logger("FaviconCache")
+        self.store = store
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="FaviconCache")
+        self._closed = False
+        # GUI thread only
+        self._icons: "OrderedDict[str, object]" = OrderedDict()   # domain -> (QIcon | None | _NO_FILE, bytes)
+        self._bytes = 0
+        self._loading = set()
+        self._loaded.connect(self._on_loaded)
+
+    # ---------- GUI thread ----------
+
+    def icon(self, domain: str, favicon: Optional[str] = None) -> Optional[QIcon]:
+        """The favicon of a domain from memory; None if it has none or is still loading (then it's loaded)"""
+        entry = self._icons.get(domain)
+        if entry is not None:
+            self._icons.move_to_end(domain)
+            icon = entry[0]
+            if icon is not _NO_FILE or not (favicon and favicon.startswith("data:image")):
+                return None if icon is _NO_FILE else icon
+        if domain not in self._loading and not self._closed:
+            self._loading.add(domain)
+            self._pool.submit(self._load, domain, favicon if favicon and favicon.startswith("data:image") else None)
+        return None
+
+    def is_loading(self, domain: str) -> bool:
+        return domain in self._loading
+
+    def close(self):
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @Slot(str, QImage, bool)
+    def _on_loaded(self, domain: str, image: QImage, had_data: bool):
+        self._loading.discard(domain)
+        if image.isNull():
+            self._put(domain, None if had_data else _NO_FILE, self.MISSING_BYTES)
+        else:
+            self._put(domain, QIcon(QPixmap.fromImage(image)), image.sizeInBytes())
+        self.icon_loaded.emit(domain)
+
+    def _put(self, domain: str, icon, size: int):
+        old = self._icons.pop(domain, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._icons[domain] = (icon, size)
+        self._bytes += size
+        while self._bytes > self.MAX_BYTES and len(self._icons) > 1:
+            _domain, (_icon, old_size) = self._icons.popitem(last=False)
+            self._bytes -= old_size
+
+    # ---------- Pool threads ----------
+
+    def _load(self, domain: str, favicon: Optional[str]):
+        image = QImage()
+        try:
+            image = self._read(domain, favicon)
+        except Exception as e:
+            self.logger.warning(f"({tr('Error processing favicon for', 'session_populator')}) {domain}: {e} |#| ({type(e).__name__})", exc_info=True)
+        finally:
+            self._loaded.emit(domain, image, favicon is not None)
+
+    def _read(self, domain: str, favicon: Optional[str]) -> QImage:
+        data = self.store.get(domain)
+        if data is not None:
+            image = QImage.fromData(data, "PNG")
+            if not image.isNull():
+                return image
+            self.logger.warning(f"({tr('Failed to load cached favicon for', 'session_populator')}) {domain}")
+        if favicon is None:
+            return QImage()
+
+        try:
+            decoded_data = base64.b64decode(favicon.split(",", 1)[1])
+        except (IndexError, binascii.Error) as e:
+            self.logger.warning(f"({tr('Error processing favicon for', 'session_populator')}) {domain}: {e} |#| ({type(e).__name__})")
+            return QImage()
+        image = QImage()
+        if not image.loadFromData(QByteArray(decoded_data)):
+            self.logger.warning(f"({tr('Failed to load pixmap from base64 data for', 'session_populator')}) {domain}")
+            return QImage()
+        # Skaliere nur, wenn größer als MAX_SIZE (nur verkleinern, nicht vergrößern)
+        if image.width() > self.MAX_SIZE or image.height() > self.MAX_SIZE:
+            image = image.scaled(self.MAX_SIZE, self.MAX_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # Speichere das (skalierte) Bild als PNG (nur einmal)
+        png = QByteArray()
+        buffer = QBuffer(png)
+        buffer.open(QBuffer.WriteOnly)
+        if image.save(buffer, "PNG"):
+            self.store.put(domain, png.data())
+        else:
+            self.logger.warning(f"Failed to encode favicon of {domain}")
+        return image
@@ -0,0 +1,140 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+
+from app.utils import Logger
+
+
+class FaviconStore:
+    """
+    All cached favicons in one SQLite file (<favicon dir>/favicons.sqlite) instead of a PNG per
+    domain - tens of thousands of small files make the directory slow to list and to back up.
+
+    The PNG data is stored once per content hash (many domains share the same icon), the domains
+    point to it and remember when they were last used. Favicons unused for MAX_AGE_DAYS are removed
+    when the store is opened. PNG files left by older versions are moved into the store once.
+    Used by the FaviconCache pool and the bookmark exporter: one connection behind a lock.
+    """
+    FILE_NAME = "favicons.sqlite"
+    MAX_AGE_DAYS = 365
+    SCHEMA_VERSION = 1   # PRAGMA user_version after the PNG migration
+
+    def __init__(self, cache_dir: str = "user_data/favicons"):
+        self.logger = Logger.get_logger("FaviconStore")
+        self.cache_dir = cache_dir
+        self.db_path = os.path.join(cache_dir, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._used = set()   # domains whose last_used was updated in this run
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS favicon_data (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS favicons (
+                domain TEXT PRIMARY KEY,
+                hash TEXT NOT NULL REFERENCES favicon_data(hash),
+                last_used INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_favicons_hash ON favicons(hash);")
+        self._conn.commit()
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._migrate_png_files()
+        self.prune(self.MAX_AGE_DAYS)
+
+    def get(self, domain: str) -> Optional[bytes]:
+        """The PNG data of a domain's favicon, or None"""
+        with self._lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT d.data FROM favicons f JOIN favicon_data d ON d.hash = f.hash WHERE f.domain = ?", (domain,)
+            ).fetchone()
+            if row is not None and domain not in self._used:
+                # once per run is enough for the age
+                self._used.add(domain)
+                self._conn.execute("UPDATE favicons SET last_used = ? WHERE domain = ?", (int(time.time()), domain))
+                self._conn.commit()
+        return row[0] if row is not None else None
+
+    def put(self, domain: str, data: bytes) -> None:
+        """Stores the PNG data of a domain's favicon (replacing its old one)"""
+        content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self._lock:
+            if self._conn is None:
+                return
+            row = self._conn.execute("SELECT hash FROM favicons WHERE domain = ?", (domain,)).fetchone()
+            self._put(domain, content_hash, data, int(time.time()))
+            if row is not None and row[0] != content_hash:
+                self._conn.execute("DELETE FROM favicon_data WHERE hash = ? AND NOT EXISTS "
+                                   "(SELECT 1 FROM favicons WHERE hash = ?)", (row[0], row[0]))
+            self._conn.commit()
+            self._used.add(domain)
+
+    def prune(self, max_age_days: int) -> int:
+        """Removes the favicons not used for max_age_days, returns how many"""
+        with self._lock:
+            if self._conn is None:
+                return 0
+            cursor = self._conn.execute("DELETE FROM favicons WHERE last_used < ?",
+                                        (int(time.time()) - max_age_days * 86400,))
+            removed = cursor.rowcount
+            if removed:
+                self._delete_unused_data()
+                self.logger.info(f"Removed {removed} favicons unused for {max_age_days} days")
+            self._conn.commit()
+        return removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- Internals (holding the lock) ----------
+
+    def _put(self, domain: str, content_hash: str, data: bytes, last_used: int):
+        self._conn.execute("INSERT OR IGNORE INTO favicon_data (hash, data) VALUES (?, ?)", (content_hash, data))
+        self._conn.execute("INSERT OR REPLACE INTO favicons (domain, hash, last_used) VALUES (?, ?, ?)",
+                           (domain, content_hash, last_used))
+
+    def _delete_unused_data(self):
+        self._conn.execute("DELETE FROM favicon_data WHERE hash NOT IN (SELECT hash FROM favicons)")
+
+    def _migrate_png_files(self):
+        """Moves the {domain}.png files of older versions into the store (once, then they are removed)"""
+        moved = []
+        now = int(time.time())
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or not entry.name.endswith(".png"):
+                    continue
+                with open(entry.path, "rb") as f:
+                    data = f.read()
+                if data:
+                    self._put(entry.name[:-len(".png")], hashlib.blake2b(data, digest_size=16).hexdigest(), data, now)
+                moved.append(entry.path)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self._conn.commit()
+        except Exception as e:
+            self._conn.rollback()
+            self.logger.error(f"Favicon migration failed: {e} |#| ({type(e).__name__})", exc_info=True)
+            return
+
+        for path in moved:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if moved:
+            self.logger.info(f"Moved {len(moved)} favicon files into {self.db_path}")
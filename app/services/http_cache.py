@@ -0,0 +1,164 @@
+import os
+import time
+import pickle
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+import lz4.block
+
+from app.utils import Logger, tr
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages for the scraping engines, so re-scraping a tab after editing a
+    rule doesn't load the page again.
+
+    One lz4-compressed entry per URL holds status, headers and body. Entries younger than the TTL
+    are served as they are; older ones are revalidated with their ETag / Last-Modified (a 304
+    renews them). The TTL is our own - Cache-Control of the server is not looked at, shops send
+    no-cache for nearly every page. Only 200 responses are stored.
+    The directory is size-bounded, least recently used entries are removed first.
+    """
+    MAGIC = b"FFSHC\x00\x01\x00"   # bump the last bytes when the payload layout changes
+    ENTRY_SUFFIX = ".bin"
+    # Not stored: describe the transfer (the body is stored decoded) or must not be replayed
+    SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "set-cookie"}
+
+    def __init__(self, cache_dir: str = "user_data/cache/http", max_size_mb: int = 256, ttl_minutes: int = 60):
+        self.logger = Logger.get_logger("HttpCache")
+        self.cache_dir = cache_dir
+        self.max_size = max(0, int(max_size_mb)) * 1024 * 1024
+        self.ttl = max(0, int(ttl_minutes)) * 60
+        self._lock = threading.Lock()
+        self._total = None   # bytes on disk, counted on the first store
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    # ---------- Entries ----------
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry of a URL (url, status, headers, body, stored) or None. Broken or outdated entries are removed."""
+        entry_path = self._entry_path(url)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, "rb") as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    raise ValueError("cache format changed")
+                entry = pickle.loads(lz4.block.decompress(f.read()))
+            os.utime(entry_path)  # LRU: last use = mtime
+            return entry
+        except Exception as e:
+            self.logger.warning(f"{tr('Discarding unreadable HTTP cache entry', 'warning')} {entry_path}: {e} |#| ({type(e).__name__})")
+            self._remove(entry_path)
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored"] < self.ttl
+
+    @staticmethod
+    def validators(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Headers for revalidating an entry (empty if the server sent neither ETag nor Last-Modified)"""
+        headers = {}
+        etag = entry["headers"].get("etag")
+        if etag:
+            headers["If-None-Match"] = etag
+        last_modified = entry["headers"].get("last-modified")
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, url: str, final_url: str, status: int, headers, body: bytes) -> None:
+        """Stores a response under the requested URL (final_url is where redirects ended)"""
+        if not self.enabled or status != 200:
+            return
+        self._write(url, {
+            "url": final_url,
+            "status": status,
+            "headers": {k.lower(): v for k, v in headers.items() if k.lower() not in self.SKIP_HEADERS},
+            "body": body,
+            "stored": time.time(),
+        })
+
+    def renew(self, url: str, entry: Dict[str, Any], headers) -> None:
+        """After a 304: the entry is fresh again, with the validators the server sent along"""
+        for name in ("etag", "last-modified"):
+            value = headers.get(name)
+            if value:
+                entry["headers"][name] = value
+        entry["stored"] = time.time()
+        self._write(url, entry)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.ENTRY_SUFFIX):
+                self._remove(os.path.join(self.cache_dir, name))
+        with self._lock:
+            self._total = None
+
+    # ---------- Internals ----------
+
+    def _entry_path(self, url: str) -> str:
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=20).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}{self.ENTRY_SUFFIX}")
+
+    def _write(self, url: str, entry: Dict[str, Any]) -> None:
+        """Writes an entry (atomic rename) and evicts old entries if the cache grew too large."""
+        entry_path = self._entry_path(url)
+        tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"   # scrapers run in parallel
+        try:
+            data = lz4.block.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+            try:
+                old_size = os.stat(entry_path).st_size
+            except OSError:
+                old_size = 0
+            with open(tmp_path, "wb") as f:
+                f.write(self.MAGIC)
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            self.logger.warning(f"{tr('Failed to write HTTP cache entry', 'warning')}: {e} |#| ({type(e).__name__})")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._total is not None:
+                self._total += len(self.MAGIC) + len(data) - old_size
+            if self._total is None or self._total > self.max_size:
+                self._evict(keep=entry_path)
+
+    def _evict(self, keep: str = None) -> None:
+        """Counts the directory and removes the least recently used entries beyond max_size (holding the lock)"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(self.ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        # Oldest first; the entry just written stays even if it alone is larger than the limit
+        if total > self.max_size:
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                self._remove(path)
+                total -= size
+                self.logger.debug(f"Evicted HTTP cache entry {path}")
+        self._total = total
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,284 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.utils.logger import Logger
+from app.services.http_cache import HttpCache
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes 'br' only with it
+    BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI = True
+    except ImportError:
+        BROTLI = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+logger = Logger.get_logger("HttpClient")
+
+
+def request_headers(settings) -> Dict[str, str]:
+    """Default browser headers, overridden by the browser_agent/* settings"""
+    headers = dict(DEFAULT_HEADERS)
+    try:
+        headers.update({
+            k.split("/")[1]: settings.get(k) for k in settings._defaults if k.startswith("browser_agent/")
+        })
+    except Exception as e:
+        logger.warning(f"Failed to load headers from settings: {e} |#| ({type(e).__name__})", exc_info=True)
+    return headers
+
+
+class HttpError(Exception):
+    """A request that failed: connection, timeout, too many redirects, status >= 400 or a too large body"""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class HttpResponse:
+    """The (fully read) answer of HttpClient.get(), headers are case-insensitive"""
+    __slots__ = ("url", "status_code", "headers", "content")
+
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(f"HTTP {self.status_code} for {self.url}", self.status_code)
+
+
+class HttpClient:
+    """
+    One HTTP client for all scrapers and image downloads.
+
+    Each host gets its own session (connection pool with keep-alive, cookies), created on first
+    use; of more than MAX_HOSTS hosts the least recently used sessions are closed. The client is
+    thread-safe, workers and pool threads share it.
+
+    With http2=True and httpx (with h2) installed, requests go through one httpx.Client with
+    HTTP/2 instead. The browser_agent/* headers are computed once (reload_settings() after the
+    settings changed); 'br' is only accepted if a brotli decoder is installed.
+
+    get(url, cached=True) answers from the HttpCache if one is given (pages, not images).
+    """
+    MAX_HOSTS = 64
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, headers: Dict[str, str] = None, connect_timeout: float = 10, read_timeout: float = 30,
+                 max_redirects: int = 10, max_body_bytes: int = 20 * 1024 * 1024, pool_size: int = 10, http2: bool = False,
+                 cache: HttpCache = None):
+        self.logger = logger
+        self.headers = self._supported_headers(headers or {})
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_redirects = max_redirects
+        self.max_body_bytes = max_body_bytes
+        self.pool_size = pool_size
+        self.cache = cache if cache is not None and cache.enabled else None
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, requests.Session]" = OrderedDict()
+        self._httpx = None
+        if http2:
+            self._httpx = self._httpx_client()
+
+    @classmethod
+    def from_settings(cls, settings, cache: HttpCache = None) -> "HttpClient":
+        return cls(
+            headers=request_headers(settings),
+            connect_timeout=settings.get("http/connect_timeout", type=float),
+            read_timeout=settings.get("http/read_timeout", type=float),
+            max_redirects=settings.get("http/max_redirects", type=int),
+            max_body_bytes=settings.get("http/max_body_mb", type=int) * 1024 * 1024,
+            pool_size=settings.get("http/pool_size", type=int),
+            http2=settings.get("http/http2", type=bool),
+            cache=cache,
+        )
+
+    def reload_settings(self, settings):
+        """Takes over changed headers (the connection settings apply to new clients)"""
+        self.headers = self._supported_headers(request_headers(settings))
+
+    # ---------- Requests ----------
+
+    def get(self, url: str, headers: Dict[str, str] = None, timeout: float = None, cookies: List[dict] = None,
+            cached: bool = False) -> HttpResponse:
+        """
+        GET with the client's headers (plus `headers`), following at most max_redirects redirects.
+        cookies: Playwright-style dicts (name, value, domain, path) sent with this request only.
+        cached: answer from / store into the HttpCache (a fresh entry means no request at all).
+        Raises HttpError if the request fails or the body exceeds max_body_bytes.
+        """
+        merged_headers = {**self.headers, **headers} if headers else self.headers
+        request_timeout = (self.timeout[0], timeout) if timeout is not None else self.timeout
+        if cached and self.cache is not None:
+            return self._get_cached(url, merged_headers, request_timeout, cookies)
+        return self._get(url, merged_headers, request_timeout, cookies)
+
+    def download(self, url: str, sink, headers: Dict[str, str] = None, timeout: float = None, cookies: List[dict] = None,
+                 max_bytes: int = None) -> HttpResponse:
+        """
+        Like get(), but the body is written chunk by chunk to `sink` (a binary file) instead of
+        being kept (the returned content is empty). Raises HttpError for status >= 400 before
+        anything is written, and if the body exceeds max_bytes (default max_body_bytes).
+        """
+        merged_headers = {**self.headers, **headers} if headers else self.headers
+        request_timeout = (self.timeout[0], timeout) if timeout is not None else self.timeout
+        return self._get(url, merged_headers, request_timeout, cookies, sink, max_bytes)
+
+    def _get(self, url, headers, timeout, cookies, sink=None, max_bytes=None) -> HttpResponse:
+        if self._httpx is not None:
+            return self._get_httpx(url, headers, timeout, cookies, sink, max_bytes)
+        return self._get_requests(url, headers, timeout, cookies, sink, max_bytes)
+
+    def _get_cached(self, url, headers, timeout, cookies) -> HttpResponse:
+        entry = self.cache.load(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.logger.debug(f"Cache hit: {url}")
+            return self._cached_response(entry)
+
+        if entry is not None:
+            headers = {**headers, **self.cache.validators(entry)}
+        response = self._get(url, headers, timeout, cookies)
+        if response.status_code == 304 and entry is not None:
+            self.logger.debug(f"Cache revalidated: {url}")
+            self.cache.renew(url, entry, response.headers)
+            return self._cached_response(entry)
+        self.cache.store(url, response.url, response.status_code, response.headers, response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(entry: dict) -> HttpResponse:
+        return HttpResponse(entry["url"], entry["status"], CaseInsensitiveDict(entry["headers"]), entry["body"])
+
+    def _get_requests(self, url, headers, timeout, cookies, sink=None, max_bytes=None) -> HttpResponse:
+        jar = None
+        if cookies:
+            jar = requests.cookies.RequestsCookieJar()
+            for cookie in cookies:
+                jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        try:
+            with self._session(url).get(url, headers=headers, timeout=timeout, cookies=jar, stream=True) as response:
+                if sink is not None and response.status_code >= 400:
+                    raise HttpError(f"HTTP {response.status_code} for {url}", response.status_code)
+                content = self._read_body(url, response.headers, response.iter_content(self.CHUNK_SIZE), sink, max_bytes)
+                return HttpResponse(response.url, response.status_code, CaseInsensitiveDict(response.headers), content)
+        except requests.exceptions.RequestException as e:
+            raise HttpError(f"{type(e).__name__}: {e}") from e
+
+    def _get_httpx(self, url, headers, timeout, cookies, sink=None, max_bytes=None) -> HttpResponse:
+        jar = None
+        if cookies:
+            jar = httpx.Cookies()
+            for cookie in cookies:
+                jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        try:
+            request = self._httpx.build_request(
+                "GET", url, headers=headers, cookies=jar,
+                timeout=httpx.Timeout(timeout[1], connect=timeout[0])
+            )
+            response = self._httpx.send(request, stream=True)
+            try:
+                if sink is not None and response.status_code >= 400:
+                    raise HttpError(f"HTTP {response.status_code} for {url}", response.status_code)
+                content = self._read_body(url, response.headers, response.iter_bytes(self.CHUNK_SIZE), sink, max_bytes)
+            finally:
+                response.close()
+            return HttpResponse(str(response.url), response.status_code, CaseInsensitiveDict(response.headers), content)
+        except httpx.HTTPError as e:
+            raise HttpError(f"{type(e).__name__}: {e}") from e
+
+    def _read_body(self, url, headers, chunks, sink=None, max_bytes=None) -> bytes:
+        """The body (bytearray appends are amortized linear), or b"" after writing it to sink"""
+        max_bytes = max_bytes or self.max_body_bytes
+        length = headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise HttpError(f"Response too large ({int(length)} bytes): {url}")
+        body = bytearray()
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise HttpError(f"Response larger than {max_bytes} bytes: {url}")
+            if sink is not None:
+                sink.write(chunk)
+            else:
+                body += chunk
+        return bytes(body)
+
+    # ---------- Sessions ----------
+
+    def _session(self, url: str) -> requests.Session:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}".lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None:
+                self._sessions.move_to_end(host)
+                return session
+            session = requests.Session()
+            session.max_redirects = self.max_redirects
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[host] = session
+            while len(self._sessions) > self.MAX_HOSTS:
+                _host, old = self._sessions.popitem(last=False)
+                old.close()   # requests still reading from it keep their connection
+            return session
+
+    def _httpx_client(self):
+        if httpx is None:
+            self.logger.warning("HTTP/2 needs httpx, using requests")
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                max_redirects=self.max_redirects,
+                limits=httpx.Limits(max_connections=self.pool_size * 4, max_keepalive_connections=self.pool_size * 2),
+            )
+        except ImportError as e:   # http2=True without the h2 package
+            self.logger.warning(f"HTTP/2 is not available, using requests: {e}")
+            return None
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        if self._httpx is not None:
+            self._httpx.close()
+
+    @staticmethod
+    def _supported_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        """Drops 'br' from Accept-Encoding if it couldn't be decoded"""
+        headers = dict(headers)
+        encoding = headers.get("Accept-Encoding")
+        if encoding and not BROTLI:
+            accepted = [part.strip() for part in encoding.split(",") if part.strip().split(";")[0] != "br"]
+            headers["Accept-Encoding"] = ", ".join(accepted) or "identity"
+        return headers
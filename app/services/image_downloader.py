@@ -0,0 +1,239 @@
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from PySide6.QtCore import QObject, Signal
+
+from app.services.http_client import HttpClient, HttpError
+from app.utils import Logger
+
+IMAGE_HEADERS = {'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8'}
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/pjpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/avif': '.avif',
+    'image/bmp': '.bmp',
+    'image/svg+xml': '.svg',
+    'image/x-icon': '.ico',
+    'image/vnd.microsoft.icon': '.ico',
+}
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.webp', '.gif', '.avif', '.bmp', '.svg', '.ico')
+
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    """File extension from the first bytes of an image, None if they aren't one we know"""
+    if head.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return '.png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return '.gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return '.avif'
+    if head.startswith(b'BM'):
+        return '.bmp'
+    if head.startswith(b'\x00\x00\x01\x00'):
+        return '.ico'
+    stripped = head.lstrip()
+    if stripped.startswith(b'<svg') or (stripped.startswith(b'<?xml') and b'<svg' in head):
+        return '.svg'
+    return None
+
+
+def find_image(image_dir: str, name: str) -> Optional[str]:
+    """Path of a downloaded image ({url_hash} or {url_hash}-{n}) whatever its format, or None"""
+    for ext in IMAGE_EXTENSIONS:
+        path = os.path.join(image_dir, f"{name}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class _PageDownloads:
+    """The images of one page still waiting, and how many of them are being downloaded"""
+    __slots__ = ("url_hash", "referer", "cookies", "pending", "running")
+
+    def __init__(self, url_hash: str, referer: str, cookies: Optional[list]):
+        self.url_hash = url_hash
+        self.referer = referer
+        self.cookies = cookies
+        self.pending = deque()   # (src, name)
+        self.running = 0
+
+
+class ImageDownloader(QObject):
+    """
+    Downloads the images found by the XPath image rules, in a pool of threads.
+
+    At most `per_page` images of a page are loaded at the same time (one page can't take the whole
+    pool); a finished download starts the next one of its page. Each image streams into a temp
+    file next to its target, which is renamed into place once complete - the UI only gets the path.
+    The extension comes from the Content-Type, or from the first bytes if that isn't an image
+    type. URLs that failed are not tried again for FAILED_TTL seconds.
+    With a ThumbnailCache the thumbnail of a page's first image is written right after it.
+    """
+    image_saved = Signal(str, str)    # url_hash, path
+    image_failed = Signal(str, str)   # url_hash, error
+
+    MAX_WORKERS = 8
+    FAILED_TTL = 30 * 60
+    MAX_FAILED = 2000
+    SNIFF_BYTES = 32
+
+    def __init__(self, http_client: HttpClient, image_dir: str, per_page: int = 4, max_bytes: int = 10 * 1024 * 1024,
+                 timeout: float = 20, thumbnails=None, parent=None):
+        super().__init__(parent)
+        self.logger = Logger.get_logger("ImageDownloader")
+        self.http_client = http_client
+        self.image_dir = image_dir
+        self.per_page = max(1, int(per_page))
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.thumbnails = thumbnails
+        self._pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="ImageDownloader")
+        self._lock = threading.Lock()
+        self._pages = {}                  # url_hash -> _PageDownloads
+        self._queued = set()              # (name, src) waiting or running
+        self._failed = OrderedDict()      # src -> time of the failure
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls, http_client: HttpClient, settings, thumbnails=None, parent=None) -> "ImageDownloader":
+        return cls(
+            http_client,
+            settings.get("image_cache_dir", type=str),
+            per_page=settings.get("image_downloads_per_page", type=int),
+            max_bytes=settings.get("image_max_mb", type=int) * 1024 * 1024,
+            thumbnails=thumbnails,
+            parent=parent,
+        )
+
+    def reload_settings(self, settings):
+        self.image_dir = settings.get("image_cache_dir", type=str)
+        self.per_page = max(1, settings.get("image_downloads_per_page", type=int))
+        self.max_bytes = settings.get("image_max_mb", type=int) * 1024 * 1024
+
+    # ---------- Any thread ----------
+
+    def download(self, url_hash: str, sources: Iterable[Tuple[str, int]], referer: str = "", cookies: List[dict] = None):
+        """
+        Queues the images of a page: sources are (src, n) - n = 0 is saved as {url_hash}, the
+        others as {url_hash}-{n}. Relative sources are resolved against the referer (the page).
+        Returns at once; image_saved / image_failed are emitted per image.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            page = self._pages.get(url_hash)
+            if page is None:
+                page = self._pages[url_hash] = _PageDownloads(url_hash, referer, cookies)
+            elif cookies:
+                page.cookies = cookies
+            now = time.monotonic()
+            for src, count in sources:
+                src = urljoin(referer, src) if referer else src
+                if not src.startswith(('http://', 'https://')):
+                    continue   # data: URIs, javascript:, broken values
+                name = f"{url_hash}-{count}" if count > 0 else url_hash
+                failed_at = self._failed.get(src)
+                if failed_at is not None and now - failed_at < self.FAILED_TTL:
+                    self.logger.debug(f"Skipping image that failed before: {src}")
+                    continue
+                if (name, src) in self._queued:
+                    continue   # e.g. the worker and "Load Images" asking for the same image
+                self._queued.add((name, src))
+                page.pending.append((src, name))
+            self._start_next(page)
+
+    def close(self):
+        """Drops the waiting downloads; running ones finish (their files are complete or removed)"""
+        with self._lock:
+            self._closed = True
+            self._pages.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- Pool threads ----------
+
+    def _start_next(self, page: _PageDownloads):
+        """Starts downloads of a page up to per_page (holding the lock)"""
+        while page.pending and page.running < self.per_page and not self._closed:
+            src, name = page.pending.popleft()
+            page.running += 1
+            self._pool.submit(self._run, page, src, name)
+        if not page.pending and not page.running:
+            self._pages.pop(page.url_hash, None)
+
+    def _run(self, page: _PageDownloads, src: str, name: str):
+        try:
+            path = self._download(src, name, page.referer, page.cookies)
+            if self.thumbnails is not None and name == page.url_hash:
+                try:
+                    self.thumbnails.create(path)
+                except Exception as e:
+                    self.logger.warning(f"Failed to create thumbnail of {path}: {e} |#| ({type(e).__name__})")
+            self.image_saved.emit(page.url_hash, path)
+        except Exception as e:
+            with self._lock:
+                self._failed[src] = time.monotonic()
+                self._failed.move_to_end(src)
+                while len(self._failed) > self.MAX_FAILED:
+                    self._failed.popitem(last=False)
+            level = self.logger.warning if isinstance(e, (HttpError, ValueError)) else self.logger.error
+            level(f"Image download failed: {src}: {e} |#| ({type(e).__name__})", exc_info=not isinstance(e, (HttpError, ValueError)))
+            self.image_failed.emit(page.url_hash, str(e))
+        finally:
+            with self._lock:
+                self._queued.discard((name, src))
+                page.running -= 1
+                if self._pages.get(page.url_hash) is page:
+                    self._start_next(page)
+
+    def _download(self, src: str, name: str, referer: str, cookies) -> str:
+        image_dir = self.image_dir
+        os.makedirs(image_dir, exist_ok=True)
+        tmp_path = os.path.join(image_dir, f"{name}.{threading.get_ident()}.part")
+        headers = dict(IMAGE_HEADERS)
+        if referer:
+            headers['Referer'] = referer
+        try:
+            with open(tmp_path, 'wb') as f:
+                response = self.http_client.download(src, f, headers=headers, timeout=self.timeout, cookies=cookies,
+                                                     max_bytes=self.max_bytes)
+            content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+            ext = CONTENT_TYPE_EXTENSIONS.get(content_type)
+            if ext is None:
+                # octet-stream, wrong or missing Content-Type: look at the file itself
+                with open(tmp_path, 'rb') as f:
+                    ext = sniff_extension(f.read(self.SNIFF_BYTES))
+            if ext is None:
+                raise ValueError(f"not an image (Content-Type: {content_type or 'none'})")
+
+            path = os.path.join(image_dir, f"{name}{ext}")
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # an older download of this image in another format must not shadow the new one
+        for other in IMAGE_EXTENSIONS:
+            if other != ext:
+                try:
+                    os.remove(os.path.join(image_dir, f"{name}{other}"))
+                except OSError:
+                    pass
+        self.logger.debug(f"Saved image {path} from {src}")
+        return path
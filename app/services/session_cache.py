@@ -0,0 +1,145 @@
+import os
+import json
+import pickle
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+import lz4.block
+
+from app.utils import Logger, tr
+
+
+class SessionCache:
+    """
+    On-disk cache of already parsed sessions (raw json, enriched tabs, groups and the closed-tab count).
+
+    Entries are stored by content hash, so a copied backup hits the same entry. A small index
+    maps path + size + mtime to the content hash, so unchanged files are not even hashed again.
+    The directory is size-bounded, least recently used entries are removed first.
+    """
+    MAGIC = b"FFSTC\x00\x03\x00"   # bump the last bytes when the payload layout changes
+    ENTRY_SUFFIX = ".bin"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str = "user_data/cache/sessions", max_size_mb: int = 256):
+        self.logger = Logger.get_logger("SessionCache")
+        self.cache_dir = cache_dir
+        self.max_size = max(0, int(max_size_mb)) * 1024 * 1024
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    # ---------- Fingerprint ----------
+
+    def content_hash(self, path: str) -> str:
+        """Returns the content hash of a session file, reusing the stored one if path, size and mtime are unchanged."""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            known = self._index.get(key)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            self._index[key] = [stat.st_size, stat.st_mtime_ns, content_hash]
+            self._write_index()
+        return content_hash
+
+    # ---------- Entries ----------
+
+    def load(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached payload or None. Broken or outdated entries are removed."""
+        entry_path = self._entry_path(content_hash)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, "rb") as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    raise ValueError("cache format changed")
+                payload = pickle.loads(lz4.block.decompress(f.read()))
+            os.utime(entry_path)  # LRU: last use = mtime
+            return payload
+        except Exception as e:
+            self.logger.warning(f"{tr('Discarding unreadable session cache entry', 'warning')} {entry_path}: {e} |#| ({type(e).__name__})")
+            self._remove(entry_path)
+            return None
+
+    def store(self, content_hash: str, payload: Dict[str, Any]) -> None:
+        """Writes a payload (atomic rename) and evicts old entries if the cache grew too large."""
+        if not self.max_size:
+            return
+        entry_path = self._entry_path(content_hash)
+        tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"   # a cancelled load of the same file may still be writing
+        try:
+            data = lz4.block.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+            with open(tmp_path, "wb") as f:
+                f.write(self.MAGIC)
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            self.logger.warning(f"{tr('Failed to write session cache entry', 'warning')}: {e} |#| ({type(e).__name__})")
+            self._remove(tmp_path)
+            return
+        self._evict(keep=entry_path)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.ENTRY_SUFFIX):
+                self._remove(os.path.join(self.cache_dir, name))
+        with self._lock:
+            self._index = {}
+            self._write_index()
+
+    # ---------- Internals ----------
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}{self.ENTRY_SUFFIX}")
+
+    def _evict(self, keep: str = None) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(self.ENTRY_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        # Oldest first; the entry just written stays even if it alone is larger than the limit
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+            self.logger.debug(f"Evicted session cache entry {path}")
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _read_index(self) -> Dict[str, list]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self) -> None:
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(f"{index_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(f"{index_path}.tmp", index_path)
+        except OSError as e:
+            self.logger.warning(f"{tr('Failed to write session cache index', 'warning')}: {e} |#| ({type(e).__name__})")
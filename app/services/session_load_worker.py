@@ -0,0 +1,53 @@
+from PySide6.QtCore import QThread, Signal
+
+from app.services.session_loader import SessionLoader, SessionLoadingError, SessionLoadCancelled
+from app.utils import Logger, tr
+
+
+class SessionLoadWorker(QThread):
+    """
+    Runs the expensive part of opening a session (cache lookup, decompress, parse, enrich, closed-tab count)
+    outside of the GUI thread. The tree itself is built afterwards in chunks on the GUI thread.
+    The loaded session only reaches the window with load_finished; a cancelled worker is left to run
+    to its next cancel check without anything it built being used.
+    """
+    stage_changed = Signal(str, int)       # stage key, percent (0-100)
+    load_finished = Signal(object)         # dict: path, tabs, groups, group_list, closed_tabs_count, session_parser, session_index, search_index, content_hash, session_id, rule_coverage
+    load_failed = Signal(str)
+    load_cancelled = Signal()
+
+    def __init__(self, session_loader: SessionLoader, path: str, parent=None):
+        super().__init__(parent)
+        self.session_loader = session_loader
+        self.path = path
+        self.logger = Logger.get_logger("SessionLoadWorker")
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            result = self.session_loader.load_session_file(
+                self.path,
+                progress_callback=self.stage_changed.emit,
+                cancel_check=self.isInterruptionRequested
+            )
+
+            self._check_cancelled("ui_build")
+            result["path"] = self.path
+            result["session_id"] = self.session_loader.get_session_id(self.path, result["content_hash"])
+            result["rule_coverage"] = self.session_loader.db.get_rule_matcher().coverage(result["tabs"])
+            self._check_cancelled("ui_build")
+            self.load_finished.emit(result)
+
+        except SessionLoadCancelled:
+            self.load_cancelled.emit()
+        except SessionLoadingError as e:
+            self.load_failed.emit(str(e))
+        except Exception as e:
+            self.logger.error(f"{tr('Unexpected error loading session', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+            self.load_failed.emit(str(e))
+
+    def _check_cancelled(self, stage):
+        if self.isInterruptionRequested():
+            raise SessionLoadCancelled(stage)
@@ -2,11 +2,14 @@ import os
 import base64
 from pathlib import Path
 from sqlite3 import OperationalError
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Optional, Any
 
 from app.utils.db_handler import DBHandler
 from app.utils import Logger, tr, generate_url_hash
 from app.src.session_parser import SessionParser
+from app.src.session_index import SessionIndex
+from app.src.search_index import SearchIndex
+from app.services.session_cache import SessionCache
 
 
 class SessionLoadingError(Exception):
@@ -14,25 +17,59 @@ class SessionLoadingError(Exception):
     pass
 
 
+class SessionLoadCancelled(Exception):
+    """Raised when a running load was cancelled by the user"""
+    pass
+
+
+# Load stages in the order they run, with the progress value (percent) reached when a stage starts
+LOAD_STAGES = {
+    "decompress": 0,
+    "parse": 15,
+    "enrich": 35,
+    "closed_tabs": 60,
+    "ui_build": 70,
+}
+
+
 class SessionLoader:
-    """Service class responsible for loading and processing session files"""
+    """
+    Service class responsible for loading and processing session files.
+    Keeps no state of a loaded session: everything a load builds is returned, so a load that is
+    cancelled (or replaced) in its worker thread never touches the session that is shown.
+    """
     
-    def __init__(self, db_handler: DBHandler):
+    def __init__(self, db_handler: DBHandler, session_cache: Optional[SessionCache] = None):
         self.logger = Logger.get_logger("SessionLoader")
         self.db = db_handler
-        self.session_processor = None
-        self.json_data = None
+        self.cache = session_cache
         
-    def load_session_file(self, path: str) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    def load_session_file(self, path: str, progress_callback=None, cancel_check=None) -> Dict[str, Any]:
         """
-        Load a session file and return enriched data
+        Load a session file and return enriched data.
+        Closed tabs/groups/windows are only counted (closed_tabs_count) - the UI extracts them with
+        session_parser.get_extra_tabs_data() when it shows them. The lookup tables for the tabs in session_index and the filter keys in search_index.
+        A cache hit (same content hash) skips decompression, parsing and enrichment.
         Args:
             path: Path to the session file
+            progress_callback: Optional callable(stage, percent), called when a stage starts or advances
+            cancel_check: Optional callable returning True when the load should stop
         Returns:
-            Tuple of (enriched_tabs, groups, all_groups_info)
+            Dict with tabs, groups, group_list (enriched_tabs, groups, all_groups_info), closed_tabs_count,
+            session_parser, session_index, search_index and content_hash
         Raises:
             SessionLoadingError: If loading fails
+            SessionLoadCancelled: If cancel_check returned True
         """
+        def report(stage, percent=None):
+            check_cancelled(stage)
+            if progress_callback:
+                progress_callback(stage, LOAD_STAGES[stage] if percent is None else percent)
+
+        def check_cancelled(stage):
+            if cancel_check and cancel_check():
+                raise SessionLoadCancelled(stage)
+
         try:
             self.logger.info(f"Loading session file: {path}")
             
@@ -42,13 +79,46 @@ class SessionLoader:
             if not os.access(path, os.R_OK):
                 raise SessionLoadingError(f"{tr('No read permission for file', 'session_loader')}: {path}")
 
-            self.session_processor = SessionParser(path)
-            self.json_data = self.session_processor.load_session()
+            session_processor = SessionParser(path)
+            content_hash = None
+
+            report("decompress")
+            if self.cache:
+                content_hash = self._get_content_hash(path)
+                check_cancelled("decompress")
+                cached = self.cache.load(content_hash) if content_hash else None
+                if cached:
+                    check_cancelled("decompress")
+                    session_processor.json_data = cached["json_data"]
+                    # same state get_enriched_tabs_and_groups() leaves behind (needed by sync_enriched_to_raw)
+                    session_processor.enriched_tabs = cached["tabs"]
+                    session_processor.group_map = cached["groups"]
+                    session_processor.group_infos = cached["group_list"]
+                    session_index = SessionIndex(cached["tabs"], cached["group_list"], cached["json_data"])
+                    check_cancelled("decompress")
+                    search_index = SearchIndex(cached["tabs"])
+                    self.logger.info(f"Session loaded from cache: {path}")
+                    return self._result(session_processor, cached["tabs"], cached["groups"], cached["group_list"],
+                                        cached["closed_tabs_count"], session_index, search_index, content_hash)
+
+            decompressed_data = session_processor.decompress(session_processor.read_compressed())
+
+            report("parse")
+            json_data = session_processor.parse(decompressed_data)
+            del decompressed_data
             
-            if not self.json_data:
+            if not json_data:
                 raise SessionLoadingError(tr("Failed to parse session data - empty result", "session_loader"))
 
-            enriched_tabs, groups, all_groups_info = self.session_processor.get_enriched_tabs_and_groups()
+            report("enrich")
+            enrich_start, enrich_end = LOAD_STAGES["enrich"], LOAD_STAGES["closed_tabs"]
+            result = session_processor.get_enriched_tabs_and_groups(
+                progress_callback=lambda done, total: report("enrich", enrich_start + (enrich_end - enrich_start) * done // max(total, 1)),
+                cancel_check=cancel_check
+            )
+            if result is None:
+                raise SessionLoadCancelled("enrich")
+            enriched_tabs, groups, all_groups_info = result
             
             # Validate the loaded data
             if not isinstance(enriched_tabs, list):
@@ -57,10 +127,33 @@ class SessionLoader:
             # Ensure all tabs have required URL hashes
             self._ensure_url_hashes(enriched_tabs)
 
+            report("closed_tabs")
+            closed_tabs_count = session_processor.count_extra_tabs()
+
+            # Stored before the UI touches anything; one pickle keeps raw_tab references into json_data intact
+            if self.cache and content_hash:
+                check_cancelled("closed_tabs")
+                self.cache.store(content_hash, {
+                    "json_data": json_data,
+                    "tabs": enriched_tabs,
+                    "groups": groups,
+                    "group_list": all_groups_info,
+                    "closed_tabs_count": closed_tabs_count,
+                })
+
+            check_cancelled("closed_tabs")
+            session_index = SessionIndex(enriched_tabs, all_groups_info, json_data)
+            check_cancelled("closed_tabs")
+            search_index = SearchIndex(enriched_tabs)
+
             self.logger.info(tr('Successfully loaded {0} tabs from {1} groups', 'session_loader', len(enriched_tabs), len(groups)))
 
-            return enriched_tabs, groups, all_groups_info
+            return self._result(session_processor, enriched_tabs, groups, all_groups_info,
+                                closed_tabs_count, session_index, search_index, content_hash)
             
+        except SessionLoadCancelled:
+            self.logger.info(f"Loading cancelled: {path}")
+            raise
         except OperationalError as e:
             self.logger.error(f"({tr('Database error while loading session', 'session_loader')}) {e} |#| ({type(e).__name__})", exc_info=True)
             raise SessionLoadingError(f"{tr('Database error', 'session_loader')}: {e}")
@@ -68,6 +161,19 @@ class SessionLoader:
             self.logger.error(f"({tr('Unexpected error loading session file', 'session_loader')}) {path}: {e} |#| ({type(e).__name__})", exc_info=True)
             raise SessionLoadingError(f"{tr('Failed to load session', 'session_loader')}: {e}")
 
+    @staticmethod
+    def _result(session_processor, tabs, groups, group_list, closed_tabs_count, session_index, search_index, content_hash) -> Dict[str, Any]:
+        return {
+            "tabs": tabs,
+            "groups": groups,
+            "group_list": group_list,
+            "closed_tabs_count": closed_tabs_count,
+            "session_parser": session_processor,   # extracts the closed tabs on demand
+            "session_index": session_index,
+            "search_index": search_index,
+            "content_hash": content_hash,
+        }
+
     def _ensure_url_hashes(self, tabs: List[Dict]) -> None:
         """Ensure all tabs have URL hashes for tracking"""
         for tab in tabs:
@@ -78,10 +184,17 @@ class SessionLoader:
                 except Exception as e:
                     self.logger.warning(f"{tr('Failed to generate URL hash for tab', 'session_loader')}: {e} |#| ({type(e).__name__})", exc_info=True)
 
-    def get_session_id(self, path: str) -> Optional[int]:
-        """Get or create session ID in database"""
+    def _get_content_hash(self, path: str) -> Optional[str]:
+        try:
+            return self.cache.content_hash(path)
+        except OSError as e:
+            self.logger.warning(f"{tr('Failed to hash session file', 'session_loader')} {path}: {e} |#| ({type(e).__name__})")
+            return None
+
+    def get_session_id(self, path: str, content_hash: Optional[str] = None) -> Optional[int]:
+        """Get or create session ID in database - copies of the same file (same content hash) share one ID"""
         try:
-            return self.db.get_or_create_session_id(path)
+            return self.db.get_or_create_session_id(path, content_hash)
         except Exception as e:
             self.logger.error(f"{tr('Failed to get/create session ID for', 'session_loader')} {path}: {e} |#| ({type(e).__name__})", exc_info=True)
             return None
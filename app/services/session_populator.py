@@ -1,91 +1,98 @@
-import os
-import base64
 from collections import defaultdict, Counter
 from typing import Dict, List, Optional
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPixmap, QFont, QColor
+from PySide6.QtGui import QIcon, QFont, QColor
 from PySide6.QtWidgets import QTreeWidgetItem
+from shiboken6 import isValid
 
 from app.utils import Logger, tr
-from app.ui.helpers import COLORS, colored_svg_icon
+from app.ui.helpers import COLORS, colored_svg_icon, SessionTreeItem
 from app.ui.helpers.ui_icon_loader import load_icon
+from app.src.tab_record import TabRecord
+from app.services.favicon_cache import FaviconCache
 
 
 class SessionPopulator:
     """Service class for populating UI elements with session data"""
     
-    def __init__(self, favicon_cache: Dict[str, QIcon], cache_dir_favicon: str, icon_default_tab: QIcon):
+    def __init__(self, favicon_cache: FaviconCache, icon_default_tab: QIcon):
         self.logger = Logger.get_logger("Session_Populator_Error")
         self.favicon_cache = favicon_cache
-        self.cache_dir_favicon = cache_dir_favicon
         self.icon_default_tab = icon_default_tab
+        self._session_widget = None
+        self._waiting_items = {}  # domain -> closed-tab items showing the default icon until the favicon is loaded
+        self._closed_widget = None
+        self._closed_pending = {}  # closed-tree item -> (build, args) creating its children on the first expand
+        self.favicon_cache.icon_loaded.connect(self._on_favicon_loaded)
     
-    def populate_session_tree(self, session_widget, tabs: List[Dict], group_list: List[Dict], file_path: str) -> List[Dict]:
+    def populate_session_tree(self, session_widget, tabs: List[TabRecord], group_list: List[Dict], file_path: str) -> List[Dict]:
         """
-        Populate the session tree widget with tabs and groups
-        
+        Populate the session tree with windows, groups and tabs
+
+        Only window and group items are created here, the tabs are handed to their group as pending
+        rows and become items when the view fetches them (see SessionTreeModel).
+
         Returns:
             List of window data for multi-window sessions
         """
         try:
-            session_widget.setHeaderLabel(f"{file_path} ({len(tabs)} {tr('Tabs', 'main')})")
-            session_widget.clear()
+            session_widget.set_icon_provider(self.tab_icon)
+            self._session_widget = session_widget
+            with session_widget.bulk_update():
+                window_data = self._build_tree(session_widget, tabs, group_list, file_path)
 
-            group_map = {group['id']: group for group in group_list} if group_list else {}
-
-            window_count = len(set(t.get("window_index") for t in tabs))
-            multi_window = window_count > 1
-            window_data = []
-            
-            # Organize data by windows
-            windows_map = defaultdict(list)
-            windows_group_counts = {}
-            windows_tab_counts = {}
-            
-            for tab in tabs:
-                win_idx = tab["window_index"]
-                gid = tab.get("group_id", None)
-                group_data = group_map.get(gid, {})
-                gname = group_data.get("name", "Ungrouped")
-                windows_group_counts.setdefault(win_idx, Counter())[gname] += 1
-                windows_tab_counts[win_idx] = windows_tab_counts.get(win_idx, 0) + 1
-                windows_map[win_idx].append(tab)
-            
-            # Create window structure
-            for win_idx in sorted(set(t["window_index"] for t in tabs)):
-                win_item = self._create_window_item(
-                    session_widget, win_idx, multi_window, 
-                    windows_group_counts, windows_tab_counts, windows_map
-                )
-                
-                if multi_window:
-                    first_tab_title = windows_map[win_idx][0].get("title", f"Window {win_idx+1}")
-                    window_data.append({"index": win_idx, "title": first_tab_title})
-                
-                # Create groups and populate with tabs
-                self._populate_groups_and_tabs(
-                    win_item, windows_map[win_idx], group_map, group_list, 
-                    windows_group_counts[win_idx], multi_window, session_widget
-                )
-            
             # Expand all top-level items
             for i in range(session_widget.topLevelItemCount()):
                 session_widget.topLevelItem(i).setExpanded(True)
-
             return window_data
-            
+
         except Exception as e:
             self.logger.error(f"({tr('Error populating session tree', 'session_populator')}): {e} |#| ({type(e).__name__})", exc_info=True)
             raise
+
+    def _build_tree(self, session_widget, tabs: List[TabRecord], group_list: List[Dict], file_path: str) -> List[Dict]:
+        """Creates window and group items, the tabs go into the groups as pending rows"""
+        session_widget.setHeaderLabel(f"{file_path} ({len(tabs)} {tr('Tabs', 'main')})")
+        session_widget.clear()
+
+        group_map = {group['id']: group for group in group_list} if group_list else {}
+        group_names = {gid: group.get("name", "Ungrouped") for gid, group in group_map.items()}
+
+        # Organize data by windows (single pass, the tabs are TabRecords)
+        windows_map = defaultdict(list)
+        windows_group_counts = defaultdict(Counter)
+        for tab in tabs:
+            windows_map[tab.window_index].append(tab)
+            windows_group_counts[tab.window_index][group_names.get(tab.group_id, "Ungrouped")] += 1
+
+        multi_window = len(windows_map) > 1
+        window_data = []
+        
+        # Create window structure
+        for win_idx in sorted(windows_map):
+            win_item = self._create_window_item(
+                session_widget, win_idx, multi_window, 
+                windows_group_counts, windows_map
+            )
+            
+            if multi_window:
+                first_tab_title = windows_map[win_idx][0].title or f"Window {win_idx+1}"
+                window_data.append({"index": win_idx, "title": first_tab_title})
+            
+            self._populate_groups_and_tabs(
+                win_item, windows_map[win_idx], group_names, group_list, 
+                windows_group_counts[win_idx], multi_window, session_widget
+            )
+
+        return window_data
     
     def _create_window_item(self, session_widget, win_idx: int, multi_window: bool, 
-                           windows_group_counts: Dict, windows_tab_counts: Dict, 
-                           windows_map: Dict):
+                           windows_group_counts: Dict, windows_map: Dict):
         """Create window item for multi-window sessions"""
         if multi_window:
-            win_label = f"{tr('Window', 'main')} {win_idx + 1} ({len(windows_group_counts[win_idx])} G / {windows_tab_counts[win_idx]} T)"
-            win_item = QTreeWidgetItem(session_widget, [win_label])
+            win_label = f"{tr('Window', 'main')} {win_idx + 1} ({len(windows_group_counts[win_idx])} G / {len(windows_map[win_idx])} T)"
+            win_item = SessionTreeItem(session_widget, [win_label])
             win_item.setIcon(0, load_icon("app-window"))
             win_item.setData(0, Qt.UserRole, {"type": "window", "window_index": win_idx})
             return win_item
@@ -93,99 +100,55 @@ class SessionPopulator:
             return session_widget
     
 
-    def _populate_groups_and_tabs(self, parent_item, tabs: List[Dict], group_map: Dict, 
+    def _populate_groups_and_tabs(self, parent_item, tabs: List[TabRecord], group_names: Dict, 
                                  group_list: List[Dict], group_counts: Counter, 
                                  multi_window: bool, session_widget):
-        """Populate groups and tabs under a parent item"""
-        group_items_list = {}
-        
-        # Track which special groups we actually need
-        has_pinned = any(tab.get("pinned", False) for tab in tabs)
-        has_hidden = any(tab.get("hidden", False) for tab in tabs)
-        
-        # Calculate ungrouped tabs that are NOT pinned or hidden
-        ungrouped_tabs = [tab for tab in tabs 
-                         if (tab.get("group_id") is None or 
-                             group_map.get(tab.get("group_id"), {}).get("name", "Ungrouped") == "Ungrouped")
-                         and not tab.get("pinned", False) 
-                         and not tab.get("hidden", False)]
-        has_ungrouped = len(ungrouped_tabs) > 0
-        
-        # Add special groups in the correct order: Pinned -> Hidden -> Ungrouped
-        if has_pinned:
-            pinned_count = sum(1 for tab in tabs if tab.get("pinned", False))
-            pinned_group = self._create_special_group_item("pinned", pinned_count)
-            if multi_window:
-                parent_item.addChild(pinned_group)
+        """Create the group items under a parent item and hand each group its tabs"""
+        # Sort the tabs into their groups: pinned and hidden tabs go to the special groups
+        pinned_tabs, hidden_tabs, ungrouped_tabs = [], [], []
+        grouped_tabs = defaultdict(list)
+        hidden_count = 0
+        for tab in tabs:
+            if tab.hidden:
+                hidden_count += 1
+            if getattr(tab, "data_entries", None):
+                self._prepare_tab_data(tab)
+
+            if tab.pinned:
+                pinned_tabs.append((tab, "pinned"))
+            elif tab.hidden:
+                hidden_tabs.append((tab, "hidden"))
             else:
-                session_widget.addTopLevelItem(pinned_group)
-            group_items_list["__pinned__"] = pinned_group
-        
-        if has_hidden:
-            hidden_count = sum(1 for tab in tabs if tab.get("hidden", False))
-            hidden_group = self._create_special_group_item("hidden", hidden_count)
+                gname = group_names.get(tab.group_id, "Ungrouped")
+                if gname == "Ungrouped":
+                    ungrouped_tabs.append((tab, None))
+                else:
+                    grouped_tabs[gname].append((tab, None))
+
+        def add_group(group_item, entries):
+            group_item.set_pending_tabs(entries)
             if multi_window:
-                parent_item.addChild(hidden_group)
+                parent_item.addChild(group_item)
             else:
-                session_widget.addTopLevelItem(hidden_group)
-            group_items_list["__hidden__"] = hidden_group
+                session_widget.addTopLevelItem(group_item)
+
+        # Add special groups in the correct order: Pinned -> Hidden -> Ungrouped
+        if pinned_tabs:
+            add_group(self._create_special_group_item("pinned", len(pinned_tabs)), pinned_tabs)
         
-        if has_ungrouped:
-            ungrouped_count = len(ungrouped_tabs)
-            ungrouped_group = self._create_special_group_item("ungrouped", ungrouped_count)
-            if multi_window:
-                parent_item.addChild(ungrouped_group)
-            else:
-                session_widget.addTopLevelItem(ungrouped_group)
-            group_items_list["__ungrouped__"] = ungrouped_group
+        if hidden_count:
+            add_group(self._create_special_group_item("hidden", hidden_count), hidden_tabs)
+        
+        if ungrouped_tabs:
+            add_group(self._create_special_group_item("ungrouped", len(ungrouped_tabs)), ungrouped_tabs)
         
         # Add regular groups (all except "Ungrouped")
         for gname, count in group_counts.items():
             if gname == "Ungrouped":
                 continue 
-                
-            group_item = self._create_group_item(gname, count, group_map, group_list)
-            
-            if multi_window:
-                parent_item.addChild(group_item)
-            else:
-                session_widget.addTopLevelItem(group_item)
-            
-            group_items_list[gname] = group_item
-        
-        # Populate tabs into appropriate groups
-        for tab in tabs:
-            tab_item = self._create_tab_item(tab)
-            
-            # Check for special tab types first
-            if tab.get("pinned", False):
-                if "__pinned__" in group_items_list:
-                    group_items_list["__pinned__"].addChild(tab_item)
-                    self._apply_pinned_styling(tab_item)
-                continue
-                
-            if tab.get("hidden", False):
-                if "__hidden__" in group_items_list:
-                    group_items_list["__hidden__"].addChild(tab_item)
-                    self._apply_hidden_styling(tab_item)
-                continue
-            
-            # Regular grouped/ungrouped tabs
-            gid = tab.get("group_id", None)
-            group_info = group_map.get(gid, {})
-            gname = group_info.get("name", "Ungrouped")
-            
-            # Handle ungrouped tabs specially
-            if gname == "Ungrouped":
-                if "__ungrouped__" in group_items_list:
-                    group_items_list["__ungrouped__"].addChild(tab_item)
-            else:
-                if gname in group_items_list:
-                    group_items_list[gname].addChild(tab_item)
-
+            add_group(self._create_group_item(gname, count, group_list), grouped_tabs.get(gname, []))
 
-    
-    def _create_special_group_item(self, group_type: str, count: int) -> QTreeWidgetItem:
+    def _create_special_group_item(self, group_type: str, count: int) -> SessionTreeItem:
         """Create a special group item with proper count and styling"""
         if group_type == "pinned":
             label = f"{tr('Pinned Tabs', 'main')} ({count} {tr('Tab', 'main') if count == 1 else tr('Tabs', 'main')})"
@@ -203,7 +166,7 @@ class SessionPopulator:
             label = f"{group_type} ({count})"
             icon_name = "folder"
         
-        group_item = QTreeWidgetItem([label])
+        group_item = SessionTreeItem(texts=[label])
         group_item.setIcon(0, load_icon(icon_name))
         group_item.setData(0, Qt.UserRole, {"type": "special_group", "group_type": group_type})
         
@@ -213,10 +176,10 @@ class SessionPopulator:
         
         return group_item
     
-    def _create_group_item(self, gname: str, count: int, group_map: Dict, group_list: List[Dict]) -> QTreeWidgetItem:
+    def _create_group_item(self, gname: str, count: int, group_list: List[Dict]) -> SessionTreeItem:
         """Create a group item with proper styling and icons"""
         group_label = f"{gname} ({count} {tr('Tab', 'main') if count == 1 else tr('Tabs', 'main')})"
-        group_item = QTreeWidgetItem([group_label])
+        group_item = SessionTreeItem(texts=[group_label])
         
         if gname == "Ungrouped":
             group_item.setIcon(0, load_icon("folder-outline"))
@@ -241,33 +204,25 @@ class SessionPopulator:
         
         return group_item
     
-    def _create_tab_item(self, tab_data: Dict) -> QTreeWidgetItem:
-        """Create a tab item with all associated data"""
-        tab_item = QTreeWidgetItem([tab_data.get('title', tr("No Title", "main"))])
-        
-        # Set favicon
-        domain = tab_data.get("domain", "")
-        url = tab_data.get("url", "")
-        favicon = tab_data.get("favicon", None)
-        tab_item.setIcon(0, self._get_favicon_icon(domain, url, favicon))
-        
-        # Store data in UserRole
-        item_data = self._prepare_tab_data(tab_data)
-        tab_item.setData(0, Qt.UserRole, item_data)
-        
-        return tab_item
+    def tab_icon(self, tab: TabRecord) -> QIcon:
+        """Favicon of a tab row, asked for by the tree model whenever the row is painted"""
+        return self._get_favicon_icon(tab.domain or "", tab.url or "", tab.favicon) or self.icon_default_tab
+
+    def _on_favicon_loaded(self, domain: str):
+        """A favicon finished loading: repaint the session tree, set it on the closed tabs waiting for it"""
+        icon = self.favicon_cache.icon(domain)
+        if icon is None:
+            self._waiting_items.pop(domain, None)   # the domain has none, the default icon stays
+            return
+        if self._session_widget is not None and isValid(self._session_widget):
+            self._session_widget.viewport().update()   # the rows ask tab_icon() again
+        for tab_item in self._waiting_items.pop(domain, ()):
+            if isValid(tab_item):
+                tab_item.setIcon(0, icon)
     
-    def _prepare_tab_data(self, tab_data: Dict) -> Dict:
-        """Prepare tab data for storage in QTreeWidgetItem"""
-        extracted_data = tab_data.get("db_tags", [])
-        item_data = tab_data.copy()
-        
-        item_data.update({
-            'type': 'tab_item',
-            'data_entries': [],
-            'filterable_values': []
-        })
-        
+    def _prepare_tab_data(self, tab_data: TabRecord) -> TabRecord:
+        """Tab records go into the tree as they are (no copy, the item shares the record with session_tabs)"""
+        extracted_data = tab_data.get("data_entries")
         if extracted_data:
             filterable_values = []
             for entry in extracted_data:
@@ -275,11 +230,9 @@ class SessionPopulator:
                     for value in entry.get('values', []):
                         clean_value = value.strip().lower()
                         filterable_values.append(clean_value)
-            
-            item_data['data_entries'] = extracted_data
-            item_data['filterable_values'] = filterable_values
+            tab_data.filterable_values = filterable_values
         
-        return item_data
+        return tab_data
     
     def _apply_pinned_styling(self, tab_item: QTreeWidgetItem):
         """Apply visual styling for pinned tabs"""
@@ -293,55 +246,24 @@ class SessionPopulator:
         font.setItalic(True)
         tab_item.setFont(0, font)
     
-    def _get_favicon_icon(self, domain: str, url: str, favicon: Optional[str]) -> QIcon:
-        """Get favicon icon for a tab"""
+    def _get_favicon_icon(self, domain: str, url: str, favicon: Optional[str]) -> Optional[QIcon]:
+        """Favicon of a tab from the FaviconCache, None while it is loading or if there is none"""
         if not url.startswith("http://") and not url.startswith("https://"):
-            return self.icon_default_tab
+            return None
         
         if not domain:
-            return self.icon_default_tab
-        
-        if domain in self.favicon_cache:
-            return self.favicon_cache[domain]
+            return None
         
-        cache_file = os.path.join(self.cache_dir_favicon, f"{domain}.png")
-        
-        if os.path.exists(cache_file):
-            try:
-                pixmap = QPixmap(cache_file)
-                icon = QIcon(pixmap)
-                self.favicon_cache[domain] = icon
-                return icon
-            except Exception as e:
-                self.logger.warning(f"({tr('Failed to load cached favicon for', 'session_populator')}) {domain}: {e}|#| ({type(e).__name__})", exc_info=True)
-        
-        if favicon and favicon.startswith("data:image"):
-            try:
-                base64_string = favicon.split(",")[1]
-                decoded_data = base64.b64decode(base64_string)
-                
-                pixmap = QPixmap()
-                if pixmap.loadFromData(decoded_data):
-                    # Skaliere nur, wenn größer als 32x32 (nur verkleinern, nicht vergrößern)
-                    if pixmap.width() > 32 or pixmap.height() > 32:
-                        pixmap = pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    
-                    # Speichere das (skalierte) Pixmap als PNG (nur einmal)
-                    os.makedirs(self.cache_dir_favicon, exist_ok=True)
-                    pixmap.save(cache_file, "PNG")
-                    
-                    icon = QIcon(pixmap)
-                    self.favicon_cache[domain] = icon
-                    return icon
-                else:
-                    self.logger.warning(f"({tr('Failed to load pixmap from base64 data for', 'session_populator')}) {domain}")
-            except Exception as e:
-                self.logger.warning(f"({tr('Error processing favicon for', 'session_populator')}) {domain}: {e} |#| ({type(e).__name__})", exc_info=True)
-        
-        return self.icon_default_tab
+        return self.favicon_cache.icon(domain, favicon)
     
     def populate_closed_tabs(self, closed_session_widget, closed_tabs_data, format_timestamp_func):
-        """Populate the closed tabs tree view"""
+        """
+        Populate the closed tabs tree view
+
+        Only the top-level nodes are created here. Every node gets its children when it is expanded
+        for the first time (see _on_closed_item_expanded), so a large history costs nothing until
+        it is opened.
+        """
 
         #TODO: Check for reorder the list: Closed Window -> Closed Groups AND Closed Tabs. (check json data if it is possible)
         # For now every "combinantion" is displayed seperately
@@ -349,196 +271,226 @@ class SessionPopulator:
         if not closed_tabs_data:
             return
 
-        closed_session_widget.clear()
+        self.clear_closed_tabs(closed_session_widget)
+        if self._closed_widget is not closed_session_widget:
+            closed_session_widget.itemExpanded.connect(self._on_closed_item_expanded)
+            self._closed_widget = closed_session_widget
 
         # Closed Windows
         if closed_tabs_data['closed_windows']:
             closed_windows_item = QTreeWidgetItem(closed_session_widget,
                                                   [f"{tr('Closed Windows', 'ClosedTabs')} ({len(closed_tabs_data['closed_windows'])})"])
             closed_windows_item.setIcon(0, load_icon("app-window"))
+            self._defer_children(closed_windows_item, self._add_closed_windows,
+                                 closed_windows_item, closed_tabs_data['closed_windows'], format_timestamp_func)
 
-            for window in closed_tabs_data['closed_windows']:
-                closed_at = format_timestamp_func(window.get('closed_at', 0))
-                window_item = QTreeWidgetItem(closed_windows_item,
-                                              [f"{tr('Window closed at', 'ClosedTabs')} {closed_at}"])
-                window_item.setIcon(0, load_icon("layout-grid"))
-
-                # Check if window has groups
-                window_groups = window.get('groups', [])
-                window_tabs = window.get('tabs', [])
-                window_closed_tabs = window.get('closed_tabs', [])
-                window_closed_groups = window.get('closed_groups', [])
-                                
-                # All tabs in this window (regular + closed)
-                all_window_tabs = window_tabs + window_closed_tabs
-                
-                # Build group map for easy lookup
-                group_map = {group.get('id'): group for group in window_groups}
-                
-                # Process regular groups first (from window.groups)
-                if window_groups:
-                    # Organize tabs by group_id
-                    tabs_by_group = {}
-                    ungrouped_tabs = []
-                    
-                    for tab in all_window_tabs:
-                        tab_group_id = tab.get('group_id')
-                        
-                        if tab_group_id and tab_group_id in group_map:
-                            if tab_group_id not in tabs_by_group:
-                                tabs_by_group[tab_group_id] = []
-                            tabs_by_group[tab_group_id].append(tab)
-                        else:
-                            ungrouped_tabs.append(tab)
-                    
-                    # Display groups and their tabs
-                    for group in window_groups:
-                        group_id = group.get('id')
-                        group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
-                        group_color = group.get('color', '')
-                        group_tabs = tabs_by_group.get(group_id, [])
-                        
-                        # Only show groups that have tabs
-                        if group_tabs:
-                            group_item = QTreeWidgetItem(window_item,
-                                                        [f"{group_name} ({len(group_tabs)} {tr('tabs', 'ClosedTabs')})"])
-                            
-                            # Set group icon with color if available
-                            if group_color and group_color in COLORS:
-                                color = COLORS[group_color]
-                                group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
-                            else:
-                                group_item.setIcon(0, load_icon("folder"))
-                            
-                            # Store group data
-                            group_item.setData(0, Qt.UserRole, {
-                                "type": "closed_group",
-                                "group_name": group_name,
-                                "group_id": group_id,
-                                "color": group_color
-                            })
-                            
-                            # Add tabs to group
-                            for tab in group_tabs:
-                                tab_item = self._create_closed_tab_item(tab, group_item, format_timestamp_func)
-                    
-                    # Display ungrouped tabs if any exist
-                    
-                    if ungrouped_tabs:
-                        ungrouped_item = QTreeWidgetItem(window_item,
-                                                        [f"{tr('Ungrouped', 'ClosedTabs')} ({len(ungrouped_tabs)} {tr('tabs', 'ClosedTabs')})"])
-                        ungrouped_item.setIcon(0, load_icon("folder-outline"))
-                        
-                        for tab in ungrouped_tabs:
-                            tab_item = self._create_closed_tab_item(tab, ungrouped_item, format_timestamp_func)
-                
-                # Process closed groups (these are complete groups with their own tabs)
-                if window_closed_groups:
-                    for closed_group in window_closed_groups:
-                        group_name = closed_group.get('name', tr('Unnamed Group', 'ClosedTabs'))
-                        group_color = closed_group.get('color', '')
-                        group_tabs = closed_group.get('tabs', [])
-                        closed_at = format_timestamp_func(closed_group.get('closed_at', 0))
-                        
-                        group_item = QTreeWidgetItem(window_item,
-                                                    [f"{group_name} - {tr('closed at', 'ClosedTabs')} {closed_at} ({len(group_tabs)} {tr('tabs', 'ClosedTabs')})"])
-                        
-                        # Set group icon with color if available
-                        if group_color and group_color in COLORS:
-                            color = COLORS[group_color]
-                            group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
-                        else:
-                            group_item.setIcon(0, load_icon("folder-cancel"))
-                        
-                        # Add tabs to closed group
-                        for tab in group_tabs:
-                            tab_item = self._create_closed_tab_item(tab, group_item, format_timestamp_func)
-                
-                # Fallback: if no structure, display all tabs directly
-                if not window_groups and not window_closed_groups and (window_tabs or window_closed_tabs):
-                    if window_tabs:
-                        tabs_item = QTreeWidgetItem(window_item,
-                                                    [f"{tr('Tabs', 'ClosedTabs')} ({len(window_tabs)})"])
-                        tabs_item.setIcon(0, load_icon("label-off"))
-
-                        for tab in window_tabs:
-                            tab_item = self._create_closed_tab_item(tab, tabs_item, format_timestamp_func)
-        
         # Closed Groups from active windows
         if closed_tabs_data['closed_groups']:
             closed_groups_item = QTreeWidgetItem(closed_session_widget,
                                                  [f"{tr('Closed Groups', 'ClosedTabs')} ({len(closed_tabs_data['closed_groups'])})"])
             closed_groups_item.setIcon(0, load_icon("folder-cancel"))
-
-            for group in closed_tabs_data['closed_groups']:
-                closed_at = format_timestamp_func(group.get('closed_at', 0))
-                group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
-
-                group_item = QTreeWidgetItem(closed_groups_item,
-                                             [f"{group_name} - {tr('closed at', 'ClosedTabs')} {closed_at}"])
-
-                if group.get('color') and group['color'] in COLORS:
-                    color = COLORS[group['color']]
-                    group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
-                else:
-                    group_item.setIcon(0, load_icon("folder"))
-
-                # Tabs in der geschlossenen Gruppe
-                for tab in group.get('tabs', []):
-                    tab_item = self._create_closed_tab_item(tab, group_item, format_timestamp_func)
+            self._defer_children(closed_groups_item, self._add_closed_groups,
+                                 closed_groups_item, closed_tabs_data['closed_groups'], format_timestamp_func)
 
         # Closed individual tabs from active windows
         if closed_tabs_data['closed_tabs']:
             closed_tabs_item = QTreeWidgetItem(closed_session_widget,
                                                [f"{tr('Closed Tabs', 'ClosedTabs')} ({len(closed_tabs_data['closed_tabs'])})"])
             closed_tabs_item.setIcon(0, load_icon("label-off"))
-
-            # Group by window
-            tabs_by_window = {}
-            for tab in closed_tabs_data['closed_tabs']:
-                window_idx = tab.get('window_index', 0)
-                if window_idx not in tabs_by_window:
-                    tabs_by_window[window_idx] = []
-                tabs_by_window[window_idx].append(tab)
-
-            for window_idx, tabs in tabs_by_window.items():
-                window_item = QTreeWidgetItem(closed_tabs_item,
-                                              [f"{tr('Window', 'ClosedTabs')} {window_idx + 1} ({len(tabs)} {tr('tabs', 'ClosedTabs')})"])
-                window_item.setIcon(0, load_icon("app-window"))
-
-                for tab in tabs:
-                    tab_item = self._create_closed_tab_item(tab, window_item, format_timestamp_func)
+            self._defer_children(closed_tabs_item, self._add_closed_tabs_by_window,
+                                 closed_tabs_item, closed_tabs_data['closed_tabs'], format_timestamp_func)
 
         # Saved Groups
         if closed_tabs_data['saved_groups']:
             saved_groups_item = QTreeWidgetItem(closed_session_widget,
                                                 [f"{tr('Saved Groups', 'ClosedTabs')} ({len(closed_tabs_data['saved_groups'])})"])
             saved_groups_item.setIcon(0, load_icon("device-floppy"))
+            self._defer_children(saved_groups_item, self._add_saved_groups,
+                                 saved_groups_item, closed_tabs_data['saved_groups'], format_timestamp_func)
 
-            for group in closed_tabs_data['saved_groups']:
-                group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
-                tab_count = len(group.get('tabs', []))
+    def clear_closed_tabs(self, closed_session_widget):
+        """Empties the closed tabs tree together with the children still waiting to be built"""
+        closed_session_widget.clear()
+        self._waiting_items = {}
+        self._closed_pending = {}
 
-                # Gruppenname mit Tab-Anzahl
-                display_text = f"{group_name} ({tab_count} {tr('tabs', 'ClosedTabs')})"
+    def _defer_children(self, item: QTreeWidgetItem, build, *args):
+        """The item shows an expand arrow, build(*args) creates its children on the first expand"""
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self._closed_pending[item] = (build, args)
 
-                group_item = QTreeWidgetItem(saved_groups_item, [display_text])
+    def _on_closed_item_expanded(self, item: QTreeWidgetItem):
+        pending = self._closed_pending.pop(item, None)
+        if pending is None:
+            return
+        build, args = pending
+        build(*args)
+        item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
 
-                if group.get('color') and group['color'] in COLORS:
-                    color = COLORS[group['color']]
+    def _add_closed_tab_items(self, parent_item: QTreeWidgetItem, tabs, format_timestamp_func):
+        for tab in tabs:
+            self._create_closed_tab_item(tab, parent_item, format_timestamp_func)
+
+    def _add_closed_windows(self, closed_windows_item: QTreeWidgetItem, windows, format_timestamp_func):
+        for window in windows:
+            closed_at = format_timestamp_func(window.get('closed_at', 0))
+            window_item = QTreeWidgetItem(closed_windows_item,
+                                          [f"{tr('Window closed at', 'ClosedTabs')} {closed_at}"])
+            window_item.setIcon(0, load_icon("layout-grid"))
+            self._defer_children(window_item, self._add_closed_window_content, window_item, window, format_timestamp_func)
+
+    def _add_closed_window_content(self, window_item: QTreeWidgetItem, window, format_timestamp_func):
+        # Check if window has groups
+        window_groups = window.get('groups', [])
+        window_tabs = window.get('tabs', [])
+        window_closed_tabs = window.get('closed_tabs', [])
+        window_closed_groups = window.get('closed_groups', [])
+                        
+        # All tabs in this window (regular + closed)
+        all_window_tabs = window_tabs + window_closed_tabs
+        
+        # Build group map for easy lookup
+        group_map = {group.get('id'): group for group in window_groups}
+        
+        # Process regular groups first (from window.groups)
+        if window_groups:
+            # Organize tabs by group_id
+            tabs_by_group = {}
+            ungrouped_tabs = []
+            
+            for tab in all_window_tabs:
+                tab_group_id = tab.get('group_id')
+                
+                if tab_group_id and tab_group_id in group_map:
+                    if tab_group_id not in tabs_by_group:
+                        tabs_by_group[tab_group_id] = []
+                    tabs_by_group[tab_group_id].append(tab)
+                else:
+                    ungrouped_tabs.append(tab)
+            
+            # Display groups and their tabs
+            for group in window_groups:
+                group_id = group.get('id')
+                group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
+                group_color = group.get('color', '')
+                group_tabs = tabs_by_group.get(group_id, [])
+                
+                # Only show groups that have tabs
+                if group_tabs:
+                    group_item = QTreeWidgetItem(window_item,
+                                                [f"{group_name} ({len(group_tabs)} {tr('tabs', 'ClosedTabs')})"])
+                    
+                    # Set group icon with color if available
+                    if group_color and group_color in COLORS:
+                        color = COLORS[group_color]
+                        group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
+                    else:
+                        group_item.setIcon(0, load_icon("folder"))
+                    
+                    # Store group data
+                    group_item.setData(0, Qt.UserRole, {
+                        "type": "closed_group",
+                        "group_name": group_name,
+                        "group_id": group_id,
+                        "color": group_color
+                    })
+                    
+                    # Add tabs to group
+                    self._defer_children(group_item, self._add_closed_tab_items, group_item, group_tabs, format_timestamp_func)
+            
+            # Display ungrouped tabs if any exist
+            
+            if ungrouped_tabs:
+                ungrouped_item = QTreeWidgetItem(window_item,
+                                                [f"{tr('Ungrouped', 'ClosedTabs')} ({len(ungrouped_tabs)} {tr('tabs', 'ClosedTabs')})"])
+                ungrouped_item.setIcon(0, load_icon("folder-outline"))
+                
+                self._defer_children(ungrouped_item, self._add_closed_tab_items, ungrouped_item, ungrouped_tabs, format_timestamp_func)
+        
+        # Process closed groups (these are complete groups with their own tabs)
+        if window_closed_groups:
+            for closed_group in window_closed_groups:
+                group_name = closed_group.get('name', tr('Unnamed Group', 'ClosedTabs'))
+                group_color = closed_group.get('color', '')
+                group_tabs = closed_group.get('tabs', [])
+                closed_at = format_timestamp_func(closed_group.get('closed_at', 0))
+                
+                group_item = QTreeWidgetItem(window_item,
+                                            [f"{group_name} - {tr('closed at', 'ClosedTabs')} {closed_at} ({len(group_tabs)} {tr('tabs', 'ClosedTabs')})"])
+                
+                # Set group icon with color if available
+                if group_color and group_color in COLORS:
+                    color = COLORS[group_color]
                     group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
                 else:
-                    group_item.setIcon(0, load_icon("folder"))
+                    group_item.setIcon(0, load_icon("folder-cancel"))
+                
+                # Add tabs to closed group
+                self._defer_children(group_item, self._add_closed_tab_items, group_item, group_tabs, format_timestamp_func)
+        
+        # Fallback: if no structure, display all tabs directly
+        if not window_groups and not window_closed_groups and (window_tabs or window_closed_tabs):
+            if window_tabs:
+                tabs_item = QTreeWidgetItem(window_item,
+                                            [f"{tr('Tabs', 'ClosedTabs')} ({len(window_tabs)})"])
+                tabs_item.setIcon(0, load_icon("label-off"))
+
+                self._defer_children(tabs_item, self._add_closed_tab_items, tabs_item, window_tabs, format_timestamp_func)
+
+    def _add_closed_groups(self, closed_groups_item: QTreeWidgetItem, groups, format_timestamp_func):
+        for group in groups:
+            closed_at = format_timestamp_func(group.get('closed_at', 0))
+            group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
+
+            group_item = QTreeWidgetItem(closed_groups_item,
+                                         [f"{group_name} - {tr('closed at', 'ClosedTabs')} {closed_at}"])
+
+            if group.get('color') and group['color'] in COLORS:
+                color = COLORS[group['color']]
+                group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
+            else:
+                group_item.setIcon(0, load_icon("folder"))
+
+            # Tabs in der geschlossenen Gruppe
+            self._defer_children(group_item, self._add_closed_tab_items, group_item, group.get('tabs', []), format_timestamp_func)
+
+    def _add_closed_tabs_by_window(self, closed_tabs_item: QTreeWidgetItem, closed_tabs, format_timestamp_func):
+        # Group by window
+        tabs_by_window = {}
+        for tab in closed_tabs:
+            window_idx = tab.get('window_index', 0)
+            if window_idx not in tabs_by_window:
+                tabs_by_window[window_idx] = []
+            tabs_by_window[window_idx].append(tab)
 
-                # Gruppendaten in UserRole speichern
-                group_item.setData(0, Qt.UserRole, group)
+        for window_idx, tabs in tabs_by_window.items():
+            window_item = QTreeWidgetItem(closed_tabs_item,
+                                          [f"{tr('Window', 'ClosedTabs')} {window_idx + 1} ({len(tabs)} {tr('tabs', 'ClosedTabs')})"])
+            window_item.setIcon(0, load_icon("app-window"))
 
-                # Tabs in der gespeicherten Gruppe hinzufügen
-                for tab in group.get('tabs', []):
-                    tab_item = self._create_closed_tab_item(tab, group_item, format_timestamp_func)
+            self._defer_children(window_item, self._add_closed_tab_items, window_item, tabs, format_timestamp_func)
 
-        # Expand all
-        closed_session_widget.expandAll()
+    def _add_saved_groups(self, saved_groups_item: QTreeWidgetItem, groups, format_timestamp_func):
+        for group in groups:
+            group_name = group.get('name', tr('Unnamed Group', 'ClosedTabs'))
+            tab_count = len(group.get('tabs', []))
+
+            # Gruppenname mit Tab-Anzahl
+            display_text = f"{group_name} ({tab_count} {tr('tabs', 'ClosedTabs')})"
+
+            group_item = QTreeWidgetItem(saved_groups_item, [display_text])
+
+            if group.get('color') and group['color'] in COLORS:
+                color = COLORS[group['color']]
+                group_item.setIcon(0, colored_svg_icon("assets/icons/folder.svg", color))
+            else:
+                group_item.setIcon(0, load_icon("folder"))
+
+            # Gruppendaten in UserRole speichern
+            group_item.setData(0, Qt.UserRole, group)
+
+            # Tabs in der gespeicherten Gruppe hinzufügen
+            self._defer_children(group_item, self._add_closed_tab_items, group_item, group.get('tabs', []), format_timestamp_func)
 
     def _create_closed_tab_item(self, tab, parent_item, format_timestamp_func):
         """Erstellt ein TreeWidgetItem für einen geschlossenen Tab"""
@@ -583,7 +535,10 @@ class SessionPopulator:
         favicon = tab.get('image', '')
 
         if domain and url:
-            tab_item.setIcon(0, self._get_favicon_icon(domain, url, favicon))
+            icon = self._get_favicon_icon(domain, url, favicon)
+            if icon is None and self.favicon_cache.is_loading(domain):
+                self._waiting_items.setdefault(domain, []).append(tab_item)
+            tab_item.setIcon(0, icon or self.icon_default_tab)
         else:
             # For now only if favicon isn't available, set special icons - maybe remove this for Closed Tabs... and only mark in the title 📍
             # (Impossible to sort because of the amount of combinations [closed tab, closed tab in closed window, closed group in window, and so on])
@@ -598,3 +553,4 @@ class SessionPopulator:
         tab_item.setData(0, Qt.UserRole, tab)
 
         return tab_item
+
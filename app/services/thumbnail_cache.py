@@ -0,0 +1,137 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PySide6.QtCore import QObject, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QImageWriter, QPixmap
+
+from app.services.image_downloader import find_image
+from app.utils import Logger
+
+THUMB_FORMAT = "webp" if b"webp" in [bytes(f) for f in QImageWriter.supportedImageFormats()] else "png"
+
+
+class ThumbnailCache(QObject):
+    """
+    Thumbnails of the downloaded images for the image panel.
+
+    A thumbnail (THUMB_WIDTH wide, WebP or PNG) is written to <image dir>/thumbs when an image is
+    saved, or on first display for images from before. Loading happens in a small pool with
+    QImageReader.setScaledSize, so the full image is never decoded on the GUI thread; the GUI keeps
+    the last MEMORY_ITEMS pixmaps (and "has no image") in memory.
+    """
+    thumbnail_ready = Signal(str, QImage)   # url_hash, thumbnail (null if the tab has no image)
+
+    THUMB_WIDTH = 350
+    MEMORY_ITEMS = 128
+    QUALITY = 85
+
+    def __init__(self, image_dir: str, parent=None):
+        super().__init__(parent)
+        self.logger = Logger.get_logger("ThumbnailCache")
+        self.image_dir = image_dir
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ThumbnailCache")
+        self._lock = threading.Lock()
+        self._loading = set()
+        self._wanted = None
+        # GUI thread only
+        self._pixmaps: "OrderedDict[str, Optional[QPixmap]]" = OrderedDict()
+
+    @property
+    def thumb_dir(self) -> str:
+        return os.path.join(self.image_dir, "thumbs")
+
+    # ---------- GUI thread ----------
+
+    def cached(self, url_hash: str):
+        """The pixmap from memory, None for "no image", or False if it isn't in memory"""
+        if url_hash not in self._pixmaps:
+            return False
+        self._pixmaps.move_to_end(url_hash)
+        return self._pixmaps[url_hash]
+
+    def request(self, url_hash: str):
+        """Loads the thumbnail in the pool, thumbnail_ready follows. Older requests still waiting are dropped."""
+        with self._lock:
+            self._wanted = url_hash
+            if url_hash in self._loading:
+                return
+            self._loading.add(url_hash)
+        self._pool.submit(self._load, url_hash)
+
+    def put(self, url_hash: str, image: QImage) -> Optional[QPixmap]:
+        """Takes a loaded thumbnail into the memory cache (QPixmaps only exist on the GUI thread)"""
+        pixmap = None if image.isNull() else QPixmap.fromImage(image)
+        self._pixmaps[url_hash] = pixmap
+        self._pixmaps.move_to_end(url_hash)
+        while len(self._pixmaps) > self.MEMORY_ITEMS:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def invalidate(self, url_hash: str):
+        self._pixmaps.pop(url_hash, None)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- Any thread ----------
+
+    def create(self, image_path: str) -> QImage:
+        """Writes the thumbnail of an image (atomic rename) and returns it; null if it can't be read"""
+        reader = QImageReader(image_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and size.width() > self.THUMB_WIDTH:
+            # decoded at the small size: far less work (and memory) than loading it and scaling
+            reader.setScaledSize(QSize(self.THUMB_WIDTH, max(1, round(size.height() * self.THUMB_WIDTH / size.width()))))
+        image = reader.read()
+        if image.isNull():
+            self.logger.warning(f"Invalid image file: {image_path} ({reader.errorString()})")
+            return image
+        if image.width() != self.THUMB_WIDTH:
+            image = image.scaledToWidth(self.THUMB_WIDTH, Qt.SmoothTransformation)
+
+        name = os.path.splitext(os.path.basename(image_path))[0]
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        thumb_path = os.path.join(self.thumb_dir, f"{name}.{THUMB_FORMAT}")
+        tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+        if image.save(tmp_path, THUMB_FORMAT, self.QUALITY):
+            os.replace(tmp_path, thumb_path)
+        else:
+            self.logger.warning(f"Failed to write thumbnail {thumb_path}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return image
+
+    # ---------- Pool threads ----------
+
+    def _load(self, url_hash: str):
+        try:
+            with self._lock:
+                if url_hash != self._wanted:
+                    return   # the user has moved on - loaded again if they come back
+            self.thumbnail_ready.emit(url_hash, self._read(url_hash))
+        except Exception as e:
+            self.logger.error(f"Failed to load thumbnail for {url_hash}: {e} |#| ({type(e).__name__})", exc_info=True)
+        finally:
+            with self._lock:
+                self._loading.discard(url_hash)
+
+    def _read(self, url_hash: str) -> QImage:
+        image_path = find_image(self.image_dir, url_hash)
+        if image_path is None:
+            return QImage()
+        thumb_path = os.path.join(self.thumb_dir, f"{url_hash}.{THUMB_FORMAT}")
+        try:
+            fresh = os.path.getmtime(thumb_path) >= os.path.getmtime(image_path)
+        except OSError:
+            fresh = False
+        if fresh:
+            image = QImageReader(thumb_path).read()
+            if not image.isNull():
+                return image
+        return self.create(image_path)
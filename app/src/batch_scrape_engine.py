@@ -0,0 +1,134 @@
+import asyncio
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class ScrapeJob:
+    """One tab to scrape: where to fetch it, the rules resolved for it and the host it is limited by"""
+    __slots__ = ("url", "url_hash", "uuid", "domain", "rules")
+
+    def __init__(self, url: str, url_hash: str, uuid: str, domain: str, rules: List[dict]):
+        self.url = url
+        self.url_hash = url_hash
+        self.uuid = uuid
+        self.domain = domain
+        self.rules = rules
+
+    def __repr__(self):
+        return f"ScrapeJob({self.url!r}, {len(self.rules)} rules)"
+
+
+class BatchScrapeEngine:
+    """
+    Runs scrape jobs with at most `concurrency` fetches in flight, and at most `per_domain` of
+    them against the same domain.
+
+    The fetch function is blocking (requests + lxml), so it runs in a thread pool that the engine's
+    event loop drives. Jobs wait in one queue per domain; the domains that may start another fetch
+    take turns (round-robin), so a session with 500 tabs of one shop doesn't hold up all others.
+
+    pause(), resume() and cancel() may be called from any thread. Pausing lets the running fetches
+    finish but starts no new ones; cancelling drops everything that hasn't finished yet.
+    """
+
+    def __init__(self, fetch: Callable[[ScrapeJob], Dict], concurrency: int = 8, per_domain: int = 2):
+        self.fetch = fetch
+        self.concurrency = max(1, concurrency)
+        self.per_domain = max(1, per_domain)
+        self.max_in_flight = 0   # highest number of fetches that ran at the same time
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._paused = False
+        self._cancelled = False
+
+    # ---------- Control (thread-safe) ----------
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def pause(self):
+        self._paused = True
+        self._notify()
+
+    def resume(self):
+        self._paused = False
+        self._notify()
+
+    def cancel(self):
+        self._cancelled = True
+        self._notify()
+
+    def _notify(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass   # loop closed in the meantime
+
+    # ---------- Running ----------
+
+    async def run(self, jobs: Iterable[ScrapeJob], on_result: Callable[[ScrapeJob, Optional[Dict], Optional[str]], None]) -> bool:
+        """
+        Scrapes all jobs. on_result(job, data, error) is called in the loop's thread as each fetch
+        finishes - data is the fetch result, or None and error the message if it failed.
+        Returns False if the run was cancelled.
+        """
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+        pending: Dict[str, deque] = {}
+        for job in jobs:
+            pending.setdefault(job.domain, deque()).append(job)
+        ready = deque(pending)          # domains that may start a fetch, in turn
+        in_flight = Counter()           # running fetches per domain
+        active: Dict[asyncio.Future, ScrapeJob] = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scrape")
+        try:
+            while (ready or active) and not self._cancelled:
+                # Start fetches until the global limit is reached or no domain may start one
+                while ready and len(active) < self.concurrency and not self._paused:
+                    domain = ready.popleft()
+                    job = pending[domain].popleft()
+                    in_flight[domain] += 1
+                    active[self._loop.run_in_executor(executor, self.fetch, job)] = job
+                    if pending[domain] and in_flight[domain] < self.per_domain:
+                        ready.append(domain)
+                self.max_in_flight = max(self.max_in_flight, len(active))
+
+                wake = asyncio.ensure_future(self._wake.wait())
+                done, _ = await asyncio.wait([*active, wake], return_when=asyncio.FIRST_COMPLETED)
+                if wake in done:
+                    self._wake.clear()
+                else:
+                    wake.cancel()
+
+                for future in done:
+                    job = active.pop(future, None)
+                    if job is None:
+                        continue
+                    in_flight[job.domain] -= 1
+                    if pending[job.domain] and in_flight[job.domain] == self.per_domain - 1:
+                        ready.append(job.domain)   # it was at its limit and has jobs left
+
+                    if self._cancelled:
+                        continue
+                    error = future.exception()
+                    if error is None:
+                        on_result(job, future.result(), None)
+                    else:
+                        on_result(job, None, str(error) or type(error).__name__)
+        finally:
+            # Running fetches can't be interrupted - they end with their request timeout, unseen
+            for future in active:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._loop = None
+        return not self._cancelled
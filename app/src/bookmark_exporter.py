@@ -13,22 +13,22 @@ class BookmarkExporter:
     - Pretty: Modern HTML5 layout with dynamic colors and enhanced styling
     """
 
-    def __init__(self, tree_widget, windows_data, colors, assets_path="assets/icons", favicon_cache_path="assets/cache/favicons"):
+    def __init__(self, tree_widget, windows_data, colors, assets_path="assets/icons", favicon_store=None):
         """
         Initialize the bookmark exporter.
 
         Args:
-            tree_widget: QTreeWidget containing all groups and tabs
+            tree_widget: Session tree (SessionTreeView) containing all groups and tabs
             windows_data: List of window data from session JSON
             colors: Color mapping {name: QColor}
             assets_path: Path to icon assets
-            favicon_cache_path: Path to favicon cache directory
+            favicon_store: FaviconStore with the cached favicons (None: only the session's own)
         """
         self.tree_widget = tree_widget
         self.windows_data = windows_data
         self.COLORS = colors
         self.assets_path = Path(assets_path)
-        self.favicon_cache_path = Path(favicon_cache_path)
+        self.favicon_store = favicon_store
 
     def _qicon_to_base64(self, svg_path: str, color: QColor = None, size: int = 16) -> str:
         """Convert SVG icon to Base64 PNG with optional color overlay."""
@@ -72,7 +72,7 @@ class BookmarkExporter:
 
     def _favicon_from_cache_to_base64(self, domain: str) -> str:
         """
-        Load favicon from cache directory and convert to Base64.
+        Load favicon from the favicon store and convert to Base64.
 
         Args:
             domain: Domain name for the favicon
@@ -80,20 +80,16 @@ class BookmarkExporter:
         Returns:
             Base64-encoded favicon or None if not found
         """
-        if not domain:
-            return None
-
-        favicon_file = self.favicon_cache_path / f"{domain}.png"
-
-        if not favicon_file.exists():
+        if not domain or self.favicon_store is None:
             return None
 
         try:
-            with open(favicon_file, "rb") as f:
-                favicon_data = f.read()
-            return base64.b64encode(favicon_data).decode("utf-8")
+            favicon_data = self.favicon_store.get(domain)
         except Exception:
             return None
+        if favicon_data is None:
+            return None
+        return base64.b64encode(favicon_data).decode("utf-8")
 
     def _create_group_gradient(self, color: QColor) -> str:
         """
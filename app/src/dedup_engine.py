@@ -0,0 +1,280 @@
+import re
+import hashlib
+from collections import defaultdict
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from - they never change the page
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "twclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "mkt_tok", "ref_src", "ref_url", "si", "spm", "scid", "vero_id", "wickedid",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "piwik_", "matomo_", "hsa_", "oly_")
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_ROUTE_CHARS = frozenset("/!=")   # a fragment with one of these is a route, not an anchor
+_TOKEN_RE = re.compile(r"\w+")
+_COUNTER_RE = re.compile(r"^\s*[(\[]\d+[)\]]\s*")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Comparison key of a URL: http/https, letter case of scheme and host, 'www.', default ports,
+    trailing slashes, tracking parameters and the order of the remaining parameters make no
+    difference. Fragments are kept unless they look like an in-page anchor (no '/', '!' or '='):
+    hash-routed apps put the page there ('#inbox/abc', '#/settings', '#!/item').
+    Not meant to be opened again.
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS:
+        return url   # about:, file:, moz-extension: ... are compared as they are
+
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and str(port) not in _DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    fragment = parts.fragment if _ROUTE_CHARS.intersection(parts.fragment) else ""
+    return urlunsplit(("https", host, path, urlencode(query), fragment))
+
+
+def title_key(title: str) -> str:
+    """Comparison key of a title: lowercased, repeated whitespace collapsed"""
+    return " ".join((title or "").lower().split())
+
+
+def normalize_title(title: str) -> str:
+    """Lowercased words of a title without punctuation and unread counters like "(3) " (input for the SimHash)"""
+    return " ".join(_TOKEN_RE.findall(_COUNTER_RE.sub("", (title or "").lower())))
+
+
+class DuplicateCluster:
+    """
+    Tabs that are duplicates of each other.
+
+    kind is "exact" (same key) or "similar" (near-duplicate titles), key the title/URL parts the
+    tabs share (for similar titles: the title of the first tab).
+    """
+    __slots__ = ("kind", "key", "tabs")
+
+    def __init__(self, kind: str, key: tuple, tabs: list):
+        self.kind = kind
+        self.key = key
+        self.tabs = tabs
+
+    def __len__(self):
+        return len(self.tabs)
+
+    def __repr__(self):
+        return f"DuplicateCluster({self.kind!r}, {self.key!r}, {len(self.tabs)} tabs)"
+
+
+class SimHasher:
+    """
+    64-bit SimHash signatures of short texts (character trigrams as features) and LSH bands to find
+    signatures that differ in at most `max_distance` bits without comparing all pairs.
+
+    The per-bit feature counts are summed in one big int (a 16-bit lane per bit), so a text costs
+    one int addition per feature instead of 64.
+    """
+    SIGNATURE_BITS = 64
+    LANE_BITS = 16
+    MAX_FEATURES = 0x7FFF   # a lane must not overflow into the next one
+
+    # _SPREAD_BYTE[b]: the 8 bits of b, each moved into its own 16-bit lane
+    _SPREAD_BYTE = [sum(((b >> bit) & 1) << (bit * 16) for bit in range(8)) for b in range(256)]
+    _LANE_ONES = sum(1 << (lane * 16) for lane in range(64))
+    _LANE_FLAGS = _LANE_ONES << 15
+    _BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1   # pigeonhole: signatures within max_distance share one band
+        self.band_size = -(-self.SIGNATURE_BITS // self.bands)
+        self._feature_lanes: Dict[str, int] = {}
+
+    def signature(self, text: str) -> int:
+        features = self._features(text)
+        if not features:
+            return 0
+        lanes = self._feature_lanes
+        total = 0
+        for feature in features:
+            spread = lanes.get(feature)
+            if spread is None:
+                spread = lanes[feature] = self._spread(feature)
+            total += spread
+
+        # Bit i is set if more than half of the features have it: a bias per lane makes the top
+        # bit of the lane flip exactly then. The flags are gathered into a 64-bit int via "0"/"1" text.
+        bias = (0x8000 - (len(features) // 2 + 1)) * self._LANE_ONES
+        flags = ((total + bias) & self._LANE_FLAGS) >> 15
+        bits = flags.to_bytes(self.SIGNATURE_BITS * 2, "little")[::2]
+        return int(bits[::-1].translate(self._BIT_CHARS), 2)
+
+    @staticmethod
+    def distance(first: int, second: int) -> int:
+        return (first ^ second).bit_count()
+
+    def band_keys(self, signature: int) -> List[tuple]:
+        size = self.band_size
+        mask = (1 << size) - 1
+        return [(band, (signature >> (band * size)) & mask) for band in range(self.bands)]
+
+    def _features(self, text: str) -> List[str]:
+        text = f" {text} "
+        count = min(len(text) - 2, self.MAX_FEATURES)
+        return [text[i:i + 3] for i in range(count)] if count > 0 else []
+
+    def _spread(self, feature: str) -> int:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        spread_byte = self._SPREAD_BYTE
+        return sum(spread_byte[byte] << (position * 8 * self.LANE_BITS) for position, byte in enumerate(digest))
+
+
+class DedupEngine:
+    """
+    Finds duplicate tabs, independent of any widget.
+
+    by_title/by_url select the key parts like the checkboxes did; the URL part is the canonical URL
+    (see canonicalize_url) or, with url_regex, the joined groups of its match. similar_titles merges
+    titles whose SimHash differs in at most max_distance bits instead of requiring equal titles.
+
+    The regex is compiled once in the constructor (re.error for invalid patterns).
+    """
+    MAX_BUCKET_REPRESENTATIVES = 64
+
+    def __init__(self, by_title: bool = True, by_url: bool = False, url_regex: Optional[str] = None,
+                 similar_titles: bool = False, max_distance: int = 3):
+        self.by_title = by_title or similar_titles
+        self.by_url = by_url
+        self.url_regex = re.compile(url_regex) if url_regex else None
+        self.similar_titles = similar_titles
+        self.hasher = SimHasher(max_distance)
+
+    @staticmethod
+    def extra_tabs(closed_tabs_data: Optional[dict]) -> list:
+        """All tabs from SessionParser.get_extra_tabs_data(): closed tabs/groups/windows and saved groups"""
+        if not closed_tabs_data:
+            return []
+        return list(closed_tabs_data.get("counting_tabs", []))
+
+    def find(self, tabs: Iterable, cancel_check=None) -> List[DuplicateCluster]:
+        """
+        Clusters of two or more tabs sharing a key, in the order their first tab appears.
+        Works on TabRecords and on the tab dicts of closed tabs (anything with .get()).
+        """
+        tabs = list(tabs)
+        if not (self.by_title or self.by_url):
+            return []
+
+        titles = [title_key(tab.get("title", "")) for tab in tabs] if self.by_title else None
+        title_groups = None
+        if self.similar_titles:
+            title_groups = self._similar_title_groups(titles, cancel_check)
+            if title_groups is None:
+                return []
+
+        buckets: Dict[tuple, list] = defaultdict(list)
+        for position, tab in enumerate(tabs):
+            if cancel_check is not None and not position % 4096 and cancel_check():
+                return []
+            key = []
+            if self.by_title:
+                key.append(title_groups[titles[position]] if title_groups is not None else titles[position])
+            if self.by_url:
+                key.append(self.url_key(tab.get("url", "")))
+            buckets[tuple(key)].append(tab)
+
+        clusters = []
+        for key, members in buckets.items():
+            if len(members) < 2:
+                continue
+            if title_groups is not None:
+                shown_key = tuple([members[0].get("title", "")] + list(key[1:]))
+                kind = "exact" if len({title_key(tab.get("title", "")) for tab in members}) == 1 else "similar"
+                clusters.append(DuplicateCluster(kind, shown_key, members))
+            else:
+                clusters.append(DuplicateCluster("exact", key, members))
+        return clusters
+
+    def url_key(self, url: str) -> str:
+        url = (url or "").strip()
+        if self.url_regex is not None:
+            match = self.url_regex.search(url)
+            if match and match.groups():
+                return "".join(group or "" for group in match.groups())
+        return canonicalize_url(url)
+
+    def _similar_title_groups(self, titles: List[str], cancel_check=None) -> Optional[Dict[str, int]]:
+        """
+        Maps every distinct title to the id of its near-duplicate group (union-find over LSH candidates),
+        None if cancelled.
+
+        An LSH bucket only keeps representatives - members that were not close to an earlier one -
+        and new signatures are compared against those. Templated titles ("Page 1 of 80", ...) put
+        thousands of similar signatures into one bucket; comparing all of them would be quadratic.
+        """
+        hasher = self.hasher
+        distinct = list(dict.fromkeys(titles))
+        signatures = []
+        for position, title in enumerate(distinct):
+            if cancel_check is not None and not position % 4096 and cancel_check():
+                return None
+            signatures.append(hasher.signature(normalize_title(title)))
+        parents = list(range(len(distinct)))
+
+        def find(node):
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        def union(first, second):
+            first, second = find(first), find(second)
+            if first != second:
+                parents[max(first, second)] = min(first, second)
+
+        first_with_signature: Dict[int, int] = {}
+        buckets: Dict[tuple, tuple] = {}   # band key -> ([positions], [signatures]) of the representatives
+        within_distance = hasher.max_distance.__ge__
+        for position, signature in enumerate(signatures):
+            if cancel_check is not None and not position % 4096 and cancel_check():
+                return None
+            if not distinct[position]:
+                continue   # empty titles are only equal to each other
+            same = first_with_signature.setdefault(signature, position)
+            if same != position:
+                union(same, position)
+                continue
+            for band_key in hasher.band_keys(signature):
+                bucket = buckets.get(band_key)
+                if bucket is None:
+                    buckets[band_key] = ([position], [signature])
+                    continue
+                positions, bucket_signatures = bucket
+                close = list(compress(positions, map(within_distance, map(int.bit_count, map(signature.__xor__, bucket_signatures)))))
+                for other in close:
+                    union(other, position)
+                if not close and len(positions) < self.MAX_BUCKET_REPRESENTATIVES:
+                    positions.append(position)
+                    bucket_signatures.append(signature)
+
+        return {title: find(position) for position, title in enumerate(distinct)}
@@ -0,0 +1,194 @@
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class AhoCorasick:
+    """
+    Finds the longest of a set of patterns that occurs in a text, in one pass over the text
+    (goto/fail automaton over characters). Of equally long patterns the earlier one wins.
+    """
+    __slots__ = ("patterns", "_goto", "_fail", "_best")
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self._goto: List[Dict[str, int]] = [{}]
+        best: List[int] = [-1]   # per state: the pattern to report (longest ending there), -1 = none
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    best.append(-1)
+                state = next_state
+            if best[state] == -1:
+                best[state] = index
+
+        # Breadth-first: fail links and the best pattern ending in a state or any of its suffixes
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())   # depth 1: fail to the root
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                best[next_state] = self._better(best[next_state], best[fail])
+                queue.append(next_state)
+        self._best = best
+
+    def _better(self, first: int, second: int) -> int:
+        if first == -1 or second == -1:
+            return max(first, second)
+        first_len, second_len = len(self.patterns[first]), len(self.patterns[second])
+        if first_len != second_len:
+            return first if first_len > second_len else second
+        return min(first, second)
+
+    def longest_match(self, text: str) -> Optional[str]:
+        goto, fail, best = self._goto, self._fail, self._best
+        found = -1
+        state = 0
+        for char in text:
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if best[state] != -1 and best[state] != found:
+                found = self._better(found, best[state])
+        return self.patterns[found] if found != -1 else None
+
+
+class _DomainRules:
+    """Rules and url_contains patterns of one domain"""
+    __slots__ = ("rules", "matcher", "_by_url_contains")
+
+    def __init__(self, url_contains: List[str], rules: List[dict]):
+        self.rules = rules
+        self.matcher = AhoCorasick(url_contains) if url_contains else None
+        self._by_url_contains: Dict[str, List[dict]] = {"": rules}
+
+    def url_contains(self, url: str) -> str:
+        if self.matcher is None:
+            return ""
+        return self.matcher.longest_match(url) or ""
+
+    def rules_for(self, url_contains: str) -> List[dict]:
+        rules = self._by_url_contains.get(url_contains)
+        if rules is None:
+            rules = self._by_url_contains[url_contains] = [
+                rule for rule in self.rules if rule["url_contains"] == url_contains or rule["is_global"]
+            ]
+        return rules
+
+
+class RuleCoverage:
+    """Which tabs of a session have XPath rules. by_domain counts the covered tabs per rule domain."""
+    __slots__ = ("covered", "uncovered", "by_domain")
+
+    def __init__(self):
+        self.covered = []
+        self.uncovered = []
+        self.by_domain = Counter()
+
+    def __repr__(self):
+        return f"RuleCoverage({len(self.covered)} covered, {len(self.uncovered)} uncovered, {len(self.by_domain)} domains)"
+
+
+class RuleMatcher:
+    """
+    In-memory view of xpath_domains/xpath_rules that resolves the rule set of a URL the same way
+    find_matching_url_part() + get_xpath_rules() do, without touching the database:
+
+    - domain: the host without 'www.'; if it has no rules, the 'www.' variant
+    - url_contains: the longest pattern of the domain that occurs in the URL (Aho-Corasick)
+    - rules: the rules of that url_contains plus the global rules of the domain, or all rules of
+      the domain if no pattern matches
+
+    It is immutable - DBHandler builds a new one after the rules changed.
+    """
+
+    def __init__(self, domains: Iterable[Tuple[str, str]], rules: List[dict]):
+        """
+        domains: (domain, url_contains) rows, sorted by url_contains for the same tie-break as
+        find_matching_url_part(). rules: as returned by get_xpath_rules('', '').
+        """
+        patterns: Dict[str, List[str]] = {}
+        for domain, url_contains in domains:
+            if url_contains:
+                patterns.setdefault(domain, []).append(url_contains)
+        rules_by_domain: Dict[str, List[dict]] = {}
+        for rule in rules:
+            rules_by_domain.setdefault(rule["domain"], []).append(rule)
+
+        self._domains: Dict[str, _DomainRules] = {
+            domain: _DomainRules(patterns.get(domain, []), domain_rules)
+            for domain, domain_rules in rules_by_domain.items()
+        }
+
+    def __len__(self):
+        return len(self._domains)
+
+    @staticmethod
+    def normalized_domain(url: str) -> str:
+        parsed = urlsplit(url or "")
+        domain = (parsed.hostname or parsed.netloc or "").lower()
+        return domain[4:] if domain.startswith("www.") else domain
+
+    def resolve(self, url: str) -> Tuple[str, str, List[dict]]:
+        """
+        (domain, url_contains, rules) for a URL; rules is empty if there are none. The rule dicts
+        are copies, so callers may change them.
+        """
+        domain = self.normalized_domain(url)
+        if domain:
+            for candidate in (domain, "www." + domain):
+                entry = self._domains.get(candidate)
+                if entry is None:
+                    continue
+                url_contains = entry.url_contains(url)
+                rules = entry.rules_for(url_contains)
+                if rules:
+                    return candidate, url_contains, [dict(rule) for rule in rules]
+        return domain, "", []
+
+    def has_rules(self, url: str) -> bool:
+        return self._rule_domain(url, self.normalized_domain(url)) is not None
+
+    def coverage(self, tabs: Iterable) -> RuleCoverage:
+        """
+        Splits tabs (anything with .get('url')) into those with and without rules. The 'domain' of
+        a tab is used if it has one, so only URLs of domains with rules are parsed and matched.
+        """
+        coverage = RuleCoverage()
+        domains = self._domains
+        for tab in tabs:
+            domain = tab.get("domain")
+            if domain:
+                domain = domain.lower()
+                if domain not in domains and "www." + domain not in domains:
+                    coverage.uncovered.append(tab)
+                    continue
+            url = tab.get("url", "")
+            rule_domain = self._rule_domain(url, self.normalized_domain(url))
+            if rule_domain is None:
+                coverage.uncovered.append(tab)
+            else:
+                coverage.covered.append(tab)
+                coverage.by_domain[rule_domain] += 1
+        return coverage
+
+    def _rule_domain(self, url: str, domain: str) -> Optional[str]:
+        if not domain:
+            return None
+        for candidate in (domain, "www." + domain):
+            entry = self._domains.get(candidate)
+            if entry is not None and entry.rules_for(entry.url_contains(url)):
+                return candidate
+        return None
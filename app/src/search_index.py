@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from itertools import compress, repeat
+from operator import contains
+from typing import List, Set
+
+from app.src.tab_record import TabRecord
+
+
+class SearchIndex:
+    """
+    Search keys for the tab filter, built once when the session is loaded.
+
+    Every tab gets one lowercased key (title, URL and uuid, newline separated), so a keystroke
+    only costs a substring scan over the prepared keys (done in C via map/compress). Results of
+    recent queries are kept: while typing, the new query contains an older one, so only that
+    result is scanned again; deleting characters hits the cache directly.
+
+    Keys of edited tabs have to be refreshed with update() (or rebuild() after bulk edits).
+    """
+    CACHE_SIZE = 32
+
+    def __init__(self, tabs: List[TabRecord] = None):
+        self.rebuild(tabs or [])
+
+    def rebuild(self, tabs: List[TabRecord]):
+        self._tabs = list(tabs)
+        self._keys = [self.search_key(tab) for tab in self._tabs]
+        self._positions = {tab.uuid: i for i, tab in enumerate(self._tabs)}
+        self._results = OrderedDict()   # query -> [positions], most recent last
+        self._all = set(self._tabs)
+        self._last = (None, None)       # (positions, tabs) of the last search
+
+    @staticmethod
+    def search_key(tab: TabRecord) -> str:
+        return f"{tab.title}\n{tab.url}\n{tab.uuid}".lower()
+
+    def __len__(self):
+        return len(self._tabs)
+
+    def update(self, tab: TabRecord):
+        """Refreshes the key of an edited (or new) tab"""
+        position = self._positions.get(tab.uuid)
+        if position is None:
+            position = self._positions[tab.uuid] = len(self._tabs)
+            self._tabs.append(tab)
+            self._keys.append("")
+        self._keys[position] = self.search_key(tab)
+        self._all.add(tab)
+        self._results.clear()
+        self._last = (None, None)
+
+    def search(self, query: str) -> Set[TabRecord]:
+        """Tabs whose title, URL or uuid contains the query (case-insensitive). The set is shared - don't modify it"""
+        query = query.strip().lower()
+        if not query:
+            return self._all
+        positions = self._search_positions(query)
+        if len(positions) == len(self._tabs):
+            return self._all
+        if positions is not self._last[0]:
+            self._last = (positions, set(map(self._tabs.__getitem__, positions)))
+        return self._last[1]
+
+    def _search_positions(self, query: str) -> List[int]:
+        positions = self._results.get(query)
+        if positions is not None:
+            self._results.move_to_end(query)
+            return positions
+
+        # Smallest earlier result whose query is part of this one
+        base = None
+        for previous, previous_positions in self._results.items():
+            if previous in query and (base is None or len(previous_positions) < len(base)):
+                base = previous_positions
+
+        keys = self._keys
+        if base is None or len(base) == len(keys):   # scanning all keys directly saves the lookups
+            positions = list(compress(range(len(keys)), map(contains, keys, repeat(query))))
+        else:
+            positions = list(compress(base, map(contains, map(keys.__getitem__, base), repeat(query))))
+            if len(positions) == len(base):
+                positions = base   # same tabs: search() hands out the same set again
+
+        self._results[query] = positions
+        if len(self._results) > self.CACHE_SIZE:
+            self._results.popitem(last=False)
+        return positions
@@ -3,7 +3,7 @@ import pprint
 import shutil
 import traceback
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QTreeWidgetItemIterator, QMessageBox
+from PySide6.QtWidgets import QMessageBox
 from datetime import datetime
 from app.utils import tr, find_firefox_profiles
 
@@ -15,6 +15,8 @@ class SessionHelper:
         self.status_bar = status_bar
         self.session_loader = session_loader
         self.parent_widget = parent_widget
+        self.session_index = None  # SessionIndex of the loaded session (set by the main window)
+        self.session_parser = None  # SessionParser of the loaded session (set by the main window)
     
     def get_window_id_from_tree_item(self, item, session_widget):
         """Get window ID by traversing up the tree structure to find the window"""
@@ -52,7 +54,7 @@ class SessionHelper:
             return None
             
         try:
-            json_data = self.session_loader.session_processor.json_data
+            json_data = self.session_parser.json_data if self.session_parser else None
             if not json_data or 'windows' not in json_data:
                 return None
                 
@@ -75,10 +77,10 @@ class SessionHelper:
             self.logger.error(f"Error getting group ID for window: {e}")
             return None
 
-    def move_tab_between_windows(self, raw_tab, old_window_id, new_window_id, new_group_id):
-        """Move a tab between windows in the raw JSON structure"""
+    def move_tab_between_windows(self, raw_tab, old_window_id, new_window_id, new_group_id, enriched_tab=None):
+        """Move a tab between windows in the raw JSON structure (position lookup via SessionIndex if enriched_tab is given)"""
         try:
-            json_data = self.session_loader.session_processor.json_data
+            json_data = self.session_parser.json_data if self.session_parser else None
             if not json_data or 'windows' not in json_data:
                 self.logger.warning("No JSON data or windows found")
                 return False
@@ -100,12 +102,16 @@ class SessionHelper:
             # Remove tab from old window
             tab_removed = False
             if 'tabs' in old_window:
-                for i, tab in enumerate(old_window['tabs']):
-                    if tab is raw_tab:
-                        old_window['tabs'].pop(i)
-                        tab_removed = True
-                        self.logger.info(f"Removed tab from window {old_window_id} at position {i}")
-                        break
+                if self.session_index is not None and enriched_tab is not None:
+                    position = self.session_index.raw_position(enriched_tab)
+                    i = position[1] if position and position[0] == old_window_id else None
+                else:
+                    i = next((pos for pos, tab in enumerate(old_window['tabs']) if tab is raw_tab), None)
+                if i is not None:
+                    old_window['tabs'].pop(i)
+                    tab_removed = True
+                    self._invalidate_raw_positions(old_window_id)
+                    self.logger.info(f"Removed tab from window {old_window_id} at position {i}")
             
             if not tab_removed:
                 self.logger.warning("Could not find tab to remove from old window")
@@ -128,6 +134,7 @@ class SessionHelper:
                     # CRITICAL ERROR: Group doesn't exist - abort the move!
                     # First, add the tab back to the old window to prevent data loss
                     old_window['tabs'].insert(i if i < len(old_window['tabs']) else len(old_window['tabs']), raw_tab)
+                    self._invalidate_raw_positions(old_window_id)
                     
                     self.logger.error(f"CRITICAL: Group {new_group_id} doesn't exist in target window {new_window_id} - ABORTING MOVE")
                     self.status_bar.show_message(tr("Error: Target group does not exist in destination window", "error"), message_type="error")
@@ -143,6 +150,7 @@ class SessionHelper:
                 new_window['tabs'] = []
             
             new_window['tabs'].append(raw_tab)
+            self._invalidate_raw_positions(new_window_id)
             self.logger.info(f"Added tab to window {new_window_id}")
             
             # Update window selected tab index if necessary
@@ -160,6 +168,7 @@ class SessionHelper:
                     if 'tabs' not in old_window:
                         old_window['tabs'] = []
                     old_window['tabs'].append(raw_tab)
+                    self._invalidate_raw_positions(old_window_id)
                     self.logger.info("Restored tab to original window after error")
             except:
                 pass
@@ -193,22 +202,14 @@ class SessionHelper:
             new_window_id = old_window_id
             self.logger.info(f"Moving to ungrouped in current window {old_window_id}")
         else:
-            # Find the target group by searching through session data
-            # We need to determine which window this group belongs to
-            json_data = self.session_loader.session_processor.json_data
-            if json_data and 'windows' in json_data:
-                for window_idx, window in enumerate(json_data['windows']):
-                    if 'groups' in window:
-                        for group in window['groups']:
-                            if group.get('name') == new_group_name:
-                                # Found the group - create target_group_info with window information
-                                target_group_info = group.copy()
-                                target_group_info['window_index'] = window_idx
-                                new_window_id = window_idx
-                                self.logger.info(f"Found target group '{new_group_name}' with ID {group.get('id')} in window {window_idx}")
-                                break
-                    if target_group_info:
-                        break
+            # Find the target group and the window it belongs to
+            group = self.session_index.group_by_name(new_group_name) if self.session_index is not None else None
+            window_idx = self.session_index.group_window(group.get('id')) if group else None
+            if group and window_idx is not None:
+                target_group_info = group.copy()
+                target_group_info['window_index'] = window_idx
+                new_window_id = window_idx
+                self.logger.info(f"Found target group '{new_group_name}' with ID {group.get('id')} in window {window_idx}")
             
             # If still not found, error
             if not target_group_info:
@@ -237,15 +238,14 @@ class SessionHelper:
                 new_group_id = target_group_info['id'] if target_group_info else None
                 
                 # Attempt to move tab in JSON structure
-                success = self.move_tab_between_windows(raw_tab, old_window_id, new_window_id, new_group_id)
+                success = self.move_tab_between_windows(raw_tab, old_window_id, new_window_id, new_group_id, enriched_tab)
                 
                 if not success:
                     self.logger.error("Failed to move tab between windows")
                     return None
                 
                 # Update enriched tab data only if move was successful - USE CORRECT FIELD NAME!
-                enriched_tab['window_index'] = new_window_id  # NOT window_id!
-                enriched_tab['group_id'] = new_group_id
+                self._update_tab(enriched_tab, window_index=new_window_id, group_id=new_group_id)  # NOT window_id!
                 
                 # Find target parent in tree view for cross-window move
                 new_parent = self._find_target_parent_cross_window(session_widget, new_group_name, new_window_id)
@@ -280,21 +280,18 @@ class SessionHelper:
                 # Moving to a group in same window
                 if raw_tab:
                     raw_tab['groupId'] = target_group_info['id']
-                enriched_tab['group_id'] = target_group_info['id']
+                self._update_tab(enriched_tab, group_id=target_group_info['id'])
                 self.logger.info(f"Updated tab to group '{new_group_name}' (ID: {target_group_info['id']}) in same window {old_window_id}")
             else:
                 # Moving to ungrouped in same window
                 if raw_tab and 'groupId' in raw_tab:
                     del raw_tab['groupId']
-                enriched_tab['group_id'] = None
+                self._update_tab(enriched_tab, group_id=None)
                 self.logger.info(f"Moved tab to ungrouped in same window {old_window_id}")
 
             # Continue with visual UI move within same window
             new_parent = None
-            iterator = QTreeWidgetItemIterator(session_widget)
-
-            while iterator.value():
-                potential_parent = iterator.value()
+            for potential_parent in session_widget.iter_items():
                 parent_data = potential_parent.data(0, Qt.UserRole)
                 if parent_data and parent_data.get("type") == "group" and parent_data.get("group_name") == new_group_name:
                     new_parent = potential_parent
@@ -302,7 +299,6 @@ class SessionHelper:
                 elif new_group_name == tr("Ungrouped", "main") and potential_parent.text(0).startswith(tr("Ungrouped", "Groups")):
                     new_parent = potential_parent
                     break
-                iterator += 1
 
             if new_parent and old_parent:
                 taken_item = old_parent.takeChild(old_parent.indexOfChild(item))
@@ -387,10 +383,22 @@ class SessionHelper:
         self.logger.warning(f"Could not find target parent for group '{target_group_name}' in window {target_window_id}")
         return None
 
+    def _update_tab(self, enriched_tab, **changes):
+        """Changes indexed tab fields through the SessionIndex, so its lookup sets stay current"""
+        if self.session_index is not None and enriched_tab.get('uuid') in self.session_index:
+            self.session_index.update(enriched_tab, **changes)
+        else:
+            for key, value in changes.items():
+                enriched_tab[key] = value
+
+    def _invalidate_raw_positions(self, window_id):
+        if self.session_index is not None:
+            self.session_index.invalidate_window(window_id)
+
     # All the things that has something to do with handling sessions
     def save_session_changes(self, current_file_path, session_tabs, parent_widget):
         """Save session changes to file with user confirmation"""
-        if not self.session_loader.session_processor.json_data or not current_file_path:
+        if not self.session_parser or not self.session_parser.json_data or not current_file_path:
             self.status_bar.show_message(tr('No session file loaded to export', 'error'), message_type='error')
             self.logger.error(f"{tr('No session file loaded to export', 'error')}! (Since the button is disabled without valid session data its very unlikley that you see this message. But let me tell You: From the Bottom of my Heart: I love you, you are doing great! Your are an amazing creation of God!)")
             return False
@@ -405,7 +413,8 @@ class SessionHelper:
 
         if reply == QMessageBox.Yes:
             try:
-                self.session_loader.session_processor.write_jsonlz4()
+                settings = getattr(parent_widget, "settings", None)
+                self.session_parser.write_jsonlz4(level=settings.get("session_lz4_level", type=str) if settings else None)
                 self.status_bar.show_message(tr("Saved", "main"), message_type="success")
                 return True
             except Exception as e:
@@ -0,0 +1,166 @@
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.src.tab_record import TabRecord
+
+
+class SessionIndex:
+    """
+    Lookup tables for the loaded session, built once at load and kept current on edits/moves.
+
+    - uuid      -> TabRecord, tree item (via the attached tree), position of the raw tab in json_data
+    - url_hash / domain / group_id / window_index -> set of TabRecords
+    - group id  -> group info (and the window the group is defined in), group name -> group info
+
+    Changes to indexed fields have to go through update(), otherwise the secondary sets get stale.
+    """
+    _INDEXED = ("url_hash", "domain", "group_id", "window_index")
+    _tree = None
+
+    def __init__(self, tabs: List[TabRecord] = None, group_list: List[Dict] = None, json_data: Dict = None):
+        self.rebuild(tabs or [], group_list or [], json_data)
+
+    def rebuild(self, tabs: List[TabRecord], group_list: List[Dict], json_data: Dict = None):
+        self.json_data = json_data
+        self._by_uuid: Dict[str, TabRecord] = {}
+        self._by_key: Dict[str, Dict[object, Set[TabRecord]]] = {key: defaultdict(set) for key in self._INDEXED}
+        self._window_groups: Dict[int, Counter] = defaultdict(Counter)
+        self._raw_positions: Dict[int, Dict[int, int]] = {}   # window -> {id(raw_tab): position}
+
+        for tab in tabs:
+            self.add(tab)
+        self.rebuild_groups(group_list)
+
+    def rebuild_groups(self, group_list: List[Dict]):
+        """Call again after groups were renamed/recolored"""
+        self.group_list = group_list
+        self._groups_by_id = {}
+        self._groups_by_name = {}
+        for group in group_list:
+            self._groups_by_id.setdefault(group.get("id"), group)
+            self._groups_by_name.setdefault(group.get("name"), group)
+
+        self._group_windows = {}
+        if self.json_data:
+            for window_idx, window in enumerate(self.json_data.get("windows", [])):
+                for group in window.get("groups", []):
+                    self._group_windows.setdefault(group.get("id"), window_idx)
+
+    # ---------- Tabs ----------
+
+    def __len__(self):
+        return len(self._by_uuid)
+
+    def __contains__(self, uuid):
+        return uuid in self._by_uuid
+
+    def get(self, uuid: str) -> Optional[TabRecord]:
+        return self._by_uuid.get(uuid)
+
+    def add(self, tab: TabRecord):
+        self._by_uuid[tab.uuid] = tab
+        for key in self._INDEXED:
+            self._by_key[key][getattr(tab, key)].add(tab)
+        self._window_groups[tab.window_index][tab.group_id] += 1
+
+    def remove(self, tab: TabRecord):
+        self._by_uuid.pop(tab.uuid, None)
+        for key in self._INDEXED:
+            self._discard(key, getattr(tab, key), tab)
+        self._count_group(tab.window_index, tab.group_id, -1)
+        self.invalidate_window(tab.window_index)
+
+    def update(self, tab: TabRecord, **changes):
+        """Sets fields on the record and moves it between the affected lookup sets"""
+        if "window_index" in changes or "group_id" in changes:
+            self._count_group(tab.window_index, tab.group_id, -1)
+        for key, value in changes.items():
+            if key in self._by_key:
+                self._discard(key, getattr(tab, key), tab)
+                tab[key] = value
+                self._by_key[key][getattr(tab, key)].add(tab)
+            else:
+                tab[key] = value
+        if "window_index" in changes or "group_id" in changes:
+            self._window_groups[tab.window_index][tab.group_id] += 1
+
+    def tabs_by_url_hash(self, url_hash: str) -> Set[TabRecord]:
+        return self._by_key["url_hash"].get(url_hash, set())
+
+    def tabs_by_domain(self, domain: str) -> Set[TabRecord]:
+        return self._by_key["domain"].get(domain, set())
+
+    def tabs_in_group(self, group_id) -> Set[TabRecord]:
+        return self._by_key["group_id"].get(group_id, set())
+
+    def tabs_in_window(self, window_index: int) -> Set[TabRecord]:
+        return self._by_key["window_index"].get(window_index, set())
+
+    def windows(self) -> List[int]:
+        return sorted(w for w, groups in self._window_groups.items() if groups)
+
+    def group_ids_in_window(self, window_index: int) -> List:
+        """Group IDs used by tabs of a window (in order of first appearance, without None)"""
+        return [gid for gid, count in self._window_groups.get(window_index, {}).items() if gid and count > 0]
+
+    # ---------- Tree items ----------
+
+    def attach_tree(self, tree):
+        """Tree (SessionTreeView) whose items item() returns"""
+        self._tree = tree
+
+    def item(self, uuid: str):
+        """Tree item of a tab (created if its row wasn't fetched yet), None if the tab isn't shown"""
+        return self._tree.item_for_uuid(uuid) if self._tree is not None else None
+
+    # ---------- Groups ----------
+
+    def group(self, group_id) -> Optional[Dict]:
+        return self._groups_by_id.get(group_id)
+
+    def group_by_name(self, name: str) -> Optional[Dict]:
+        return self._groups_by_name.get(name)
+
+    def group_window(self, group_id) -> Optional[int]:
+        """Index of the window whose json 'groups' list defines the group"""
+        return self._group_windows.get(group_id)
+
+    # ---------- Raw tab positions ----------
+
+    def raw_position(self, tab: TabRecord) -> Optional[Tuple[int, int]]:
+        """(window_index, position) of tab.raw_tab in json_data['windows'][window]['tabs'], None if not there"""
+        if not self.json_data or tab.raw_tab is None:
+            return None
+        windows = self.json_data.get("windows", [])
+        window_index = tab.window_index
+        if not 0 <= window_index < len(windows):
+            return None
+
+        raw_tabs = windows[window_index].get("tabs", [])
+        positions = self._raw_positions.get(window_index)
+        pos = positions.get(id(tab.raw_tab)) if positions else None
+        if pos is None or pos >= len(raw_tabs) or raw_tabs[pos] is not tab.raw_tab:
+            # Window list changed since the last lookup - rebuild its positions once
+            positions = {id(raw): i for i, raw in enumerate(raw_tabs)}
+            self._raw_positions[window_index] = positions
+            pos = positions.get(id(tab.raw_tab))
+        return None if pos is None else (window_index, pos)
+
+    def invalidate_window(self, window_index: int):
+        """Call after tabs were added to/removed from a window's raw tab list"""
+        self._raw_positions.pop(window_index, None)
+
+    # ---------- Internals ----------
+
+    def _discard(self, key, value, tab):
+        tabs = self._by_key[key].get(value)
+        if tabs is not None:
+            tabs.discard(tab)
+            if not tabs:
+                del self._by_key[key][value]
+
+    def _count_group(self, window_index, group_id, delta):
+        counter = self._window_groups[window_index]
+        counter[group_id] += delta
+        if counter[group_id] <= 0:
+            del counter[group_id]
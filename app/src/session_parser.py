@@ -1,8 +1,10 @@
 import os
+import sys
 import json
 import pprint
 import lz4.block
-from app.utils import extract_domain, generate_url_hash, tr, Logger
+from app.utils import extract_domain, generate_url_hash, tr, Logger, codec
+from app.src.tab_record import TabRecord
 
 class SessionParser:
     def __init__(self, session_file_path: str):
@@ -10,26 +12,38 @@ class SessionParser:
         self.json_data = None
         self.logger = Logger.get_logger("SessionParser")
         self.err_count = 0
+        self.favicon_stats = None
 
     def load_session(self) -> dict:
+        compressed_data = self.read_compressed()
+        decompressed_data = self.decompress(compressed_data)
+        return self.parse(decompressed_data)
+
+    def read_compressed(self) -> bytes:
+        """Reads the raw file and returns the lz4 block without the mozLz40 magic header."""
         if not os.path.exists(self.session_file_path):
             raise FileNotFoundError(f"{tr('Session file not found:', 'session_parser_error')} {self.session_file_path}")
 
         with open(self.session_file_path, "rb") as f:
-            magic = f.read(8)
-            if magic != b"mozLz40\0":
+            magic = f.read(len(codec.MOZLZ4_MAGIC))
+            if magic != codec.MOZLZ4_MAGIC:
                 raise ValueError(tr("Invalid jsonLz4 file format", "session_parser_error"))
-            compressed_data = f.read()
+            return f.read()
 
+    def decompress(self, compressed_data: bytes) -> bytes:
         try:
-            decompressed_data = lz4.block.decompress(compressed_data)
-            self.json_data = json.loads(decompressed_data)
-            self.logger.info(tr("Session data loaded successfully.", "session_parser"))
-            return self.json_data
-        
+            return codec.lz4_decompress(compressed_data)
         except lz4.block.LZ4BlockError as e:
             self.logger.error(f"{tr('Failed to decompress session data', 'session_parser_error')}: {e} |#| ({type(e).__name__})", exc_info=True)
             raise ValueError(tr('Failed to decompress session data.', 'session_parser_error')) from e
+
+    def parse(self, decompressed_data: bytes) -> dict:
+        try:
+            self.json_data = codec.json_loads(decompressed_data)
+            self.intern_favicons()
+            self.logger.info(tr("Session data loaded successfully.", "session_parser"))
+            return self.json_data
+
         except json.JSONDecodeError as e:
             self.logger.error(f"{tr('Failed to parse session data', 'session_parser_error')}: {e} |#| ({type(e).__name__})", exc_info=True)
             raise ValueError(tr('Failed to parse session data.', 'session_parser_error')) from e
@@ -42,7 +56,7 @@ class SessionParser:
             raise ValueError(tr("Session data not loaded.", "session_parser_error"))
 
         self.sync_enriched_to_raw()
-        clean_data = json.loads(json.dumps(self.json_data))
+        clean_data = codec.json_loads(codec.json_dumps(self.json_data))
         for window in clean_data.get("windows", []):
             for tab in window.get("tabs", []):
                 if "raw_tab" in tab:
@@ -50,20 +64,68 @@ class SessionParser:
         output_data = clean_data
 
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(output_data, f, intend=2, ensure_ascii=False)
+            codec.json_dump_file(output_data, output_path, indent=2)
             return True
         except Exception as e:
             self.logger.error(f"{tr('Failed to save session data', 'session_parser_error')}: {e} |#| ({type(e).__name__})", exc_info=True)
             raise RuntimeError(tr('Failed to save session data.', 'session_parser_error')) from e
 
+    def intern_favicons(self) -> dict:
+        """
+        Makes all tabs with the same favicon share one string object.
+
+        Firefox stores the favicon of every tab as its own data: URI, tabs of the same site repeat
+        the same one (often several KB). Open, closed and saved tabs (and their "state") are walked
+        once after parsing; every "image" is replaced by the first equal string seen, keyed by its
+        content. raw_tab, the TabRecords, closed-tab data and the session cache all keep references
+        to these, and write_jsonlz4() serializes the same values as before.
+
+        Returns (and keeps in favicon_stats) the number of images, unique images and bytes saved.
+        """
+        interned = {}
+        stats = {"images": 0, "unique": 0, "saved_bytes": 0}
+
+        def intern_image(holder):
+            image = holder.get("image")
+            if image and type(image) is str:
+                stats["images"] += 1
+                shared = interned.setdefault(image, image)
+                if shared is not image:
+                    holder["image"] = shared
+                    stats["saved_bytes"] += sys.getsizeof(image)
+
+        def intern_tabs(tabs):
+            for tab in tabs or ():
+                intern_image(tab)
+                state = tab.get("state")
+                if state and type(state) is dict:
+                    intern_image(state)
+
+        for window in self.json_data.get("windows", []) + self.json_data.get("_closedWindows", []):
+            intern_tabs(window.get("tabs"))
+            intern_tabs(window.get("_closedTabs"))
+            for group in window.get("closedGroups", []):
+                intern_tabs(group.get("tabs"))
+        for group in self.json_data.get("savedGroups", []):
+            intern_tabs(group.get("tabs"))
+
+        stats["unique"] = len(interned)
+        self.favicon_stats = stats
+        if stats["images"]:
+            self.logger.debug(f"Favicons: {stats['images']} images, {stats['unique']} unique, {stats['saved_bytes'] / 1024:.0f} KB saved")
+        return stats
+
     def get_raw_data(self) -> dict:
         if self.json_data is None:
             self.logger.error(tr("Session data not loaded.", "session_parser_error"))
             raise RuntimeError(tr("Session data not loaded.", "session_parser_error"))
         return self.json_data
 
-    def get_enriched_tabs_and_groups(self):
+    def get_enriched_tabs_and_groups(self, progress_callback=None, cancel_check=None):
+        """
+        Builds the flat tab list used by the UI.
+        progress_callback(done, total) and cancel_check() are optional and only used by the background loader.
+        """
         if self.json_data is None:
             raise RuntimeError(tr("Session data not loaded.", "session_parser"))
 
@@ -72,7 +134,10 @@ class SessionParser:
         groups = {}
         all_groups = []
 
-        for window in windows:
+        total_tabs = sum(len(window.get('tabs', [])) for window in windows)
+        done_tabs = 0
+
+        for window_index, window in enumerate(windows):
             group_defs = window.get("groups", [])
             all_groups.extend(group_defs)
             
@@ -85,6 +150,13 @@ class SessionParser:
                 
             tabs = window.get('tabs', [])
             for tab in tabs:
+                done_tabs += 1
+                if done_tabs % 1000 == 0:
+                    if cancel_check and cancel_check():
+                        return None
+                    if progress_callback:
+                        progress_callback(done_tabs, total_tabs)
+
                 entries = tab.get('entries', [])
                 if not entries:
                     continue
@@ -101,31 +173,63 @@ class SessionParser:
                 pinned = tab.get('pinned', False)
                 hidden = tab.get('hidden', False)
                 
-                enriched_tabs.append({
-                    'title': title,
-                    'url': url,
-                    'uuid': uuid,
-                    'url_hash': url_hash,
-                    'favicon': favicon,
-                    'domain': domain,
-                    'group_id': group_id,
-                    'group_name': group_name,
-                    'window_index': windows.index(window),
-                    'pinned': pinned,
-                    'hidden': hidden,
-                    'last_accessed': tab.get('lastAccessed', 0),
-                    'status': 'active',
-                    'raw_tab': tab
-                })
+                enriched_tabs.append(TabRecord(
+                    title=title,
+                    url=url,
+                    uuid=uuid,
+                    url_hash=url_hash,
+                    favicon=favicon,
+                    domain=domain,
+                    group_id=group_id,
+                    group_name=group_name,
+                    window_index=window_index,
+                    pinned=pinned,
+                    hidden=hidden,
+                    last_accessed=tab.get('lastAccessed', 0),
+                    status='active',
+                    raw_tab=tab
+                ))
 
         self.enriched_tabs = enriched_tabs
         self.group_map = groups
         self.group_infos = all_groups
         return enriched_tabs, groups, all_groups
 
+    def count_extra_tabs(self) -> int:
+        """
+        Anzahl der geschlossenen und gespeicherten Tabs, die get_extra_tabs_data() liefern würde
+        (len(counting_tabs)), ohne die Daten aufzubereiten - für die Statusmeldung beim Laden.
+        """
+        if not self.json_data:
+            raise RuntimeError(tr("No data are loaded", "session_parser"))
+
+        def count(tabs, in_state=True):
+            valid = 0
+            for tab in tabs:
+                holder = tab.get("state", {}) if in_state else tab
+                entries = holder.get("entries", []) if isinstance(holder, dict) else None
+                if isinstance(entries, list) and entries and isinstance(entries[-1], dict):
+                    valid += 1
+            return valid
+
+        total = 0
+        for window in self.json_data.get("windows", []):
+            total += count(window.get("_closedTabs", []))
+            for closed_group in window.get("closedGroups", []):
+                total += count(closed_group.get("tabs", []))
+        for closed_window in self.json_data.get("_closedWindows", []):
+            total += count(closed_window.get("tabs", []), in_state=False)
+            total += count(closed_window.get("_closedTabs", []))
+            for closed_group in closed_window.get("closedGroups", []):
+                total += count(closed_group.get("tabs", []))
+        for saved_group in self.json_data.get("savedGroups", []):
+            total += count(saved_group.get("tabs", []))
+        return total
+
     def get_extra_tabs_data(self):
         """
         Extrahiert alle geschlossenen Tabs, Gruppen und Fenster aus der Session.
+        Wird erst aufgerufen, wenn die Ansicht der geschlossenen Tabs (oder die Duplikatsuche) sie braucht.
         """
         if not self.json_data:
             raise RuntimeError(tr("No data are loaded", "session_parser"))
@@ -410,28 +514,28 @@ class SessionParser:
             return
 
         # For planned "Pending Changes" implementation: Check if status is not "delete
-        active_tabs = [etab for etab in self.enriched_tabs if etab["status"] != "delete"]
+        active_tabs = [etab for etab in self.enriched_tabs if etab.status != "delete"]
         
         for window in self.json_data.get("windows", []):
             window["tabs"] = []
 
         for etab in active_tabs:
-            window_index = etab.get("window_index")
+            window_index = etab.window_index
             if 0 <= window_index < len(self.json_data["windows"]):
                 window = self.json_data["windows"][window_index]
-                window["tabs"].append(etab["raw_tab"])
+                window["tabs"].append(etab.raw_tab)
         
         for etab in active_tabs:
-            raw_tab = etab.get("raw_tab")
+            raw_tab = etab.raw_tab
             if not raw_tab:
                 continue
             entries = raw_tab.get("entries", [])
             if entries:
-                entries[-1]["title"] = etab["title"]
-                entries[-1]["url"] = etab["url"]
-            raw_tab["groupId"] = etab.get("group_id", "")
-            gid = etab.get("group_id", "")
-            gname = etab.get("group_name", "")
+                entries[-1]["title"] = etab.title
+                entries[-1]["url"] = etab.url
+            raw_tab["groupId"] = etab.group_id
+            gid = etab.group_id
+            gname = etab.group_name
             if gid and gname:
                 self.group_map[gid] = gname
 
@@ -443,11 +547,6 @@ class SessionParser:
                     gdef["name"] = self.group_map[gid]
 
 
-    def write_jsonlz4(self):
-        import lz4.block
-        import json
-        magic = b'mozLz40\0'
-        json_bytes = json.dumps(self.json_data, ensure_ascii=False).encode('utf-8')
-        compressed_data = lz4.block.compress(json_bytes)
-        with open(self.session_file_path, 'wb') as f:
-            f.write(magic + compressed_data)
\ No newline at end of file
+    def write_jsonlz4(self, level: str = None):
+        """Writes json_data back to the session file. level: one of codec.LZ4_LEVELS (fast/default/high/max)"""
+        codec.write_jsonlz4(self.json_data, self.session_file_path, level=level)
\ No newline at end of file
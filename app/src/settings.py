@@ -7,11 +7,29 @@ class AppSettings:
         self._defaults = {
             "image_cache_dir": "user_data/img",
             "favicon_cache_dir": "user_data/favicons",
+            "image_max_mb": 10,               # larger images are not downloaded
+            "image_downloads_per_page": 4,    # images of one page downloaded at the same time
+            "session_cache_dir": "user_data/cache/sessions",
+            "session_cache_max_mb": 256,
+            "session_lz4_level": "default",   # "fast", "default", "high", "max" - used when writing sessions back
+            "http_cache_dir": "user_data/cache/http",
+            "http_cache_max_mb": 256,         # 0 = pages are not cached
+            "http_cache_ttl_min": 60,         # cached pages younger than this are used without asking the server
+            "search_debounce_ms": 150,        # delay between the last keystroke and filtering the tab tree
             "language": "auto",  # "auto" or specific language code like "en", "de"
             "your_timezone": 2,
             "theme": "auto",     # "light", "dark", "auto"
             
             "Plugins/xpath_enabled": True,
+            "Plugins/scrape_concurrency": 8,   # tabs fetched at the same time by "Scrape Group/Window"
+            "Plugins/scrape_per_domain": 2,    # ... and at most this many of them from one domain
+
+            "http/connect_timeout": 10,   # seconds
+            "http/read_timeout": 30,      # seconds
+            "http/max_redirects": 10,
+            "http/max_body_mb": 20,       # larger pages/images are not downloaded
+            "http/pool_size": 10,         # keep-alive connections per host
+            "http/http2": False,          # needs httpx with h2 (pip install httpx[http2])
             
             "browser_agent/User-Agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             "browser_agent/Accept": 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -0,0 +1,105 @@
+import sys
+
+# Bit flags for TabRecord.flags
+PINNED = 1
+HIDDEN = 2
+DELETED = 4   # "Pending Changes": tab is dropped by sync_enriched_to_raw()
+
+_intern = sys.intern
+
+
+class TabRecord:
+    """
+    One active tab of a session (what used to be the 14-key "enriched tab" dict).
+
+    Slotted to keep 50k-tab sessions small: domain and group strings are interned, pinned/hidden/status
+    live in one int. The object is stored as-is in the tree items (no copies), so parser, loader, tree
+    and helpers all see the same record.
+
+    Dict-style access (tab["title"], tab.get("url"), "uuid" in tab) still works, so code written
+    for the old dicts keeps working. 'type' is always 'tab_item'.
+    """
+    __slots__ = (
+        "title", "url", "uuid", "url_hash", "favicon", "domain",
+        "group_id", "group_name", "window_index", "last_accessed",
+        "flags", "raw_tab",
+        "data_entries", "filterable_values",   # only set when extracted data is attached
+        "_original_title",                     # only set by the title cleaner
+    )
+
+    type = "tab_item"
+
+    _KEYS = frozenset(__slots__) | {"type", "pinned", "hidden", "status"}
+
+    def __init__(self, title, url, uuid, url_hash, favicon, domain, group_id, group_name,
+                 window_index, last_accessed=0, pinned=False, hidden=False, status="active", raw_tab=None):
+        self.title = title
+        self.url = url
+        self.uuid = uuid
+        self.url_hash = url_hash
+        self.favicon = favicon
+        self.domain = _intern(domain) if domain else domain
+        self.group_id = _intern(group_id) if isinstance(group_id, str) else group_id
+        self.group_name = _intern(group_name) if group_name else group_name
+        self.window_index = window_index
+        self.last_accessed = last_accessed
+        self.flags = (PINNED if pinned else 0) | (HIDDEN if hidden else 0) | (DELETED if status == "delete" else 0)
+        self.raw_tab = raw_tab
+
+    # ---------- Flags ----------
+
+    @property
+    def pinned(self) -> bool:
+        return bool(self.flags & PINNED)
+
+    @pinned.setter
+    def pinned(self, value):
+        self.flags = self.flags | PINNED if value else self.flags & ~PINNED
+
+    @property
+    def hidden(self) -> bool:
+        return bool(self.flags & HIDDEN)
+
+    @hidden.setter
+    def hidden(self, value):
+        self.flags = self.flags | HIDDEN if value else self.flags & ~HIDDEN
+
+    @property
+    def status(self) -> str:
+        return "delete" if self.flags & DELETED else "active"
+
+    @status.setter
+    def status(self, value):
+        self.flags = self.flags | DELETED if value == "delete" else self.flags & ~DELETED
+
+    # ---------- Dict compatibility ----------
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS or key == "type":
+            raise KeyError(key)
+        if key in ("domain", "group_name") and value:
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._KEYS and hasattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self._KEYS:
+            return default
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        """Plain dict in the old enriched-tab layout (for export/debugging)"""
+        return {key: getattr(self, key) for key in self._KEYS if hasattr(self, key)}
+
+    def __repr__(self):
+        return f"TabRecord(uuid={self.uuid!r}, title={self.title!r}, window={self.window_index}, group={self.group_name!r})"
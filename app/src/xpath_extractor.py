@@ -0,0 +1,163 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from lxml import etree
+
+from app.utils import Logger
+
+logger = Logger.get_logger("XPathExtractor")
+
+IMAGE_ATTRIBUTES = ('src', 'data-src', 'data-image')
+SLOW_RULE_MS = 50   # rules slower than this (on average) are marked in the rule editor
+
+# '.../@attr' and '.../text()' select strings, everything else is treated as elements
+_STRING_XPATH = re.compile(r"/(@[\w:-]+|text\(\))\s*$")
+
+
+class CompiledRule:
+    """
+    An XPath rule compiled once for all pages: the lxml.etree.XPath object and what to take from
+    its results (strings as they are, the text of elements, or the image source of <img>s).
+    Also collects how long the rule takes per page.
+    """
+    __slots__ = ("id", "name", "xpath", "is_image", "strings", "path", "error", "runs", "total_ms", "max_ms")
+
+    def __init__(self, rule: dict):
+        self.id = rule.get('id')
+        self.name = rule.get('name', 'Unknown')
+        self.xpath = (rule.get('xpath') or '').strip()
+        self.is_image = bool(rule.get('is_image', False))
+        self.strings = bool(_STRING_XPATH.search(self.xpath))
+        self.path = None
+        self.error = None
+        self.runs = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        try:
+            if self.xpath:
+                # plain str results: much faster than lxml's "smart strings", which we don't need
+                self.path = etree.XPath(self.xpath, smart_strings=False)
+        except etree.XPathError as e:
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"Invalid XPath in rule '{self.name}': {self.xpath} ({self.error})")
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.runs if self.runs else 0.0
+
+    def values(self, tree) -> List[str]:
+        result = self.path(tree)
+        if not isinstance(result, list):
+            result = [result]   # count(), boolean(), string() ...
+        values = []
+        if self.strings:
+            for value in result:
+                value = str(value).strip()
+                if value:
+                    values.append(value)
+        elif self.is_image:
+            for el in result:
+                if isinstance(el, str):
+                    src = el
+                else:
+                    src = next((el.get(a) for a in IMAGE_ATTRIBUTES if el.get(a)), None)
+                if src and src.strip():
+                    values.append(src.strip())
+        else:
+            for el in result:
+                if hasattr(el, 'text_content'):
+                    text = el.text_content().strip()
+                else:
+                    text = str(el).strip()
+                if text:
+                    values.append(text)
+        return values
+
+
+# (rule id, xpath, is_image) -> CompiledRule; an edited rule gets a new entry (and new timings)
+_compiled: "OrderedDict[tuple, CompiledRule]" = OrderedDict()
+_compiled_lock = threading.Lock()
+_MAX_COMPILED = 1024
+
+
+def compile_rule(rule: dict) -> CompiledRule:
+    """Returns the compiled rule from the cache, compiling it on first use"""
+    key = (rule.get('id'), rule.get('xpath') or '', bool(rule.get('is_image', False)))
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+    compiled = CompiledRule(rule)
+    with _compiled_lock:
+        compiled = _compiled.setdefault(key, compiled)
+        while len(_compiled) > _MAX_COMPILED:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def rule_timing(rule: dict) -> Optional[CompiledRule]:
+    """The compiled rule with its timings, or None if it hasn't run since the start"""
+    key = (rule.get('id'), rule.get('xpath') or '', bool(rule.get('is_image', False)))
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+    return compiled if compiled is not None and compiled.runs else None
+
+
+def extract_rules(tree, rules: List[dict], on_image: Optional[Callable[[str, int], None]] = None) -> Dict[str, dict]:
+    """
+    Applies the XPath rules to a parsed page (lxml tree), used by both engines.
+
+    Returns {rule_name: {'values': [...], 'is_filter': bool, 'priority': int}} - the format
+    on_data_extracted expects. For image rules the image sources are the values; on_image(src, n)
+    is called for each of them (n counts the images of the page).
+    """
+    extracted = {}
+    image_count = 0
+
+    for rule in rules:
+        compiled = compile_rule(rule)
+        if compiled.error is not None:
+            # logged once when it was compiled
+            extracted[compiled.name] = {
+                'values': [],
+                'is_filter': rule.get('is_filter', False),
+                'priority': rule.get('priority', 99)
+            }
+            continue
+        if compiled.path is None:
+            continue   # no xpath
+
+        try:
+            started = time.perf_counter()
+            values = compiled.values(tree)
+            elapsed = (time.perf_counter() - started) * 1000
+            with _compiled_lock:
+                compiled.runs += 1
+                compiled.total_ms += elapsed
+                compiled.max_ms = max(compiled.max_ms, elapsed)
+
+            if compiled.is_image:
+                for src in values:
+                    if on_image is not None:
+                        on_image(src, image_count)
+                    image_count += 1
+
+            extracted[compiled.name] = {
+                'values': values,
+                'is_filter': rule.get('is_filter', False),
+                'priority': rule.get('priority', 0)
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing XPath rule '{compiled.name}': {e}")
+            extracted[compiled.name] = {
+                'values': [],
+                'is_filter': rule.get('is_filter', False),
+                'priority': rule.get('priority', 99)
+            }
+
+    return extracted
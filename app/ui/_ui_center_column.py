@@ -2,7 +2,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLineEdit, QLabel, QTreeWidget, QPushButton
 )
-from app.ui.helpers import load_icon, colored_svg_icon
+from app.ui.helpers import load_icon, colored_svg_icon, SessionTreeView
 from app.utils.ui_translator import tr
 
 class CenterColumnWidget(QWidget):
@@ -33,7 +33,7 @@ class CenterColumnWidget(QWidget):
         self.scc_layout.setContentsMargins(0, 0, 0, 0)
         self.scc_layout.setSpacing(0)
 
-        self.session_widget = QTreeWidget()
+        self.session_widget = SessionTreeView()
         self.session_widget.setHeaderLabel(tr("Session Tabs", "main"))
         self.session_widget.setExpandsOnDoubleClick(True)
         self.session_widget.setUniformRowHeights(True)
@@ -47,6 +47,9 @@ class LeftColumnWidget(QWidget):
 
         self.dup_title_cb = QCheckBox(tr("By Title", "menu_checkbox"))
         self.dup_url_cb = QCheckBox(tr("By URL", "menu_checkbox"))
+        self.dup_url_cb.setToolTip(tr("Tracking parameters, 'www.', http/https and trailing slashes are ignored", "menu_tooltip"))
+        self.dup_similar_cb = QCheckBox(tr("Similar Titles", "menu_checkbox"))
+        self.dup_similar_cb.setToolTip(tr("Also treat nearly identical titles as duplicates", "menu_tooltip"))
         self.regex_checkbox = QCheckBox(tr("Apply Regex:", "menu_checkbox"))
         self.regex_checkbox.setToolTip(tr("Enable/Disable usage of Regex Filtering", "menu_tooltip"))
         
@@ -63,12 +66,16 @@ class LeftColumnWidget(QWidget):
             
         self.dup_keep_group = QCheckBox(tr("Keep Groups", "menu_checkbox"))
         self.dup_keep_group.setToolTip(tr("Keep the Tab Groups (Containers) when filtering duplicates", "menu_tooltip"))
+        self.dup_closed_cb = QCheckBox(tr("Include Closed Tabs", "menu_checkbox"))
+        self.dup_closed_cb.setToolTip(tr("Also search closed tabs, closed windows and saved groups", "menu_tooltip"))
 
         dup_layout.addWidget(self.dup_title_cb)
+        dup_layout.addWidget(self.dup_similar_cb)
         dup_layout.addWidget(self.dup_url_cb)
         dup_layout.addWidget(self.regex_checkbox)
         dup_layout.addLayout(rgx_layout)
         dup_layout.addWidget(self.dup_keep_group)
+        dup_layout.addWidget(self.dup_closed_cb)
         dup_layout_group.setLayout(dup_layout)
 
         # Tools
@@ -1,5 +1,6 @@
 import os
 import re
+import gc
 import traceback
 import webbrowser
 import json
@@ -14,7 +15,7 @@ from urllib.parse import urlparse
 from shiboken6 import isValid       #only for "_apply_chip_filter"
 
 from PySide6.QtCore import Qt, QUrl, QThread, QTimer, Slot, QMetaObject, QBuffer, QIODevice, QSize, QRect, QByteArray, QCoreApplication, QPoint, QMargins, QEvent
-from PySide6.QtGui import QPixmap, QIcon, QFont, QColor, QPainter
+from PySide6.QtGui import QPixmap, QImage, QIcon, QFont, QColor, QPainter
 from PySide6.QtSvgWidgets import QSvgWidget
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFrame, QMenuBar, QGroupBox, QLayout, QTableWidgetItem, QInputDialog,
@@ -28,29 +29,44 @@ import pprint
 from sqlite3 import OperationalError
 from app.utils.db_handler import DBHandler
 #from app.utils import Logger, tr, find_firefox_profiles, create_backup_dir
-from app.utils import Logger, tr, UtilsHelper
+from app.utils import Logger, tr, UtilsHelper, codec
 from app.ui.helpers import get_theme_color_hex, StatusBar, StatusButton, COLORS, GUI_COLORS, get_color, get_color_hex, colored_svg_icon
 from app.ui.helpers.ui_themes import theme_manager, is_dark_mode
 from app.ui.helpers.ui_icon_loader import load_icon
+from app.ui.helpers.icon_registry import icon_registry
 from app.ui.dialogs import OpenRecentProjectFileDialog, FFProfileSelectionDialog, FileSelectionDialog, ExportBookmarksDialog, TitleCleanerDialog, GroupEditor
 from app.ui._ui_left_column import LeftColumnWidget
 from app.ui._ui_center_column import CenterColumnWidget
 from app.ui._ui_right_column import RightColumnWidget
 from app.src.session_parser import SessionParser
+from app.src.tab_record import TabRecord
+from app.src.session_index import SessionIndex
+from app.src.search_index import SearchIndex
 from app.services.session_loader import SessionLoader, SessionLoadingError
+from app.services.session_load_worker import SessionLoadWorker
+from app.services.session_cache import SessionCache
+from app.services.http_cache import HttpCache
+from app.services.image_downloader import ImageDownloader
+from app.services.thumbnail_cache import ThumbnailCache
+from app.services.favicon_cache import FaviconCache
+from app.services.favicon_store import FaviconStore
 from app.services.session_populator import SessionPopulator
+from app.services.db_writer import DBWriter, ExtractedDataJob
 from app.src.session_helpers import SessionHelper
 from app.src.bookmark_exporter import BookmarkExporter
+from app.services.http_client import HttpClient, request_headers
 try:
     import requests
     from lxml import html
     from app.services.xpath_worker_requests import XPathWorkerRequests
+    from app.services.batch_scrape_worker import BatchScrapeWorker, RequestsFetcher
 except:
     pass
 
 try:
     from playwright.async_api import async_playwright
     from app.services.xpath_worker_playwright import XPathWorkerPlaywright
+    from app.services.browser_service import BrowserService
 except:
     pass
 
@@ -63,11 +79,48 @@ class FFsessionToolMainWindow(QMainWindow):
 
         os.makedirs("user_data", exist_ok=True)
         self.db = DBHandler("user_data/sessions.db")
+        # Scraper results are saved by a single writer thread, the GUI thread never waits on SQLite
+        self.db_writer = DBWriter(self.db)
+        self.db_writer.write_finished.connect(self._on_db_write_finished)
+        self.db_writer.write_failed.connect(self._on_db_write_failed)
+        self.db_writer.start()
+        # Chromium for the Playwright engine, started with the first Playwright scrape
+        self.browser_service = None
+        # Connection pools (keep-alive per host) for the requests engine and image downloads,
+        # fetched pages are cached on disk for both engines
+        self.http_cache = HttpCache(
+            self.settings.get("http_cache_dir", type=str),
+            self.settings.get("http_cache_max_mb", type=int),
+            self.settings.get("http_cache_ttl_min", type=int)
+        )
+        self.http_client = HttpClient.from_settings(self.settings, cache=self.http_cache)
+        # Images stream to user_data/img in their own pool, the UI only gets the paths;
+        # the image panel shows thumbnails, decoded off the GUI thread
+        self.thumbnails = ThumbnailCache(self.settings.get("image_cache_dir", type=str), parent=self)
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.image_downloader = ImageDownloader.from_settings(self.http_client, self.settings, thumbnails=self.thumbnails, parent=self)
+        self.image_downloader.image_saved.connect(self.on_image_saved)
+        self.image_downloader.image_failed.connect(self._on_image_failed)
+        QApplication.instance().aboutToQuit.connect(self._stop_batch_scrape)
+        QApplication.instance().aboutToQuit.connect(self._stop_session_loads)
+        QApplication.instance().aboutToQuit.connect(self.db_writer.stop)
+        QApplication.instance().aboutToQuit.connect(self._stop_browser_service)
+        QApplication.instance().aboutToQuit.connect(self.image_downloader.close)
+        QApplication.instance().aboutToQuit.connect(self.thumbnails.close)
+        QApplication.instance().aboutToQuit.connect(self.http_client.close)
+        QApplication.instance().aboutToQuit.connect(self.db.close)
         
         # Initialize services
-        self.session_loader = SessionLoader(self.db)
-        self.favicon_cache = {}
+        self.session_cache = SessionCache(
+            self.settings.get("session_cache_dir", type=str),
+            self.settings.get("session_cache_max_mb", type=int)
+        )
+        self.session_loader = SessionLoader(self.db, self.session_cache)
         self.cache_dir_favicon = self.settings._settings.value("favicon_cache_dir", "user_data/favicons", type=str)
+        self.favicon_store = FaviconStore(self.cache_dir_favicon)
+        self.favicon_cache = FaviconCache(self.favicon_store, parent=self)
+        QApplication.instance().aboutToQuit.connect(self.favicon_cache.close)
+        QApplication.instance().aboutToQuit.connect(self.favicon_store.close)
 
         # Initialize session and utilshelper - status_bar will be set after UI creation
         self.session_helper = SessionHelper(self.logger, None, self.session_loader, self)
@@ -78,7 +131,6 @@ class FFsessionToolMainWindow(QMainWindow):
         
         self.session_populator = SessionPopulator(
             self.favicon_cache, 
-            self.cache_dir_favicon, 
             self.icon_default_tab
         )
         
@@ -100,9 +152,26 @@ class FFsessionToolMainWindow(QMainWindow):
         self.update_theme()
         self._connect_gui_signals()
 
-        self.favicon_cache = {}
         # Hold running workers to prevent GC
         self._workers = set()
+        # Background session loading (worker thread)
+        self._load_worker = None
+        self._session_loading = False
+        # Closed tabs: only counted while loading, extracted by the parser when first needed
+        self._session_parser = None
+        self.closed_tabs_data = None
+        self.closed_tabs_count = 0
+        # Background duplicate search
+        self._dedup_worker = None
+        # Background batch scraping (Scrape Group / Scrape Window)
+        self._batch_worker = None
+        self._batch_progress = (0, 0, 0, 0)   # scraped, failed, skipped, total
+        self.selected_group = None    # tree items the Scrape Group / Scrape Window buttons act on
+        self.selected_window = None
+        self.session_index = SessionIndex()
+        self.session_index.attach_tree(self.ccw.session_widget)
+        self.search_index = SearchIndex()
+        self.rule_coverage = None   # RuleCoverage of the loaded session (tabs with/without XPath rules)
 
     def _main_ui(self):
         self.setWindowTitle("FFSessionTool")
@@ -150,10 +219,12 @@ class FFsessionToolMainWindow(QMainWindow):
             self.lcw.replace_btn.setEnabled(True)
             self.lcw.dup_title_cb.setEnabled(True)
             self.lcw.dup_url_cb.setEnabled(True)   
+            self.lcw.dup_similar_cb.setEnabled(True)
             self.lcw.regex_checkbox.setEnabled(True)
             self.lcw.regex_input.setEnabled(True)
             self.lcw.save_regex_btn.setEnabled(True)
             self.lcw.dup_keep_group.setEnabled(True)
+            self.lcw.dup_closed_cb.setEnabled(True)
             self.lcw.export_bkm_btn.setEnabled(True)
             self.lcw.tc_btn.setEnabled(True)
             self.lcw.ge_btn.setEnabled(True)
@@ -178,10 +249,12 @@ class FFsessionToolMainWindow(QMainWindow):
             self.lcw.replace_btn.setEnabled(False)
             self.lcw.dup_title_cb.setEnabled(False)
             self.lcw.dup_url_cb.setEnabled(False)   
+            self.lcw.dup_similar_cb.setEnabled(False)
             self.lcw.regex_checkbox.setEnabled(False)
             self.lcw.regex_input.setEnabled(False)
             self.lcw.save_regex_btn.setEnabled(False)
             self.lcw.dup_keep_group.setEnabled(False)
+            self.lcw.dup_closed_cb.setEnabled(False)
             self.lcw.export_bkm_btn.setEnabled(False)
             self.lcw.tc_btn.setEnabled(False)
             self.lcw.ge_btn.setEnabled(False)
@@ -215,12 +288,14 @@ class FFsessionToolMainWindow(QMainWindow):
         self.lcw.replace_btn.clicked.connect(self.replace_session)
         self.lcw.settings_btn.clicked.connect(self.open_settings_dialog)
         # 
-        self.lcw.dup_title_cb.stateChanged.connect(self.utils_helper.find_duplicates)
-        self.lcw.dup_url_cb.stateChanged.connect(self.utils_helper.find_duplicates)
-        self.lcw.regex_input.currentTextChanged.connect(self.utils_helper.find_duplicates)
+        self.lcw.dup_title_cb.stateChanged.connect(self.find_duplicates)
+        self.lcw.dup_url_cb.stateChanged.connect(self.find_duplicates)
+        self.lcw.dup_similar_cb.stateChanged.connect(self.find_duplicates)
+        self.lcw.regex_input.currentTextChanged.connect(self.find_duplicates)
         self.lcw.save_regex_btn.clicked.connect(self.save_regex)
-        self.lcw.dup_keep_group.stateChanged.connect(self.utils_helper.find_duplicates)
-        self.lcw.regex_checkbox.stateChanged.connect(self.utils_helper.find_duplicates)
+        self.lcw.dup_keep_group.stateChanged.connect(self.find_duplicates)
+        self.lcw.dup_closed_cb.stateChanged.connect(self.find_duplicates)
+        self.lcw.regex_checkbox.stateChanged.connect(self.find_duplicates)
          
         self.lcw.export_bkm_btn.clicked.connect(self.export_bookmarks)
         self.lcw.tc_btn.clicked.connect(self.open_title_cleaner_dialog)
@@ -230,7 +305,12 @@ class FFsessionToolMainWindow(QMainWindow):
         # self.lcw.lbi_btn.clicked.connect(self.open_missing_covers_dialog)
         # self.lcw.ext_url_btn.clicked.connect(self.show_extended_urls) # OLD: "open_extendedurl_list"
 
-        self.ccw.filter_input.textChanged.connect(self.utils_helper.apply_search_filter)
+        # Filter after a short typing pause, not on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.settings.get("search_debounce_ms", type=int))
+        self._search_timer.timeout.connect(lambda: self.utils_helper.apply_search_filter(self.ccw.filter_input.text()))
+        self.ccw.filter_input.textChanged.connect(lambda _text: self._search_timer.start())
         self.ccw.closed_session_widget.itemSelectionChanged.connect(self._on_closed_item_selected)
 
         # self.rcw.btn_update_title.clicked.connect(self.fetch_title_from_url) # Coming soon...
@@ -239,8 +319,8 @@ class FFsessionToolMainWindow(QMainWindow):
         self.rcw.group_combo.currentIndexChanged.connect(self.update_data_from_ui)
         # self.rcw.btn_delete.clicked.connect(self.delete_selected_item) # Coming soon...
 
-        # self.rcw.xph_scrape_group_btn.clicked.connect(self.xpath_handler.on_process_group_clicked)
-        # self.rcw.xph_scrape_window_btn.clicked.connect(self.xpath_handler.on_process_window_clicked)
+        self.rcw.xph_scrape_group_btn.clicked.connect(self._on_scrape_group_clicked)
+        self.rcw.xph_scrape_window_btn.clicked.connect(self._on_scrape_window_clicked)
         self.rcw.xph_scrape_url_btn.clicked.connect(self._on_scrape_current_tab_clicked)
         self.rcw.load_image_button.clicked.connect(self._on_load_images_clicked)
 
@@ -288,16 +368,10 @@ class FFsessionToolMainWindow(QMainWindow):
         self.rcw.group_combo.blockSignals(True)
         self.rcw.group_combo.clear()
 
-        # --- Build groups_by_window with correct window_index for each tab ---
+        # --- Build groups_by_window with correct window_index for each tab (kept up to date by the SessionIndex) ---
         groups_by_window = {}
-        if hasattr(self, 'session_tabs') and self.session_tabs:
-            for tab in self.session_tabs:
-                window_index = tab.get('window_index', 0)
-                group_id = tab.get('group_id')
-                if window_index not in groups_by_window:
-                    groups_by_window[window_index] = set()
-                if group_id:
-                    groups_by_window[window_index].add(group_id)
+        for window_index in self.session_index.windows():
+            groups_by_window[window_index] = self.session_index.group_ids_in_window(window_index)
         
         # If no windows found, create at least one default window
         if not groups_by_window:
@@ -308,7 +382,7 @@ class FFsessionToolMainWindow(QMainWindow):
         for window_index in groups_by_window:
             group_objects = []
             for group_id in groups_by_window[window_index]:
-                group_info = next((g for g in self.group_list if g.get('id') == group_id), None)
+                group_info = self.session_index.group(group_id)
                 if group_info:
                     group_info['window_index'] = window_index  # Ensure window_index is set
                     group_objects.append(group_info)
@@ -432,7 +506,7 @@ class FFsessionToolMainWindow(QMainWindow):
                 self.selected_group = None
                 self.selected_window = None
 
-        if not isinstance(item_data, dict):
+        if not isinstance(item_data, (dict, TabRecord)):
             self.rcw.clear_details()
             self.rcw.btn_delete.setEnabled(False)
             return
@@ -455,7 +529,7 @@ class FFsessionToolMainWindow(QMainWindow):
 
         self._ui_update_group_combo()
 
-        if isinstance(item_data, dict) and item_data.get('type') not in ('group', 'window'):
+        if isinstance(item_data, (dict, TabRecord)) and item_data.get('type') not in ('group', 'window'):
             combo_index = -1
             current_tab_window_index = item_data.get('window_index', 0)
             
@@ -621,16 +695,23 @@ class FFsessionToolMainWindow(QMainWindow):
         self.not_the_human = False
 
     # == Closed Tabs View ==
+    def _get_closed_tabs_data(self):
+        """Closed tabs/groups/windows of the loaded session, extracted on first use"""
+        if self.closed_tabs_data is None and self._session_parser is not None:
+            self.closed_tabs_data = self._session_parser.get_extra_tabs_data()
+        return self.closed_tabs_data
+
     def toggle_closed_tabs_view(self, checked):
         if checked:
             self.ccw.session_widget.setVisible(True) # Splitview
             self.ccw.closed_session_widget.setVisible(True)
-            # start populating closed tabs widget
-            self.session_populator.populate_closed_tabs(
-                self.ccw.closed_session_widget, 
-                self.closed_tabs_data, 
-                self._format_timestamp
-            )
+            # start populating closed tabs widget (once per session, the nodes fill themselves when expanded)
+            if self.ccw.closed_session_widget.topLevelItemCount() == 0:
+                self.session_populator.populate_closed_tabs(
+                    self.ccw.closed_session_widget, 
+                    self._get_closed_tabs_data(), 
+                    self._format_timestamp
+                )
             self.ccw.show_closed_tabs_btn.setText(tr("Hide Closed Tabs", "main"))
         else:
             self.ccw.closed_session_widget.setVisible(False)
@@ -758,53 +839,157 @@ class FFsessionToolMainWindow(QMainWindow):
             self.status_bar.show_message(tr("Unexpected error loading file", "error"), message_type="error")
         
     def load_session_file(self, path: str):
-        """Load session file using the SessionLoader service"""
-        try:          
-            # Load session data using service
-            enriched_tabs, groups, all_groups_info = self.session_loader.load_session_file(path)
-            
+        """Start loading a session file in the background (SessionLoadWorker) and build the tree when it is done"""
+        try:
+            self.cancel_session_load(silent=True)
+            self.cancel_duplicate_search()
+            self.cancel_batch_scrape(silent=True)   # its results belong to the old session
+
+            self._session_loading = True
+            self.lcw.load_btn.setEnabled(False)
+            self.lcw.import_btn.setEnabled(False)
+            self._show_load_progress("decompress", 0)
+
+            worker = SessionLoadWorker(self.session_loader, path)
+            worker.stage_changed.connect(self._show_load_progress)
+            worker.load_finished.connect(self._on_session_load_finished)
+            worker.load_failed.connect(self._on_session_load_failed)
+            worker.load_cancelled.connect(self._on_session_load_cancelled)
+            worker.finished.connect(self._on_load_worker_finished)
+            self._load_worker = worker
+            self._workers.add(worker)   # a cancelled load keeps running until its next check
+            worker.start()
+
+        except Exception as e:
+            self._end_session_loading()
+            self.status_bar.show_message(tr("Unexpected error loading session", "error"), message_type="error")
+            self.logger.error(f"{tr('Unexpected error loading session', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+
+    def cancel_session_load(self, silent=False):
+        """Stop a running load (the worker thread)"""
+        cancelled = False
+        if self._load_worker is not None and self._load_worker.isRunning():
+            # not waited for: the worker shares nothing with the shown session, its result is just dropped
+            self._load_worker.cancel()
+            cancelled = True
+        # pending signals of the old worker are ignored from here on (see sender() checks)
+        self._load_worker = None
+
+        if cancelled:
+            self._end_session_loading()
+            if not silent:
+                self.status_bar.show_message(tr("Loading cancelled.", "main"), message_type="warning")
+
+    def _stop_session_loads(self):
+        """On quit: cancel and wait for the load workers (cancelled ones may still run to their next check)"""
+        self.cancel_session_load(silent=True)
+        for worker in [w for w in self._workers if isinstance(w, SessionLoadWorker)]:
+            worker.wait()
+
+    def _show_load_progress(self, stage, percent):
+        stage_labels = {
+            "decompress": tr("Decompressing session...", "main"),
+            "parse": tr("Parsing session data...", "main"),
+            "enrich": tr("Preparing tabs...", "main"),
+            "closed_tabs": tr("Reading closed tabs...", "main"),
+            "ui_build": tr("Building tab list...", "main"),
+        }
+        self.status_bar.show_message([
+            f"{stage_labels.get(stage, tr('Loading session...', 'statusbar'))} ({percent}%)",
+            StatusButton(text=tr("Cancel", "main"), callback=self.cancel_session_load, icon=load_icon("cancel"))
+        ])
+
+    def _on_session_load_finished(self, result):
+        if self.sender() is not self._load_worker:
+            return  # result of a load that was replaced by a newer one
+
+        path = result["path"]
+        try:
             # Reset state
             self.favicon_download_asked = False
             self.failed_favicon_domains = set()
             
             # Store loaded data
-            self.session_tabs = enriched_tabs
-            self.session_groups = groups
-            self.group_list = all_groups_info
+            self.session_tabs = result["tabs"]
+            self.session_groups = result["groups"]
+            self.group_list = result["group_list"]
+            self._session_parser = result["session_parser"]
+            self.closed_tabs_count = result["closed_tabs_count"]
+            self.closed_tabs_data = None
+            self.session_populator.clear_closed_tabs(self.ccw.closed_session_widget)
+            if self.ccw.show_closed_tabs_btn.isChecked():
+                self.toggle_closed_tabs_view(True)
+            self.session_index = result["session_index"]
+            self.session_index.attach_tree(self.ccw.session_widget)
+            self.search_index = result["search_index"]
+            self.session_helper.session_index = self.session_index
+            self.session_helper.session_parser = self._session_parser
+            self.utils_helper.session_parser = self._session_parser
             self.current_file_path = path
             
-            # Get session ID from database
-            self.current_session_id = self.session_loader.get_session_id(path)
+            self.current_session_id = result["session_id"]
             if not self.current_session_id:
                 self.logger.warning(f"({tr('Failed to get session ID for', 'warning')}): {path}")
+
+            self.rule_coverage = result["rule_coverage"]
+            self.logger.info(f"XPath rules cover {len(self.rule_coverage.covered)} of {len(self.session_tabs)} tabs")
             
             # Update recent files
             self.save_to_recent_files(path)
             
-            # Populate UI using service
+            # Populate UI using service - tab rows are created lazily by the tree model
+            self._show_load_progress("ui_build", 70)
             self.window_data = self.session_populator.populate_session_tree(
                 self.ccw.session_widget, 
                 self.session_tabs, 
                 self.group_list, 
                 path
             )
-
-            self.closed_tabs_data = self.session_loader.session_processor.get_extra_tabs_data()
+            # collect the garbage of parsing now: a full collection over all these objects would
+            # otherwise hit one of the first keystrokes in the filter
+            gc.collect()
+            self._end_session_loading()
 
             # Update UI state
             self._ui_update_btn_states(file_loaded=True)
             self._ui_update_group_combo()
 
-            self.status_bar.show_message(tr('Successfully loaded session with {0} active tabs (and {1} Closed tabs)', 'main', len(enriched_tabs), len(self.closed_tabs_data['counting_tabs'])), message_type="success")
-            self.logger.info(tr('Successfully loaded session with {0} tabs', 'main', len(enriched_tabs)))
+            self.status_bar.show_message(tr('Successfully loaded session with {0} active tabs (and {1} Closed tabs)', 'main', len(self.session_tabs), self.closed_tabs_count), message_type="success")
+            self.logger.info(tr('Successfully loaded session with {0} tabs', 'main', len(self.session_tabs)))
+            icons = icon_registry.stats()
+            self.logger.debug(f"Icon registry: {icons['icons']} icons, {icons['hits']} hits / {icons['misses']} misses ({icons['hit_rate']:.1%})")
 
-        except SessionLoadingError as e:
-            self.status_bar.show_message(tr("Failed to load session file", "error"), message_type="error")
-            self.logger.error(f"{tr('Failed to load session file', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
         except Exception as e:
+            self._end_session_loading()
             self.status_bar.show_message(tr("Unexpected error loading session", "error"), message_type="error")
             self.logger.error(f"{tr('Unexpected error loading session', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
 
+    def _on_session_load_failed(self, error):
+        if self.sender() is not self._load_worker:
+            return
+        self._end_session_loading()
+        self.status_bar.show_message(tr("Failed to load session file", "error"), message_type="error")
+        self.logger.error(f"{tr('Failed to load session file', 'error')}: {error}")
+
+    def _on_session_load_cancelled(self):
+        if self.sender() is not self._load_worker:
+            return
+        self._end_session_loading()
+        self.status_bar.show_message(tr("Loading cancelled.", "main"), message_type="warning")
+
+    def _on_load_worker_finished(self):
+        worker = self.sender()
+        if worker is self._load_worker:
+            self._load_worker = None
+        if worker is not None:
+            self._workers.discard(worker)
+            worker.deleteLater()
+
+    def _end_session_loading(self):
+        self._session_loading = False
+        self.lcw.load_btn.setEnabled(True)
+        self.lcw.import_btn.setEnabled(True)
+
     def save_to_recent_files(self, path: str):
         """Save file to recent files list with validation"""
         try:
@@ -1008,19 +1193,14 @@ class FFsessionToolMainWindow(QMainWindow):
                 shutil.copy2(source_path, target_lz4backup_path)
                 
                 with open(target_lz4_path, "rb") as f:
-                    magic = f.read(8)
-                    if magic != b"mozLz40\0":
+                    magic = f.read(len(codec.MOZLZ4_MAGIC))
+                    if magic != codec.MOZLZ4_MAGIC:
                         raise ValueError(tr("Invalid jsonlz4 file header", "Raise"))
                     compressed_data = f.read()
-                import lz4.block
-                decompressed_data = lz4.block.decompress(compressed_data)
-                json_str = decompressed_data.decode('utf-8')
-                json_data = json.loads(json_str)
+                json_data = codec.json_loads(codec.lz4_decompress(compressed_data))
 
-                with open(target_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, indent=2, ensure_ascii=False)
-                    
-                    copied_files[filename] = target_lz4_path
+                codec.json_dump_file(json_data, target_json_path, indent=2)
+                copied_files[filename] = target_lz4_path
                 
                 
         except Exception as e:
@@ -1075,15 +1255,6 @@ class FFsessionToolMainWindow(QMainWindow):
             if t.get("favicon") is not None:
                 print("SessionTab:", t["title"], t["favicon"][:40], t.get("uuid"))
         
-        # Traverse the session widget tree to collect data
-        for i in range(self.ccw.session_widget.topLevelItemCount()):
-            win = self.ccw.session_widget.topLevelItem(i)
-            for j in range(win.childCount()):
-                group = win.child(j)
-                for k in range(group.childCount()):
-                    tabitem = group.child(k)
-                    data = tabitem.data(0, Qt.UserRole)
-        
         if dlg.exec() == QDialog.Accepted:
             opts = dlg.get_export_options()
             exporter = BookmarkExporter(
@@ -1091,7 +1262,7 @@ class FFsessionToolMainWindow(QMainWindow):
                 self.window_data, 
                 COLORS, 
                 assets_path="assets/icons",
-                favicon_cache_path=self.cache_dir_favicon
+                favicon_store=self.favicon_store
             )
             exporter.export(
                 filepath=opts["filepath"],
@@ -1129,7 +1300,7 @@ class FFsessionToolMainWindow(QMainWindow):
         if not (title_changed or url_changed or group_changed):
             return 
         
-        enriched_tab = next((t for t in self.session_tabs if t['uuid'] == tab_data['uuid']), None)
+        enriched_tab = self.session_index.get(tab_data['uuid'])
 
         if not enriched_tab: return
         
@@ -1140,17 +1311,18 @@ class FFsessionToolMainWindow(QMainWindow):
             if url_changed:
                 enriched_tab['url'] = new_url
                 self.status_bar.show_message(tr("Tab URL updated.", "main"), message_type="success")
+            if title_changed or url_changed:
+                self.search_index.update(enriched_tab)
             if group_changed:
-                enriched_tab['group_name'] = new_group_name
                 new_group_id = None
                 # Check if moving to ungrouped (using proper text comparison)
                 ungrouped_text = tr("Ungrouped", "main")
                 if new_group_name != ungrouped_text and new_group_name.strip() != "":
-                    group_info = next((g for g in self.group_list if g['name'] == new_group_name), None)
+                    group_info = self.session_index.group_by_name(new_group_name)
                     if group_info:
                         new_group_id = group_info['id']
                 
-                enriched_tab['group_id'] = new_group_id
+                self.session_index.update(enriched_tab, group_name=new_group_name, group_id=new_group_id)
                 self.status_bar.show_message(tr("Tab group updated.", "main"), message_type="success")
         except Exception as e:
             self.logger.error(f"{tr('Error updating tab data', 'error')}, URL: '{old_url}': {e} |#| ({type(e).__name__})", exc_info=True)
@@ -1274,7 +1446,7 @@ class FFsessionToolMainWindow(QMainWindow):
             
             item = selected[0]
             item_data = item.data(0, Qt.UserRole)
-            if not isinstance(item_data, dict) or item_data.get('type') in ('group', 'window'):
+            if not isinstance(item_data, (dict, TabRecord)) or item_data.get('type') in ('group', 'window'):
                 self.status_bar.show_message(tr("Please select a tab.", "main"), message_type="warning")
                 return
 
@@ -1285,26 +1457,11 @@ class FFsessionToolMainWindow(QMainWindow):
                 self.status_bar.show_message(tr("Tab URL missing.", "error"), message_type="error")
                 return
 
-            parsed = urlparse(url)
-            # Domain normalisieren
-            domain_raw = (parsed.hostname or parsed.netloc or "").lower()
-            if not domain_raw:
+            # Rules of the domain (or its www. variant) and the most specific url_contains
+            domain_norm, url_contains, rules = self.db.get_rule_matcher().resolve(url)
+            if not domain_norm:
                 self.status_bar.show_message(tr("Could not determine domain.", "error"), message_type="error")
                 return
-            domain_norm = domain_raw[4:] if domain_raw.startswith("www.") else domain_raw
-
-            # 1) Versuch mit normalisierter Domain
-            url_contains = self.db.find_matching_url_part(domain_norm, url) or ""
-            rules = self.db.get_xpath_rules(domain_norm, url_contains)
-
-            # 2) Fallback: alternative Domain-Variante (mit/ohne www.)
-            if not rules:
-                alt_domain = ("www." + domain_norm) if not domain_raw.startswith("www.") else domain_norm[4:]
-                url_contains_alt = self.db.find_matching_url_part(alt_domain, url) or ""
-                rules = self.db.get_xpath_rules(alt_domain, url_contains_alt)
-                if rules:
-                    domain_norm = alt_domain
-                    url_contains = url_contains_alt
 
             if not rules:
                 self.status_bar.show_message(
@@ -1328,33 +1485,168 @@ class FFsessionToolMainWindow(QMainWindow):
             self.logger.error(f"{tr('Failed to start scraping', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
             self.status_bar.show_message(tr("Failed to start scraping.", "error"), message_type="error")
 
+    def _on_scrape_group_clicked(self):
+        """Scrape all tabs of the selected group (as listed in the tree: without pinned and hidden tabs)"""
+        item_data = self.selected_group.data(0, Qt.UserRole) if self.selected_group is not None else None
+        if not isinstance(item_data, dict) or item_data.get('type') != 'group':
+            self.status_bar.show_message(tr("Please select a group.", "main"), message_type="warning")
+            return
+
+        group_id = item_data.get("group_id")
+        if group_id is not None:
+            tabs = self.session_index.tabs_in_group(group_id)
+        else:
+            tabs = [tab for tab in self.session_tabs if tab.group_name == item_data.get("group_name")]
+        self._start_batch_scrape([tab for tab in tabs if not tab.pinned and not tab.hidden])
+
+    def _on_scrape_window_clicked(self):
+        """Scrape all tabs of the selected window"""
+        item_data = self.selected_window.data(0, Qt.UserRole) if self.selected_window is not None else None
+        if not isinstance(item_data, dict) or item_data.get('type') != 'window':
+            self.status_bar.show_message(tr("Please select a window.", "main"), message_type="warning")
+            return
+        self._start_batch_scrape(list(self.session_index.tabs_in_window(item_data.get("window_index"))))
+
+    def _start_batch_scrape(self, tabs):
+        """
+        Scrape a list of tabs in a BatchScrapeWorker. Results go through on_data_extracted to the
+        DBWriter like single-tab results; the status bar shows the progress with Pause and Cancel.
+        """
+        if self._batch_worker is not None:
+            self.status_bar.show_message(tr("A batch scrape is already running.", "main"), message_type="warning")
+            return
+        try:
+            matcher = self.db.get_rule_matcher()
+            tabs = sorted(tabs, key=lambda tab: tab.last_accessed or 0, reverse=True)   # recently used tabs first
+            if not any(matcher.has_rules(tab.url) for tab in tabs):
+                self.status_bar.show_message(tr("No tabs with XPath rules in this selection.", "main"), message_type="warning")
+                return
+
+            # Many pages at once would mean many browsers - the batch always uses requests
+            fetcher = RequestsFetcher(self.http_client, images=self.image_downloader)
+            worker = BatchScrapeWorker(
+                matcher, tabs, fetcher,
+                concurrency=self.settings.get("Plugins/scrape_concurrency", type=int),
+                per_domain=self.settings.get("Plugins/scrape_per_domain", type=int),
+            )
+            worker.tab_scraped.connect(self._on_batch_tab_scraped)
+            worker.tab_failed.connect(self._on_batch_tab_failed)
+            worker.scrape_progress.connect(self._on_batch_progress)
+            worker.scrape_finished.connect(self._on_batch_scrape_finished)
+            worker.finished.connect(self._on_batch_worker_finished)
+            self._batch_worker = worker
+            self._workers.add(worker)   # a cancelled batch keeps running until its fetches returned
+            self._show_batch_progress(0, 0, 0, len(tabs))
+            worker.start()
+
+        except Exception as e:
+            self._batch_worker = None
+            self.logger.error(f"{tr('Failed to start scraping', 'error')}: {e} |#| ({type(e).__name__})", exc_info=True)
+            self.status_bar.show_message(tr("Failed to start scraping.", "error"), message_type="error")
+
+    def toggle_batch_pause(self):
+        worker = self._batch_worker
+        if worker is None:
+            return
+        if worker.paused:
+            worker.resume()
+        else:
+            worker.pause()
+        self._show_batch_progress(*self._batch_progress)
+
+    def cancel_batch_scrape(self, silent=False):
+        """Stop a running batch scrape, results that come in afterwards are dropped"""
+        if self._batch_worker is None:
+            return
+        self._batch_worker.cancel()
+        # pending signals of the old worker are ignored from here on (see sender() checks)
+        self._batch_worker = None
+        if not silent:
+            scraped, _failed, _skipped, _total = self._batch_progress
+            self.status_bar.show_message(tr("Scraping cancelled after {0} tabs.", "main", scraped), message_type="warning")
+
+    def _stop_batch_scrape(self):
+        """On quit: cancel and wait for the worker thread (not for the requests still running)"""
+        worker = self._batch_worker
+        self.cancel_batch_scrape(silent=True)
+        if worker is not None:
+            worker.wait()
+
+    def _on_batch_progress(self, scraped, failed, skipped, total):
+        if self.sender() is not self._batch_worker:
+            return
+        self._show_batch_progress(scraped, failed, skipped, total)
+
+    def _show_batch_progress(self, scraped, failed, skipped, total):
+        self._batch_progress = (scraped, failed, skipped, total)
+        paused = self._batch_worker is not None and self._batch_worker.paused
+        text = tr("Scraping tabs: {0} of {1} done, {2} failed", "main", scraped, total - skipped, failed)
+        if paused:
+            text = f"{text} ({tr('Paused', 'main')})"
+        self.status_bar.show_message([
+            text,
+            StatusButton(
+                text=tr("Resume", "main") if paused else tr("Pause", "main"),
+                callback=self.toggle_batch_pause,
+                icon=load_icon("player-play" if paused else "player-pause")
+            ),
+            StatusButton(text=tr("Cancel", "main"), callback=self.cancel_batch_scrape, icon=load_icon("cancel"))
+        ])
+
+    def _on_batch_tab_scraped(self, result):
+        if self.sender() is not self._batch_worker:
+            return
+        self.on_data_extracted(result["data"], result["url_hash"], result["url"], result["rules"])
+
+    def _on_batch_tab_failed(self, url, error):
+        if self.sender() is not self._batch_worker:
+            return
+        self.logger.warning(f"{tr('Scraping failed', 'warning')}: {url}: {error}")
+
+    def _on_batch_scrape_finished(self, summary):
+        if self.sender() is not self._batch_worker:
+            return
+        self._batch_worker = None
+        self.status_bar.show_message(
+            tr("Scraped {0} tabs ({1} failed, {2} without XPath rules)", "main", summary["scraped"], summary["failed"], summary["skipped"]),
+            message_type="warning" if summary["failed"] else "success"
+        )
+
+    def _on_batch_worker_finished(self):
+        worker = self.sender()
+        if worker is self._batch_worker:
+            self._batch_worker = None
+        if worker is not None:
+            self._workers.discard(worker)
+            worker.deleteLater()
+
     def _load_and_display_image(self, url_hash):
-        """Load and display image from cache if available, based on url_hash."""
+        """Display the thumbnail of a tab's image: from memory right away, otherwise loaded in the background."""
+        self._image_url_hash = url_hash
         if not url_hash:
             self.rcw.image_frame.setVisible(False)
             return
-        
-        # Get image cache directory from settings
-        image_cache_dir = self.settings._settings.value("image_cache_dir", "user_data/img", type=str)
-        image_path = os.path.join(image_cache_dir, f"{url_hash}.jpg")
-        
-        if os.path.exists(image_path):
-            try:
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    # Scale image to fit width (350px) with smooth transformation
-                    scaled_pixmap = pixmap.scaledToWidth(350, Qt.SmoothTransformation)
-                    self.rcw.image_label.setPixmap(scaled_pixmap)
-                    self.rcw.image_label_status.setText("")  # Clear any status text
-                    self.rcw.image_frame.setVisible(True)
-                else:
-                    self.logger.warning(f"Invalid image file: {image_path}")
-                    self._clear_image_display()
-            except Exception as e:
-                self.logger.error(f"Failed to load image {image_path}: {e} |#| ({type(e).__name__})", exc_info=True)
-                self._clear_image_display()
+
+        pixmap = self.thumbnails.cached(url_hash)
+        if pixmap is False:
+            # the previous image stays until this one is loaded (a few ms), no flicker while arrowing through tabs
+            self.thumbnails.request(url_hash)
         else:
+            self._show_image(pixmap)
+
+    @Slot(str, QImage)
+    def _on_thumbnail_ready(self, url_hash, image):
+        pixmap = self.thumbnails.put(url_hash, image)
+        if url_hash == getattr(self, "_image_url_hash", None):
+            self._show_image(pixmap)
+
+    def _show_image(self, pixmap):
+        if pixmap is None:
             self._clear_image_display()
+            return
+        self.rcw.image_label.setPixmap(pixmap)
+        self.rcw.image_label_status.setText("")  # Clear any status text
+        self.rcw.image_frame.setVisible(True)
     
     def _clear_image_display(self):
         """Helper to clear image display and hide frame."""
@@ -1363,7 +1655,7 @@ class FFsessionToolMainWindow(QMainWindow):
         self.rcw.image_frame.setVisible(False)
 
     def start_xpath_extraction_requests(self, url, rules, url_hash):
-        worker = XPathWorkerRequests(self.db, self.settings, url, rules, url_hash)
+        worker = XPathWorkerRequests(self.db, self.settings, url, rules, url_hash, self.http_client, self.image_downloader)
         # Wrap signals so we can cleanup the worker after finish/error
         worker.extraction_done.connect(lambda data, w=worker: self._on_worker_extraction_done(w, data))
         worker.error_occurred.connect(lambda err, w=worker: self._on_worker_extraction_error(w, err))
@@ -1373,17 +1665,26 @@ class FFsessionToolMainWindow(QMainWindow):
         worker.start()
 
     def start_xpath_extraction_playwright(self, url, rules, url_hash):
-        worker = XPathWorkerPlaywright(self.db, self.settings, url, rules, url_hash)
+        worker = XPathWorkerPlaywright(self.db, self.settings, url, rules, url_hash, self._get_browser_service(), self.image_downloader)
         worker.extraction_done.connect(lambda data, w=worker: self._on_worker_extraction_done(w, data))
         worker.error_occurred.connect(lambda err, w=worker: self._on_worker_extraction_error(w, err))
-        # Only connect image_ready if the signal exists
-        if hasattr(worker, 'image_ready'):
-            worker.image_ready.connect(lambda img_bytes, uh, w=worker: self.on_image_ready(img_bytes, uh))
         # Don't cleanup on extraction_done - let images finish first
         worker.finished.connect(lambda w=worker: self._cleanup_worker(w))
         self._register_worker(worker)
         worker.start()
 
+    def _get_browser_service(self):
+        """The shared BrowserService, (re)started if it isn't running"""
+        if self.browser_service is None:
+            self.browser_service = BrowserService(request_headers(self.settings), cache=self.http_cache)
+        if not self.browser_service.isRunning():
+            self.browser_service.start()
+        return self.browser_service
+
+    def _stop_browser_service(self):
+        if self.browser_service is not None:
+            self.browser_service.stop()
+
     def _register_worker(self, worker: QThread):
         """Keep a strong reference and wire a finalizer."""
         try:
@@ -1421,7 +1722,12 @@ class FFsessionToolMainWindow(QMainWindow):
             
 
             if isinstance(data, dict) and data:
-                self.on_data_extracted(data, self.current_url_hash)
+                self.on_data_extracted(
+                    data,
+                    getattr(worker, 'url_hash', None) or self.current_url_hash,
+                    getattr(worker, 'url', ''),
+                    getattr(worker, 'rules', None)
+                )
                     
         except Exception as e:
             self.logger.error(f"Failed to process extracted data: {e} |#| ({type(e).__name__})", exc_info=True)
@@ -1445,47 +1751,38 @@ class FFsessionToolMainWindow(QMainWindow):
             self.status_bar.show_message(tr("Failed to open URL in browser", "error"), message_type="error")
 
     @Slot(dict, str)
-    def on_data_extracted(self, data, url_hash=""):
+    def on_data_extracted(self, data, url_hash="", url="", rules=None):
         """
-        Process extracted data from XPath workers and save to database.
-        Updates the UI with the newly extracted data.
+        Process extracted data from XPath workers and queue it for the DBWriter.
+        The UI is updated in _on_db_write_finished once the data is saved.
         """
         try:
-            # Fallback to current_hash if url_hash is empty
+            # Fallback to the current tab if the worker didn't say which one it scraped
             if not url_hash:
                 url_hash = getattr(self, 'current_url_hash', '')
-            
+            if not url:
+                url = getattr(self, 'current_url', '')
+
             if not url_hash or not hasattr(self, 'current_session_id'):
                 self.logger.warning("Cannot process extracted data: missing session context")
                 return
+            if not url:
+                self.logger.warning("Cannot save extracted data: missing current URL")
+                return
 
-            # Clear existing display
-            if hasattr(self, 'data_renderer'):
-                self.data_renderer._clear_data_container()
-
-            # Get current XPath rules with proper field names
-            rules_sorted = []
-            if hasattr(self, 'current_xpath_rules'):
-                rules_sorted = sorted(
-                    [r for r in self.current_xpath_rules if isinstance(r, dict)],
-                    key=lambda r: r.get("priority", 99)
-                )
+            # XPath rules the worker used, with proper field names
+            if rules is None:
+                rules = getattr(self, 'current_xpath_rules', [])
+            rules_sorted = sorted(
+                [r for r in rules if isinstance(r, dict)],
+                key=lambda r: r.get("priority", 99)
+            )
             
             # Create mapping from rule name to rule info (using 'name' field)
             name_to_ruleinfo = {r["name"]: (r["id"], r.get("is_filter", False)) for r in rules_sorted}
 
-            # Get or create tab ID
-            tab_id = self.db.get_tab_id(self.current_session_id, url_hash)
-            if not tab_id:
-                current_url = getattr(self, 'current_url', '')
-                if current_url:
-                    tab_id = self.db.write_tab_id(self.current_session_id, url_hash, current_url)
-                else:
-                    self.logger.warning("Cannot save extracted data: missing current URL")
-                    return
-
-            # Save extracted data to database
-            saved_count = 0
+            # Collect all values, the DBWriter saves them in one transaction
+            rows = []
             for name, entry in data.items():
                 rule_id, _ = name_to_ruleinfo.get(name, (None, None))
                 if not rule_id:
@@ -1503,61 +1800,59 @@ class FFsessionToolMainWindow(QMainWindow):
                     # Format: single value
                     values = [entry] if entry is not None else []
 
-                for val in values:
-                    try:
-                        self.db.save_extracted_data(
-                            tab_id=tab_id,
-                            rule_id=rule_id,
-                            value=str(val),
-                            extracted_at=datetime.utcnow().isoformat()
-                        )
-                        saved_count += 1
-                    except Exception as e:
-                        self.logger.error(f"Failed to save extracted value: {e} |#| ({type(e).__name__})", exc_info=True)
-
-            self.logger.info(f"Saved {saved_count} extracted data entries")
-
-            # Refresh the display with updated data
-            if hasattr(self, 'data_renderer') and hasattr(self, 'current_url'):
-                stored_data = self.db.load_extracted_data_for_url(self.current_url)
-                self.data_renderer.render_extracted_data(stored_data)
-                
-            self.status_bar.show_message(
-                tr("Extracted and saved {0} data entries", "worker", saved_count), 
-                message_type="success"
-            )
+                rows.extend((rule_id, val) for val in values)
 
-            # Automatically load and display image after extraction
-            self._load_and_display_image(url_hash or getattr(self, 'current_url_hash', ''))
+            self.db_writer.submit(ExtractedDataJob(self.current_session_id, url, url_hash, rows))
 
         except Exception as e:
             self.logger.error(f"Failed to process extracted data: {e} |#| ({type(e).__name__})", exc_info=True)
             self.status_bar.show_message(tr("Failed to process extracted data", "error"), message_type="error")
 
-    @Slot(bytes, str)
-    def on_image_ready(self, image_bytes, url_hash):
-        """Handle image bytes from worker, save to cache and display."""
-        if not image_bytes or not url_hash:
+    def _on_db_write_finished(self, result):
+        """Shows the saved data if it belongs to the tab that is still selected"""
+        self.logger.info(f"Saved {result['saved']} extracted data entries")
+        if result["url"] != getattr(self, 'current_url', None):
+            return
+
+        if result["stored_data"] is not None and hasattr(self, 'data_renderer'):
+            self.data_renderer.render_extracted_data(result["stored_data"])
+        self.status_bar.show_message(
+            tr("Extracted and saved {0} data entries", "worker", result["saved"]),
+            message_type="success"
+        )
+
+        # Automatically load and display image after extraction
+        self._load_and_display_image(result["url_hash"])
+
+    def _on_db_write_failed(self, url, error):
+        self.status_bar.show_message(f"{tr('Failed to save extracted data', 'error')}: {error}", message_type="error")
+
+    @Slot(str, str)
+    def on_image_saved(self, url_hash, image_path):
+        """An image was downloaded (the ImageDownloader has written it already), show it if it belongs to the current tab."""
+        # Only the first image of a page is shown
+        is_first = os.path.splitext(os.path.basename(image_path))[0] == url_hash
+        if is_first:
+            self.thumbnails.invalidate(url_hash)
+        if url_hash != getattr(self, "current_url_hash", None):
             return
-        
         try:
-            # Get image cache directory
-            image_cache_dir = self.settings._settings.value("image_cache_dir", "user_data/img", type=str)
-            os.makedirs(image_cache_dir, exist_ok=True)
-            image_path = os.path.join(image_cache_dir, f"{url_hash}.jpg")
-            
-            # Save bytes to file
-            with open(image_path, 'wb') as f:
-                f.write(image_bytes)
-            
             self.logger.info(f"Saved image to {image_path}")
             self.status_bar.show_message(tr("Image downloaded and saved", "worker"), message_type="success")
-            
-            # Load and display the image
-            self._load_and_display_image(url_hash)
-            
+            if is_first:
+                self._load_and_display_image(url_hash)
         except Exception as e:
-            self.logger.error(f"Failed to save/display image: {e} |#| ({type(e).__name__})", exc_info=True)
+            self.logger.error(f"Failed to display image: {e} |#| ({type(e).__name__})", exc_info=True)
+
+    @Slot(str, str)
+    def _on_image_failed(self, url_hash, error):
+        if url_hash == getattr(self, "current_url_hash", None):
+            self.status_bar.show_message(f"{tr('Image download failed', 'error')}: {error}", message_type="warning")
+
+    def _start_image_downloads(self, image_urls, url_hash):
+        """Queues the image URLs of a tab in the ImageDownloader (relative ones are resolved against the tab's URL)."""
+        referer = self.current_url if url_hash == getattr(self, "current_url_hash", None) else ""
+        self.image_downloader.download(url_hash, [(src, count) for count, src in enumerate(image_urls)], referer=referer)
 
     def _on_load_images_clicked(self):
         """
@@ -1575,23 +1870,11 @@ class FFsessionToolMainWindow(QMainWindow):
                 self.status_bar.show_message(tr("No URL hash available.", "error"), message_type="error")
                 return
 
-            # Get XPath rules for the current URL to identify image rules
-            parsed = urlparse(self.current_url)
-            domain_raw = (parsed.hostname or parsed.netloc or "").lower()
-            if not domain_raw:
+            # Get XPath rules for the current URL to identify image rules (same logic as scraping)
+            domain_norm, _url_contains, rules = self.db.get_rule_matcher().resolve(self.current_url)
+            if not domain_norm:
                 self.status_bar.show_message(tr("Could not determine domain.", "error"), message_type="error")
                 return
-            domain_norm = domain_raw[4:] if domain_raw.startswith("www.") else domain_raw
-
-            # Get rules (same logic as scraping)
-            url_contains = self.db.find_matching_url_part(domain_norm, self.current_url) or ""
-            rules = self.db.get_xpath_rules(domain_norm, url_contains)
-
-            # Fallback: alternative domain variant
-            if not rules:
-                alt_domain = ("www." + domain_norm) if not domain_raw.startswith("www.") else domain_norm[4:]
-                url_contains_alt = self.db.find_matching_url_part(alt_domain, self.current_url) or ""
-                rules = self.db.get_xpath_rules(alt_domain, url_contains_alt)
 
             if not rules:
                 self.status_bar.show_message(tr("No XPath rules found for this domain.", "main"), message_type="warning")
@@ -1658,19 +1941,16 @@ class FFsessionToolMainWindow(QMainWindow):
 
     def _start_image_only_extraction_playwright(self, url, image_rules, url_hash):
         """Start Playwright extraction with image-only rules and automatic download."""
-        worker = XPathWorkerPlaywright(self.db, self.settings, url, image_rules, url_hash)
+        worker = XPathWorkerPlaywright(self.db, self.settings, url, image_rules, url_hash, self._get_browser_service(), self.image_downloader)
         worker.extraction_done.connect(lambda data, w=worker: self._on_image_extraction_done(w, data, url_hash))
         worker.error_occurred.connect(lambda err, w=worker: self._on_worker_extraction_error(w, err))
-        # Connect image_ready for direct downloads during extraction
-        if hasattr(worker, 'image_ready'):
-            worker.image_ready.connect(lambda img_bytes, uh, w=worker: self.on_image_ready(img_bytes, uh))
         worker.finished.connect(lambda w=worker: self._cleanup_worker(w))
         self._register_worker(worker)
         worker.start()
 
     def _start_image_only_extraction_requests(self, url, image_rules, url_hash):
         """Start Requests extraction with image-only rules and automatic download."""
-        worker = XPathWorkerRequests(self.db, self.settings, url, image_rules, url_hash)
+        worker = XPathWorkerRequests(self.db, self.settings, url, image_rules, url_hash, self.http_client, self.image_downloader)
         worker.extraction_done.connect(lambda data, w=worker: self._on_image_extraction_done(w, data, url_hash))
         worker.error_occurred.connect(lambda err, w=worker: self._on_worker_extraction_error(w, err))
         worker.finished.connect(lambda w=worker: self._cleanup_worker(w))
@@ -1755,6 +2035,7 @@ class FFsessionToolMainWindow(QMainWindow):
 
             cleaned_title = self.strip_title_with_patterns(tab["_original_title"])
             tab["title"] = cleaned_title
+        self.search_index.rebuild(self.session_tabs)
 
 
     def strip_title_with_patterns(self, title: str) -> str:
@@ -1774,14 +2055,7 @@ class FFsessionToolMainWindow(QMainWindow):
         return out
 
     def _find_tree_item_by_uuid(self, uuid):
-        iterator = QTreeWidgetItemIterator(self.ccw.session_widget)
-        while iterator.value():
-            item = iterator.value()
-            item_data = item.data(0, Qt.UserRole)
-            if item_data and isinstance(item_data, dict) and item_data.get("uuid") == uuid:
-                return item
-            iterator += 1
-        return None
+        return self.session_index.item(uuid)
     
 
     def open_group_editor(self):
@@ -1801,7 +2075,7 @@ class FFsessionToolMainWindow(QMainWindow):
             field = change['field']
             new_value = change['new_value']
             
-            for window in self.session_loader.json_data.get("windows", []):
+            for window in self._session_parser.json_data.get("windows", []):
                 for group_data in window.get("groups", []):
                     if group_data.get("id") == group_id:
                         group_data[field] = new_value  
@@ -1815,6 +2089,7 @@ class FFsessionToolMainWindow(QMainWindow):
             elif field == 'color':
                 self.group_id_to_color[group_id] = new_value
         
+        self.session_index.rebuild_groups(self.group_list)
         self._ui_update_group_combo()
         self.populate_group_and_tabs(self.session_tabs, self.group_list)
 
@@ -1822,6 +2097,74 @@ class FFsessionToolMainWindow(QMainWindow):
         from app.ui.dialogs.settings_dialog import SettingsDialog
         dlg = SettingsDialog(self.settings, self)
         dlg.exec()
+        self.http_client.reload_settings(self.settings)
+        self.image_downloader.reload_settings(self.settings)
+        self.thumbnails.image_dir = self.settings.get("image_cache_dir", type=str)
+
+    def find_duplicates(self):
+        """Runs the DedupEngine with the options of the left column in a worker, the clusters replace the tab tree"""
+        from app.src.dedup_engine import DedupEngine
+        from app.services.dedup_worker import DedupWorker
+        from app.ui.helpers import SessionTreeItem
+
+        if not self.session_tabs:
+            return
+        self.cancel_duplicate_search()
+
+        by_title = self.lcw.dup_title_cb.isChecked()
+        by_url = self.lcw.dup_url_cb.isChecked()
+        similar_titles = self.lcw.dup_similar_cb.isChecked()
+        if not (by_title or by_url or similar_titles):
+            self.populate_group_and_tabs(self.session_tabs, self.group_list)
+            return
+
+        url_regex = None
+        if by_url and self.lcw.regex_checkbox.isChecked():
+            url_regex = self.lcw.regex_input.currentText() or None
+        try:
+            engine = DedupEngine(by_title=by_title, by_url=by_url, url_regex=url_regex, similar_titles=similar_titles)
+        except re.error as e:
+            self.ccw.session_widget.clear()
+            SessionTreeItem(self.ccw.session_widget, [tr("Invalid RegEx: {0}", "Tools", e)])
+            return
+
+        tabs = list(self.session_tabs)
+        if self.lcw.dup_closed_cb.isChecked():
+            tabs += DedupEngine.extra_tabs(self._get_closed_tabs_data())
+
+        worker = DedupWorker(engine, tabs)
+        worker.dedup_finished.connect(self._on_dedup_finished)
+        worker.dedup_failed.connect(self._on_dedup_failed)
+        worker.finished.connect(self._on_dedup_worker_finished)
+        self._dedup_worker = worker
+        self._workers.add(worker)   # a cancelled search keeps running until its next check
+        self.status_bar.show_message(tr("Searching duplicates...", "Tools"))
+        worker.start()
+
+    def cancel_duplicate_search(self):
+        """Stops a running duplicate search, its result is ignored"""
+        if self._dedup_worker is not None and self._dedup_worker.isRunning():
+            self._dedup_worker.cancel()
+        self._dedup_worker = None
+
+    def _on_dedup_finished(self, clusters):
+        if self.sender() is not self._dedup_worker:
+            return  # options changed while it was running
+        self.utils_helper.show_duplicate_clusters(clusters)
+        self.status_bar.show_message(tr("{0} duplicate clusters found", "Tools", len(clusters)), message_type="info")
+
+    def _on_dedup_failed(self, error):
+        if self.sender() is not self._dedup_worker:
+            return
+        self.status_bar.show_message(tr("Error finding duplicates", "error"), message_type="error")
+
+    def _on_dedup_worker_finished(self):
+        worker = self.sender()
+        if worker is self._dedup_worker:
+            self._dedup_worker = None
+        if worker is not None:
+            self._workers.discard(worker)
+            worker.deleteLater()
 
     def save_regex(self):
         current_text = self.lcw.regex_input.currentText()
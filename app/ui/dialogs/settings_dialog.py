@@ -42,6 +42,8 @@ class SettingsDialog(QDialog):
             ("Plugins", [
                 ("Plugins/xpath_enabled", tr("Enable XPath Plugin", "settings"), "bool"),
                 ("Plugins/scraping_engine", tr("Scraping Engine", "settings"), "str"),
+                ("Plugins/scrape_concurrency", tr("Parallel Requests", "settings"), "int"),
+                ("Plugins/scrape_per_domain", tr("Parallel Requests per Domain", "settings"), "int"),
             ]),
             ("Browser Agent", [
                 ("browser_agent/User-Agent", "User-Agent", "str"),
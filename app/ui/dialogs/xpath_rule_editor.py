@@ -6,6 +6,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 from app.utils.db_handler import DBHandler
+from app.src.xpath_extractor import rule_timing, SLOW_RULE_MS
 from app.src.settings import AppSettings
 from app.utils import tr
 from app.utils import Logger
@@ -47,8 +48,8 @@ class XPathRuleEditorDialog(QDialog):
 
         # Rules Table
         self.rules_table = QTableWidget()
-        self.rules_table.setColumnCount(6)
-        self.rules_table.setHorizontalHeaderLabels([tr("Name", "dialog"), tr("Rule", "dialog"), tr("Filter", "dialog"), tr("Cover", "dialog"), tr("Global", "dialog"), tr("Priority", "dialog")])
+        self.rules_table.setColumnCount(7)
+        self.rules_table.setHorizontalHeaderLabels([tr("Name", "dialog"), tr("Rule", "dialog"), tr("Filter", "dialog"), tr("Cover", "dialog"), tr("Global", "dialog"), tr("Priority", "dialog"), tr("Time", "dialog")])
         #self.rules_table.setColumnWidth # Spaltenbreiten auto außer rule
         self.rules_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.rules_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
@@ -197,14 +198,26 @@ class XPathRuleEditorDialog(QDialog):
             self.rules_table.setItem(row, 3, QTableWidgetItem("Yes" if rule['is_image'] else "No"))
             self.rules_table.setItem(row, 4, QTableWidgetItem("Yes" if rule['is_global'] else "No"))
             self.rules_table.setItem(row, 5, QTableWidgetItem(str(rule['priority'])))
+            self.rules_table.setItem(row, 6, self._timing_item(rule))
             # Rule inkl. domain/url_contains speichern
             self.rules_table.item(row, 0).setData(Qt.UserRole, rule)
             if rule['is_global']:
-                for col in range(6):
+                for col in range(7):
                     item = self.rules_table.item(row, col)
                     if item:
                         item.setBackground(QColor("#e0f7fa"))
 
+    def _timing_item(self, rule) -> QTableWidgetItem:
+        """Average time of the rule per page since the start (compiled XPath, without downloads)"""
+        timing = rule_timing(rule)
+        if timing is None:
+            return QTableWidgetItem("")
+        item = QTableWidgetItem(f"{timing.avg_ms:.1f} ms")
+        item.setToolTip(tr("{runs} pages, slowest {max_ms:.1f} ms", "dialog").format(runs=timing.runs, max_ms=timing.max_ms))
+        if timing.avg_ms >= SLOW_RULE_MS:
+            item.setForeground(QColor("#e74c3c"))
+        return item
+
     def _load_rule_for_edit(self, row, column):
         item = self.rules_table.item(row, 0)
         if not item:
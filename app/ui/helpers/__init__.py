@@ -2,4 +2,5 @@ from .ui_themes import get_theme_color_hex, is_dark_mode, theme_manager
 from .statusbar import StatusBar, StatusButton
 from .ui_icon_loader import load_icon
 from .ui_colors import COLORS, GUI_COLORS, get_color, get_color_hex, colored_svg_icon
-from .flowlayout import FlowLayout
\ No newline at end of file
+from .flowlayout import FlowLayout
+from .session_tree import SessionTreeItem, SessionTreeModel, SessionTreeView
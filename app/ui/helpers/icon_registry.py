@@ -0,0 +1,59 @@
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtGui import QIcon
+
+from app.ui.helpers.ui_themes import theme_manager
+
+
+class IconRegistry:
+    """
+    Memory for load_icon() and colored_svg_icon(): the SVG text of each file (read once) and the
+    rendered icons by (name, color, size, theme). The tree populators ask for the same few icons
+    thousands of times; only the first call per key reads, colors and renders the SVG.
+
+    Emptied when the ThemeManager applies a palette. hits/misses count the icon lookups.
+    """
+
+    def __init__(self):
+        self._svg: Dict[str, str] = {}
+        self._icons: Dict[Tuple, QIcon] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def svg_text(self, path) -> str:
+        key = str(path)
+        text = self._svg.get(key)
+        if text is None:
+            with open(path, "r", encoding="utf-8") as f:
+                text = self._svg[key] = f.read()
+        return text
+
+    def get(self, key: Tuple) -> Optional[QIcon]:
+        icon = self._icons.get(key)
+        if icon is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return icon
+
+    def put(self, key: Tuple, icon: QIcon) -> QIcon:
+        self._icons[key] = icon
+        return icon
+
+    def clear(self, *_args):
+        self._svg.clear()
+        self._icons.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "icons": len(self._icons),
+            "svgs": len(self._svg),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+icon_registry = IconRegistry()
+theme_manager.palette_changed.connect(icon_registry.clear)
@@ -0,0 +1,724 @@
+# session_tree.py
+from contextlib import contextmanager
+from itertools import compress
+from operator import itemgetter, ne
+from typing import Callable, Iterator, List, Optional, Set
+
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex, Signal
+from PySide6.QtGui import QFont, QIcon
+from PySide6.QtWidgets import QTreeView
+
+from app.src.tab_record import TabRecord
+
+# Tab rows created by the first fetch of a group, later fetches double the loaded rows
+# (the view lays out all rows of an expanded group on every insert, so fewer, bigger inserts are cheaper)
+FETCH_BATCH = 256
+
+_GROUP_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+_TAB_FLAGS = _GROUP_FLAGS | Qt.ItemNeverHasChildren
+
+# data() runs for every role of every painted row - looking up Qt enum members there is not free
+_DISPLAY_ROLE = Qt.DisplayRole
+_EDIT_ROLE = Qt.EditRole
+_DECORATION_ROLE = Qt.DecorationRole
+_FONT_ROLE = Qt.FontRole
+_USER_ROLE = Qt.UserRole
+
+
+class SessionTreeItem:
+    """
+    Node of the session tree.
+
+    Offers the part of the QTreeWidgetItem API the app uses (column 0 only), so code written for the
+    old QTreeWidget keeps working: text/setText, data/setData, icon/setIcon, font/setFont, parent,
+    child/childCount/indexOfChild, addChild/addChildren/insertChild/takeChild, setExpanded/isExpanded.
+
+    Tab rows are lazy: a group keeps (record, styling) pairs in _pending and items are only created
+    when the view fetches them or code asks for child(i). Title, favicon and font of a tab row are
+    produced on demand from its TabRecord. A lazy group only holds tab rows, row i is _entries[i].
+    """
+    __slots__ = ("_parent", "_children", "_pending", "_fetched", "_entries", "_filter", "_model",
+                 "_text", "_icon", "_font", "_roles", "_expanded", "record", "styling")
+
+    def __init__(self, parent=None, texts: List[str] = None):
+        self._parent = None
+        self._children = []
+        self._pending = None      # [(TabRecord, styling), ...] not yet turned into items
+        self._fetched = 0         # how many of _pending already are items
+        self._entries = None      # all (TabRecord, styling) pairs of a lazy group, in row order
+        self._filter = None       # the tabs a lazy group shows (None: all)
+        self._model = None
+        self._text = texts[0] if texts else None
+        self._icon = None
+        self._font = None
+        self._roles = None
+        self._expanded = False
+        self.record = None        # TabRecord for tab rows
+        self.styling = None       # "pinned" / "hidden" / None
+
+        if isinstance(parent, SessionTreeView):
+            parent.addTopLevelItem(self)
+        elif isinstance(parent, SessionTreeItem):
+            parent.addChild(self)
+
+    @classmethod
+    def _for_record(cls, record: TabRecord, styling: Optional[str] = None) -> "SessionTreeItem":
+        item = cls()
+        item.record = record
+        item.styling = styling
+        return item
+
+    def __repr__(self):
+        return f"SessionTreeItem({self.text(0)!r})"
+
+    # ---------- Data ----------
+
+    def text(self, column: int = 0) -> str:
+        if self._text is not None:
+            return self._text
+        if self.record is not None:
+            return self.record.title
+        return ""
+
+    def setText(self, column: int, text: str):
+        self._text = text
+        self._changed()
+
+    def icon(self, column: int = 0) -> QIcon:
+        icon = self.data(column, Qt.DecorationRole)
+        return icon if icon is not None else QIcon()
+
+    def setIcon(self, column: int, icon: QIcon):
+        self._icon = icon
+        self._changed()
+
+    def font(self, column: int = 0) -> QFont:
+        font = self.data(column, Qt.FontRole)
+        return QFont(font) if font is not None else QFont()
+
+    def setFont(self, column: int, font: QFont):
+        self._font = font
+        self._changed()
+
+    def setForeground(self, column: int, brush):
+        self.setData(column, Qt.ForegroundRole, brush)
+
+    def setToolTip(self, column: int, text: str):
+        self.setData(column, Qt.ToolTipRole, text)
+
+    def data(self, column: int, role: int):
+        if role == _DISPLAY_ROLE or role == _EDIT_ROLE:
+            return self.text(column)
+        if role == _DECORATION_ROLE:
+            if self._icon is not None:
+                return self._icon
+            if self.record is not None and self._model is not None and self._model.icon_provider:
+                return self._model.icon_provider(self.record)
+            return None
+        if role == _FONT_ROLE:
+            if self._font is not None:
+                return self._font
+            if self.styling and self._model is not None:
+                return self._model.styling_font(self.styling)
+            return None
+        if role == _USER_ROLE and self.record is not None:
+            return self.record
+        return self._roles.get(role) if self._roles else None
+
+    def setData(self, column: int, role: int, value):
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            self._text = value
+        elif role == Qt.DecorationRole:
+            self._icon = value
+        elif role == Qt.FontRole:
+            self._font = value
+        elif role == Qt.UserRole and isinstance(value, TabRecord):
+            self.record = value
+            if self._model is not None:
+                self._model._register(self)
+        else:
+            if role == Qt.UserRole:
+                self.record = None
+            if self._roles is None:
+                self._roles = {}
+            self._roles[role] = value
+        self._changed()
+
+    # ---------- Structure ----------
+
+    def parent(self) -> Optional["SessionTreeItem"]:
+        """None for top-level items (like QTreeWidgetItem)"""
+        return None if isinstance(self._parent, _RootItem) else self._parent
+
+    def childCount(self) -> int:
+        return len(self._children) + self._pending_left()
+
+    def child(self, index: int) -> Optional["SessionTreeItem"]:
+        if index >= len(self._children) and self._pending:
+            self._fetch(index + 1)
+        return self._children[index] if 0 <= index < len(self._children) else None
+
+    def indexOfChild(self, item: "SessionTreeItem") -> int:
+        try:
+            return self._children.index(item)
+        except ValueError:
+            return -1
+
+    def addChild(self, item: "SessionTreeItem"):
+        self.addChildren([item])
+
+    def addChildren(self, items: List["SessionTreeItem"]):
+        self._fetch_all()   # pending tabs come first, new items go behind them
+        self.insertChildren(len(self._children), items)
+
+    def insertChild(self, index: int, item: "SessionTreeItem"):
+        self.insertChildren(index, [item])
+
+    def insertChildren(self, index: int, items: List["SessionTreeItem"]):
+        items = [item for item in items if item is not None]
+        if not items:
+            return
+        for item in items:
+            if item._parent is not None:
+                item._parent.takeChild(item._parent.indexOfChild(item))
+        self._fetch_all()   # pending tabs belong in front of index, they have to be rows to count
+        index = max(0, min(index, len(self._children)))
+        model = self._model
+        if model is not None:
+            model._begin_insert(self, index, index + len(items) - 1)
+        for item in items:
+            item._parent = self
+        if self._entries is not None:
+            self._entries[index:index] = [(item.record, item.styling) for item in items if item.record is not None]
+        self._children[index:index] = items
+        if model is not None:
+            for item in items:
+                model._attach(item)
+            model._end_insert()
+        if self._filter is not None:
+            self._hide_filtered_rows(index, index + len(items))
+
+    def takeChild(self, index: int) -> Optional["SessionTreeItem"]:
+        if not 0 <= index < len(self._children):
+            return None
+        model = self._model
+        if model is not None:
+            model._begin_remove(self, index, index)
+        item = self._children.pop(index)
+        item._parent = None
+        if self._entries is not None and item.record is not None:
+            del self._entries[index]
+        if model is not None:
+            model._detach(item)
+            model._end_remove()
+        return item
+
+    def takeChildren(self) -> List["SessionTreeItem"]:
+        self._fetch_all()
+        taken = []
+        while self._children:
+            taken.append(self.takeChild(len(self._children) - 1))
+        taken.reverse()
+        return taken
+
+    def set_pending_tabs(self, entries: List[tuple]):
+        """Lazy tab rows: entries are (TabRecord, styling) pairs, appended behind the existing children"""
+        self._fetch_all()
+        self._entries = list(entries)
+        self._filter = None
+        self._pending = list(entries) or None
+        self._fetched = 0
+        if self._model is not None:
+            self._model._pending_changed(self)
+
+    def filter_tabs(self, tabs: Optional[Set[TabRecord]]) -> bool:
+        """
+        Lazy groups only: shows the tabs contained in `tabs` (None: all). Created rows are kept, the view
+        hides the ones that don't match; pending rows are checked when they are fetched.
+        Returns whether a tab of the group is shown.
+        """
+        previous, self._filter = self._filter, tabs
+        if tabs is not previous:
+            self._hide_filtered_rows(0, len(self._children), previous)
+        if tabs is None:
+            return True
+        return bool(tabs) and not tabs.isdisjoint(map(itemgetter(0), self._entries))
+
+    def setExpanded(self, expand: bool):
+        self._expanded = expand
+        view = self._model.view if self._model is not None else None
+        if view is not None:
+            view.setExpanded(self._model.index_for(self), expand)
+
+    def isExpanded(self) -> bool:
+        view = self._model.view if self._model is not None else None
+        if view is not None:
+            return view.isExpanded(self._model.index_for(self))
+        return self._expanded
+
+    # ---------- Internals ----------
+
+    def _pending_left(self) -> int:
+        return len(self._pending) - self._fetched if self._pending else 0
+
+    def _fetch(self, count: int):
+        """Turns pending records into items until `count` children exist (at least one batch)"""
+        left = self._pending_left()
+        if not left:
+            return
+        wanted = max(count - len(self._children), FETCH_BATCH)
+        start = self._fetched
+        end = min(len(self._pending), start + wanted)
+        new_items = [SessionTreeItem._for_record(record, styling) for record, styling in self._pending[start:end]]
+
+        model = self._model
+        first = len(self._children)
+        if model is not None:
+            model._begin_insert(self, first, first + len(new_items) - 1)
+        for item in new_items:
+            item._parent = self
+        self._children.extend(new_items)
+        self._fetched = end
+        if self._fetched >= len(self._pending):
+            self._pending = None
+            self._fetched = 0
+            if model is not None:
+                model._partial_items.discard(self)
+        if model is not None:
+            for item in new_items:
+                model._attach(item)
+            model._end_insert()
+        if self._filter is not None:
+            self._hide_filtered_rows(first, first + len(new_items))
+
+    def _hide_filtered_rows(self, start: int, end: int, previous: Optional[Set[TabRecord]] = None):
+        """
+        Hides the created rows start..end-1 the filter doesn't show and shows the others again.
+        Only rows whose state differs from the filter `previous` (None: all shown) are touched.
+        """
+        view = self._model.view if self._model is not None else None
+        if view is None or start >= end:
+            return
+        records = list(map(itemgetter(0), self._entries[start:end]))
+        shown = list(map(self._filter.__contains__, records)) if self._filter is not None else [True] * len(records)
+        before = list(map(previous.__contains__, records)) if previous is not None else [True] * len(records)
+        index = self._model.index_for(self)
+        for row in compress(range(start, end), map(ne, shown, before)):
+            view.setRowHidden(row, index, not shown[row - start])   # each call schedules a relayout
+
+    def _last_shown_row(self) -> int:
+        """Last created row the filter shows, -1 if there is none"""
+        tabs = self._filter
+        for row in range(len(self._children) - 1, -1, -1):
+            if tabs is None or self._entries[row][0] in tabs:
+                return row
+        return -1
+
+    def _shown_pending(self) -> bool:
+        """Whether a pending row passes the filter (fetching the others would only add hidden rows)"""
+        if not self._pending_left():
+            return False
+        return self._filter is None or not self._filter.isdisjoint(map(itemgetter(0), self._entries[len(self._children):]))
+
+    def _fetch_more(self):
+        created = len(self._children)
+        tabs = self._filter
+        if tabs is None:
+            self._fetch(created + max(FETCH_BATCH, created))
+            return
+        # Count the shown rows only: the hidden ones in between are created along, but fill no space
+        records = list(map(itemgetter(0), self._entries))
+        wanted = max(FETCH_BATCH, sum(map(tabs.__contains__, records[:created])))
+        shown_rows = list(compress(range(created, len(records)), map(tabs.__contains__, records[created:])))
+        if shown_rows:
+            self._fetch(shown_rows[min(wanted, len(shown_rows)) - 1] + 1)
+
+    def _fetch_all(self):
+        if self._pending:
+            self._fetch(len(self._children) + self._pending_left())
+
+    def _changed(self):
+        if self._model is not None:
+            self._model._item_changed(self)
+
+
+class _RootItem(SessionTreeItem):
+    """Invisible root of the model (what QTreeWidget.invisibleRootItem() returns)"""
+    __slots__ = ()
+
+
+class SessionTreeModel(QAbstractItemModel):
+    """Item model over SessionTreeItems, tab rows are fetched in batches by SessionTreeView"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.view = None
+        self.icon_provider: Optional[Callable[[TabRecord], QIcon]] = None
+        self._header = ""
+        self._fonts = {}
+        self._bulk = 0
+        self._root = _RootItem()
+        self._root._model = self
+        self._items_by_uuid = {}
+        self._pending_by_uuid = None   # uuid -> (group item, position in _pending), built on first lookup
+        self._partial_items = set()    # attached items that still have pending rows
+
+    # ---------- Qt model interface ----------
+    # index/rowCount/hasChildren/flags run for every row on each relayout: no helper calls in them
+
+    def index(self, row, column, parent=QModelIndex()):
+        children = (parent.internalPointer() if parent.isValid() else self._root)._children
+        if column or not 0 <= row < len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer()._parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent._parent._children.index(parent), 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._root._children)
+        return 0 if parent.column() else len(parent.internalPointer()._children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return bool(node._children or node._pending)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return index.internalPointer().data(0, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _TAB_FLAGS if index.internalPointer().record is not None else _GROUP_FLAGS
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header
+        return None
+
+    # ---------- Helpers ----------
+
+    def root(self) -> SessionTreeItem:
+        return self._root
+
+    def item_from_index(self, index) -> SessionTreeItem:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index_for(self, item: SessionTreeItem) -> QModelIndex:
+        if item is None or item is self._root or item._parent is None or item._model is not self:
+            return QModelIndex()
+        return self.createIndex(item._parent._children.index(item), 0, item)
+
+    def set_header(self, text: str):
+        self._header = text
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    def styling_font(self, styling: str) -> QFont:
+        font = self._fonts.get(styling)
+        if font is None:
+            font = QFont()
+            font.setBold(styling == "pinned")
+            font.setItalic(styling == "hidden")
+            self._fonts[styling] = font
+        return font
+
+    def item_for_uuid(self, uuid: str) -> Optional[SessionTreeItem]:
+        """Tree item of a tab - a pending row is created on demand"""
+        item = self._items_by_uuid.get(uuid)
+        if item is not None:
+            return item
+        if self._pending_by_uuid is None:
+            self._index_pending()
+        location = self._pending_by_uuid.get(uuid)
+        if location is None:
+            return None
+        group, position = location
+        if group._model is not self or not group._pending or position < group._fetched:
+            return None
+        group._fetch(len(group._children) + position - group._fetched + 1)
+        return self._items_by_uuid.get(uuid)
+
+    def clear(self):
+        self._begin_reset()
+        for item in self._root._children:
+            self._detach(item)
+            item._parent = None
+        self._root._children = []
+        self._items_by_uuid.clear()
+        self._partial_items.clear()
+        self._pending_by_uuid = None
+        self._end_reset()
+
+    @contextmanager
+    def bulk_update(self):
+        """Rebuilding the whole tree: one model reset instead of many row inserts"""
+        self._begin_reset()
+        try:
+            yield
+        finally:
+            self._end_reset()
+
+    def iter_items(self, parent: SessionTreeItem = None) -> Iterator[SessionTreeItem]:
+        """Depth-first over all created items (pending tab rows are not created for this)"""
+        stack = list(reversed((parent or self._root)._children))
+        while stack:
+            item = stack.pop()
+            yield item
+            stack.extend(reversed(item._children))
+
+    # ---------- Bookkeeping (called by SessionTreeItem) ----------
+
+    def _begin_reset(self):
+        if self._bulk == 0:
+            self.beginResetModel()
+        self._bulk += 1
+
+    def _end_reset(self):
+        self._bulk -= 1
+        if self._bulk == 0:
+            self.endResetModel()
+
+    def _begin_insert(self, parent_item, first, last):
+        if not self._bulk:
+            self.beginInsertRows(self.index_for(parent_item), first, last)
+
+    def _end_insert(self):
+        if not self._bulk:
+            self.endInsertRows()
+
+    def _begin_remove(self, parent_item, first, last):
+        if not self._bulk:
+            self.beginRemoveRows(self.index_for(parent_item), first, last)
+
+    def _end_remove(self):
+        if not self._bulk:
+            self.endRemoveRows()
+
+    def _item_changed(self, item):
+        if not self._bulk:
+            index = self.index_for(item)
+            if index.isValid():
+                self.dataChanged.emit(index, index)
+
+    def _attach(self, item):
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            node._model = self
+            self._register(node)
+            if node._pending:
+                self._pending_changed(node)
+            stack.extend(node._children)
+
+    def _detach(self, item):
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            node._model = None
+            self._partial_items.discard(node)
+            if node.record is not None and self._items_by_uuid.get(node.record.uuid) is node:
+                del self._items_by_uuid[node.record.uuid]
+            stack.extend(node._children)
+
+    def _register(self, item):
+        if item.record is not None:
+            self._items_by_uuid[item.record.uuid] = item
+
+    def _pending_changed(self, item):
+        if item._pending:
+            self._partial_items.add(item)
+        else:
+            self._partial_items.discard(item)
+        self._pending_by_uuid = None
+
+    def _index_pending(self):
+        self._pending_by_uuid = {}
+        for item in self._partial_items:
+            for position in range(item._fetched, len(item._pending)):
+                self._pending_by_uuid[item._pending[position][0].uuid] = (item, position)
+
+
+class SessionTreeView(QTreeView):
+    """
+    QTreeView over a SessionTreeModel with the QTreeWidget convenience API the app relies on
+    (topLevelItem, currentItem, selectedItems, setHeaderLabel, itemSelectionChanged, ...).
+    """
+    itemSelectionChanged = Signal()
+    itemExpanded = Signal(object)
+    itemCollapsed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._model = SessionTreeModel(self)
+        self._model.view = self
+        self.setModel(self._model)
+        self.setUniformRowHeights(True)   # rows are never measured one by one
+        self.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        self.expanded.connect(self._on_expanded)
+        self.collapsed.connect(self._on_collapsed)
+        self.verticalScrollBar().valueChanged.connect(self._fetch_visible_rows)
+
+    # ---------- QTreeWidget-compatible API ----------
+
+    def setHeaderLabel(self, label: str):
+        self._model.set_header(label)
+
+    def set_icon_provider(self, provider: Callable[[TabRecord], QIcon]):
+        """Callable(record) -> QIcon used for tab rows without an explicit icon"""
+        self._model.icon_provider = provider
+
+    def clear(self):
+        self._model.clear()
+
+    def bulk_update(self):
+        return self._model.bulk_update()
+
+    def invisibleRootItem(self) -> SessionTreeItem:
+        return self._model.root()
+
+    def topLevelItemCount(self) -> int:
+        return self._model.root().childCount()
+
+    def topLevelItem(self, index: int) -> Optional[SessionTreeItem]:
+        return self._model.root().child(index)
+
+    def indexOfTopLevelItem(self, item: SessionTreeItem) -> int:
+        return self._model.root().indexOfChild(item)
+
+    def addTopLevelItem(self, item: SessionTreeItem):
+        self._model.root().addChild(item)
+
+    def addTopLevelItems(self, items: List[SessionTreeItem]):
+        self._model.root().addChildren(items)
+
+    def insertTopLevelItem(self, index: int, item: SessionTreeItem):
+        self._model.root().insertChild(index, item)
+
+    def takeTopLevelItem(self, index: int) -> Optional[SessionTreeItem]:
+        return self._model.root().takeChild(index)
+
+    def itemFromIndex(self, index) -> Optional[SessionTreeItem]:
+        return index.internalPointer() if index.isValid() else None
+
+    def indexFromItem(self, item: SessionTreeItem, column: int = 0):
+        return self._model.index_for(item)
+
+    def currentItem(self) -> Optional[SessionTreeItem]:
+        return self.itemFromIndex(self.currentIndex())
+
+    def setCurrentItem(self, item: Optional[SessionTreeItem]):
+        if item is None:
+            self.setCurrentIndex(QModelIndex())
+            self.clearSelection()
+        else:
+            self.setCurrentIndex(self._model.index_for(item))
+
+    def selectedItems(self) -> List[SessionTreeItem]:
+        return [index.internalPointer() for index in self.selectionModel().selectedRows() if index.isValid()]
+
+    def scrollToItem(self, item: SessionTreeItem, hint=QTreeView.EnsureVisible):
+        self.scrollTo(self._model.index_for(item), hint)
+
+    def expandItem(self, item: SessionTreeItem):
+        self.expand(self._model.index_for(item))
+
+    def collapseItem(self, item: SessionTreeItem):
+        self.collapse(self._model.index_for(item))
+
+    # ---------- Additions ----------
+
+    def iter_items(self) -> Iterator[SessionTreeItem]:
+        """All created items, depth-first (replacement for QTreeWidgetItemIterator)"""
+        return self._model.iter_items()
+
+    def item_for_uuid(self, uuid: str) -> Optional[SessionTreeItem]:
+        return self._model.item_for_uuid(uuid)
+
+    def set_tab_filter(self, tabs: Optional[Set[TabRecord]]) -> bool:
+        """
+        Shows only the tab rows whose record is in `tabs` (None: all rows) without rebuilding the tree.
+        Windows and groups without a shown tab are hidden. Returns whether a tab is shown.
+        """
+        shown = self._filter_children(self._model.root(), QModelIndex(), tabs)
+        self._fetch_visible_rows()
+        return shown
+
+    # ---------- Signal adapters ----------
+
+    def _on_selection_changed(self, *_):
+        self.itemSelectionChanged.emit()
+
+    def _on_expanded(self, index):
+        self._fetch_visible_rows()
+        self.itemExpanded.emit(self.itemFromIndex(index))
+
+    def _on_collapsed(self, index):
+        self.itemCollapsed.emit(self.itemFromIndex(index))
+
+    def _fetch_visible_rows(self, *_):
+        """
+        Loads the next batch of a group once its last row is in view (after expanding, scrolling or filtering).
+        Done here instead of canFetchMore/fetchMore: QTreeView calls those for every expanded row on
+        each relayout, which fills all expanded groups instead of the visible ones.
+        """
+        viewport = self.viewport().rect()
+        for item in self._lazy_items_in_order():
+            if not item._shown_pending():
+                continue   # the filter hides all of its pending rows
+            index = self._model.index_for(item)
+            row = item._last_shown_row()
+            if row >= 0:
+                tail = self._model.index(row, 0, index)
+            elif self.isExpanded(index):
+                tail = index   # expanded, but the filter hides all of its created rows
+            else:
+                continue
+            rect = self.visualRect(tail)
+            if not rect.isValid():
+                continue   # hidden or inside a collapsed window
+            if rect.top() > viewport.bottom():
+                break      # this and all following groups are below the viewport
+            if rect.bottom() >= viewport.top():
+                item._fetch_more()
+
+    def _lazy_items_in_order(self) -> Iterator[SessionTreeItem]:
+        """Groups that still have pending rows, top to bottom"""
+        partial = self._model._partial_items
+        if not partial:
+            return
+        stack = [self._model.root()]
+        while stack:
+            item = stack.pop()
+            if item in partial:
+                yield item
+            if item._entries is None:   # lazy groups only hold tab rows
+                stack.extend(child for child in reversed(item._children) if child.record is None)
+
+    def _filter_children(self, item: SessionTreeItem, index, tabs) -> bool:
+        if item._entries is not None:
+            return item.filter_tabs(tabs)
+        any_shown = False
+        for row, child in enumerate(item._children):
+            if child.record is not None:
+                shown = tabs is None or child.record in tabs
+            elif child._entries is not None:
+                shown = child.filter_tabs(tabs)
+            elif child._children:
+                shown = self._filter_children(child, self._model.index(row, 0, index), tabs)
+            else:
+                shown = tabs is None   # plain label rows
+            if self.isRowHidden(row, index) == shown:
+                self.setRowHidden(row, index, not shown)   # each call schedules a relayout
+            any_shown = any_shown or shown
+        return any_shown
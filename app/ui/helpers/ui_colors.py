@@ -1,7 +1,8 @@
 ##*** app/utils/colors.py
 from PySide6.QtGui import QColor, QIcon, QPixmap, QPainter
 from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QByteArray
+from app.ui.helpers.icon_registry import icon_registry
 
 
 COLORS = {
@@ -22,7 +23,12 @@ GUI_COLORS = {
 }
 
 def colored_svg_icon(svg_path: str, color: QColor, size=16) -> QIcon:
-    renderer = QSvgRenderer(svg_path)
+    # Ohne Theme-Abhängigkeit: die Farbe ist immer angegeben
+    key = ("file:" + str(svg_path), QColor(color).name(QColor.HexArgb), size, None)
+    icon = icon_registry.get(key)
+    if icon is not None:
+        return icon
+    renderer = QSvgRenderer(QByteArray(icon_registry.svg_text(svg_path).encode('utf-8')))
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.transparent)
     painter = QPainter(pixmap)
@@ -30,7 +36,7 @@ def colored_svg_icon(svg_path: str, color: QColor, size=16) -> QIcon:
     painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
     painter.fillRect(pixmap.rect(), color)
     painter.end()
-    return QIcon(pixmap)
+    return icon_registry.put(key, QIcon(pixmap))
 
 def get_color(name: str) -> QColor:
     """
@@ -4,7 +4,8 @@ from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtCore import QByteArray, Qt
 import re
 from app.ui.helpers.ui_colors import get_color_hex
-from app.ui.helpers.ui_themes import get_icon_color
+from app.ui.helpers.ui_themes import get_icon_color, is_dark_mode
+from app.ui.helpers.icon_registry import icon_registry
 
 
 ICON_DIR = Path(__file__).parent.parent.parent.parent / "assets/icons"
@@ -41,7 +42,14 @@ def colorize_svg(svg_content: str, color) -> str:
 def load_icon(name: str, color_or_size=None, size: int = None) -> QIcon:
     """
     Lädt ein SVG-Icon mit automatischer Theme-Unterstützung.
+    Gerenderte Icons kommen aus der icon_registry (pro Name, Farbe, Größe und Theme).
     """
+    color_key = color_or_size.name(QColor.HexArgb) if isinstance(color_or_size, QColor) else color_or_size
+    key = (name, color_key, size, is_dark_mode())
+    icon = icon_registry.get(key)
+    if icon is not None:
+        return icon
+
     path = ICON_DIR / f"{name}.svg"
     if not path.exists():
         raise FileNotFoundError(f"Icon '{name}.svg' nicht gefunden in {ICON_DIR}")
@@ -59,7 +67,7 @@ def load_icon(name: str, color_or_size=None, size: int = None) -> QIcon:
     if target_color is None:
         target_color = get_icon_color()
     
-    svg_content = path.read_text(encoding='utf-8')
+    svg_content = icon_registry.svg_text(path)
     
     if target_color:
         svg_content = colorize_svg(svg_content, target_color)
@@ -76,7 +84,7 @@ def load_icon(name: str, color_or_size=None, size: int = None) -> QIcon:
     painter = QPainter(pixmap)
     renderer.render(painter)
     painter.end()
-    return QIcon(pixmap)
+    return icon_registry.put(key, QIcon(pixmap))
 
 def load_colored_icon(name: str, color: str, size: int = None) -> QIcon:
     """
@@ -11,6 +11,8 @@ class ThemeManager(QObject):
     
     # Signal wird ausgelöst wenn sich das Theme ändert
     theme_changed = Signal(bool)  # True = Dark Mode, False = Light Mode
+    # Nach jedem Setzen einer Palette (z.B. für Caches von eingefärbten Icons)
+    palette_changed = Signal(bool)  # True = Dark Palette
     
     _instance = None
     
@@ -196,6 +198,7 @@ class ThemeManager(QObject):
         palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor(120, 120, 120))
         
         app.setPalette(palette)
+        self.palette_changed.emit(False)
     
     def _apply_dark_palette(self):
         """Wendet Dark-Palette mit korrekten ColorRoles an."""
@@ -244,6 +247,7 @@ class ThemeManager(QObject):
         palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor(127, 127, 127))
         
         app.setPalette(palette)
+        self.palette_changed.emit(True)
     
     def get_status_colors(self, message_type: str) -> dict:
         """
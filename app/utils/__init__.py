@@ -1,3 +1,4 @@
 from .utils import UtilsHelper, extract_domain, generate_url_hash, get_domain_without_tld, extract_path, format_size, find_firefox_profiles, create_backup_dir
 from .ui_translator import tr
-from .logger import Logger
\ No newline at end of file
+from .logger import Logger
+from . import codec
\ No newline at end of file
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+BatchScrapeEngine + RequestsFetcher against a local HTTP server
+
+The server answers /shop<n>/item/<i> with a small product page after a fixed latency and
+counts the requests in flight - overall and per shop (the engine's "domain"). Checked:
+- the global and per-domain limits are never exceeded
+- every page is extracted with the right values
+- pause starts no new requests, cancel ends the run without further results
+Compared with fetching the pages one after another (the single-tab worker).
+Exits with 1 if a check fails.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_batch_scrape [--shops 6] [--pages 120] [--latency 0.05] [--concurrency 8] [--per-domain 2]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.src.batch_scrape_engine import BatchScrapeEngine, ScrapeJob
+from app.services.http_client import HttpClient, DEFAULT_HEADERS
+from app.services.batch_scrape_worker import RequestsFetcher
+
+RULES = [
+    {"id": 1, "name": "title", "xpath": "//h1", "priority": 0},
+    {"id": 2, "name": "price", "xpath": "//span[@class='price']", "priority": 1},
+]
+
+
+class ShopServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), ShopHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.shop_in_flight = Counter()
+        self.shop_max_in_flight = Counter()
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class ShopHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, as a real shop would
+    wbufsize = -1                   # headers and body in one write, else Nagle + delayed ACK add 40 ms per request
+
+    def do_GET(self):
+        server = self.server
+        shop = self.path.split("/")[1]
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.shop_in_flight[shop] += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.shop_max_in_flight[shop] = max(server.shop_max_in_flight[shop], server.shop_in_flight[shop])
+        try:
+            time.sleep(server.latency)
+        finally:
+            # counted until the answer is sent - once the client has it, it may start the next request
+            with server.lock:
+                server.in_flight -= 1
+                server.shop_in_flight[shop] -= 1
+        body = (f"<html><body><h1>{self.path}</h1><span class='price'>{len(self.path)} EUR</span></body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_jobs(base_url: str, shops: int, pages: int):
+    # uneven on purpose: shop0 has half of all pages, the others share the rest
+    jobs = []
+    for i in range(pages):
+        shop = "shop0" if i % 2 == 0 else f"shop{1 + i % max(shops - 1, 1)}"
+        url = f"{base_url}/{shop}/item/{i}"
+        jobs.append(ScrapeJob(url, f"{i:012x}", str(i), shop, RULES))
+    return jobs
+
+
+def expected(job: ScrapeJob):
+    """What extract_rules() has to return for the page of a job"""
+    path = urlsplit(job.url).path
+    return {
+        "title": {"values": [path], "is_filter": False, "priority": 0},
+        "price": {"values": [f"{len(path)} EUR"], "is_filter": False, "priority": 1},
+    }
+
+
+def run_engine(engine: BatchScrapeEngine, jobs, control=None):
+    """Runs the engine in its own thread (like the BatchScrapeWorker), control(engine, results) in this one"""
+    results = []
+    outcome = {}
+
+    def on_result(job, data, error):
+        results.append((time.perf_counter(), job, data, error))
+
+    thread = threading.Thread(target=lambda: outcome.update(completed=asyncio.run(engine.run(jobs, on_result))))
+    start = time.perf_counter()
+    thread.start()
+    if control is not None:
+        control(engine, results)
+    thread.join()
+    return outcome["completed"], results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BatchScrapeEngine against a local HTTP server")
+    parser.add_argument("--shops", type=int, default=6, help="Domains (shops) the pages belong to")
+    parser.add_argument("--pages", type=int, default=120, help="Pages to scrape")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server latency per request in seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Global limit")
+    parser.add_argument("--per-domain", type=int, default=2, help="Limit per shop")
+    args = parser.parse_args()
+
+    server = ShopServer(args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    failures = []
+    try:
+        fetcher = RequestsFetcher(HttpClient(DEFAULT_HEADERS, read_timeout=10))
+        jobs = make_jobs(server.base_url, args.shops, args.pages)
+
+        # Baseline: one page after another
+        start = time.perf_counter()
+        for job in jobs[:min(len(jobs), 40)]:
+            fetcher(job)
+        sequential = (time.perf_counter() - start) / min(len(jobs), 40)
+
+        # Full run
+        server.max_in_flight = 0
+        server.shop_max_in_flight.clear()
+        engine = BatchScrapeEngine(fetcher, concurrency=args.concurrency, per_domain=args.per_domain)
+        completed, results, elapsed = run_engine(engine, jobs)
+        wrong = sum(1 for _t, job, data, error in results if error or data != expected(job))
+        print(f"{len(jobs)} pages on {args.shops} shops, {args.latency * 1000:.0f} ms latency")
+        print(f"  sequential  {sequential * len(jobs):6.2f} s (estimated from {min(len(jobs), 40)} pages)")
+        print(f"  engine      {elapsed:6.2f} s   ({sequential * len(jobs) / elapsed:.1f}x), "
+              f"{len(results)} results, {wrong} wrong")
+        print(f"  in flight   max {server.max_in_flight} overall (limit {args.concurrency}), "
+              f"max {max(server.shop_max_in_flight.values())} per shop (limit {args.per_domain})")
+        if not completed or len(results) != len(jobs) or wrong:
+            failures.append("not every page was extracted correctly")
+        if server.max_in_flight > args.concurrency or max(server.shop_max_in_flight.values()) > args.per_domain:
+            failures.append("a concurrency limit was exceeded")
+
+        # Pause: no new requests while paused, everything done after resume
+        def pause_control(engine, results):
+            while len(results) < len(jobs) // 4:
+                time.sleep(0.005)
+            engine.pause()
+            time.sleep(args.latency * 2)   # let the running fetches finish
+            before = server.requests
+            time.sleep(args.latency * 4)
+            pause_control.started = server.requests - before
+            engine.resume()
+
+        completed, results, _elapsed = run_engine(BatchScrapeEngine(fetcher, args.concurrency, args.per_domain), jobs, pause_control)
+        print(f"  pause       {pause_control.started} requests started while paused, {len(results)} results after resume")
+        if pause_control.started or not completed or len(results) != len(jobs):
+            failures.append("pause/resume")
+
+        # Cancel: the run ends, nothing is reported afterwards
+        def cancel_control(engine, results):
+            while len(results) < len(jobs) // 4:
+                time.sleep(0.005)
+            cancel_control.at = time.perf_counter()
+            engine.cancel()
+
+        completed, results, _elapsed = run_engine(BatchScrapeEngine(fetcher, args.concurrency, args.per_domain), jobs, cancel_control)
+        late = sum(1 for t, *_rest in results if t > cancel_control.at)
+        print(f"  cancel      {len(results)} of {len(jobs)} results, {late} after cancel, completed={completed}")
+        if completed or late or len(results) == len(jobs):
+            failures.append("cancel")
+    finally:
+        server.shutdown()
+
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
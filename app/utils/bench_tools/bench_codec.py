@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Codec benchmark for FFSessionTool
+
+Measures JSON decode/encode and LZ4 compress/decompress throughput (MB/s)
+for every available backend on real session files.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_codec path/to/sessionstore.jsonlz4 [more files] [--runs 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils import codec
+
+
+def best_of(runs, func, *args, **kwargs):
+    best = None
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def mb_per_s(size, seconds):
+    return (size / (1024 * 1024)) / seconds if seconds else float("inf")
+
+
+def bench_file(path, runs):
+    compressed = codec.read_mozlz4(path)
+    raw = codec.lz4_decompress(compressed)
+    size = len(raw)
+    print(f"\n{os.path.basename(path)}: {len(compressed) / 1024:.0f} KiB compressed, {size / 1024:.0f} KiB JSON")
+
+    t, _ = best_of(runs, codec.lz4_decompress, compressed)
+    print(f"  lz4 decompress            {mb_per_s(size, t):8.1f} MB/s")
+
+    for level in codec.LZ4_LEVELS:
+        t, out = best_of(runs, codec.lz4_compress, raw, level)
+        print(f"  lz4 compress {level:<12} {mb_per_s(size, t):8.1f} MB/s   ratio {size / len(out):.2f}")
+
+    for backend in codec.JSON_BACKENDS:
+        t_dec, data = best_of(runs, codec.json_loads, raw, backend=backend)
+        t_enc, _ = best_of(runs, codec.json_dumps, data, backend=backend)
+        t_ind, _ = best_of(runs, codec.json_dumps, data, indent=2, backend=backend)
+        print(f"  {backend:<7} decode {mb_per_s(size, t_dec):8.1f} MB/s   encode {mb_per_s(size, t_enc):8.1f} MB/s   encode indent=2 {mb_per_s(size, t_ind):8.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON/LZ4 codec benchmark for FFSessionTool")
+    parser.add_argument("files", nargs="+", help="Session files (.jsonlz4)")
+    parser.add_argument("--runs", "-r", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"JSON backends: {', '.join(codec.JSON_BACKENDS)} (active: {codec.JSON_BACKEND})")
+    if "orjson" not in codec.JSON_BACKENDS:
+        print("orjson not installed - install with: pip install orjson")
+
+    for path in args.files:
+        bench_file(path, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Per-query overhead of DBHandler: get_tab_id() and get_xpath_rules()
+
+"before" is the old connection handling (one global lock, a new sqlite3.connect per call that is
+never closed), "after" the pooled per-thread connections. The database is a temporary copy filled
+with synthetic tabs and rules, so user_data is never touched.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_db [--tabs 2000] [--rules 200] [--queries 2000] [--threads 4]
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils.db_handler import DBHandler
+
+
+class LegacyDBHandler(DBHandler):
+    """The connection handling before the pool, for comparison"""
+
+    def __init__(self, db_path):
+        self._legacy_lock = threading.Lock()
+        super().__init__(db_path)
+
+    @contextmanager
+    def get_db_connection(self):
+        with self._legacy_lock:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            yield conn
+
+
+def fill_database(db: DBHandler, tabs: int, rules: int):
+    session_id = db.get_or_create_session_id("bench-session.jsonlz4", "bench")
+    with db.get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO xpath_tabs (session_id, url_hash, url) VALUES (?, ?, ?)",
+            ((session_id, f"{i:012x}", f"https://example{i % 500}.com/page/{i}") for i in range(tabs))
+        )
+        conn.commit()
+    domains = [f"example{i}.com" for i in range(max(1, rules // 10))]
+    for position, domain in enumerate(domains):
+        db.save_xpath_rules(domain, "/page/", [
+            {"name": f"rule{position}-{i}", "xpath": f"//div[@class='r{i}']", "priority": i}
+            for i in range(10)
+        ])
+    return session_id, domains
+
+
+def time_queries(db: DBHandler, session_id: int, domains: list, tabs: int, queries: int):
+    rng = random.Random(1)
+    hashes = [f"{rng.randrange(tabs):012x}" for _ in range(queries)]
+    start = time.perf_counter()
+    for url_hash in hashes:
+        db.get_tab_id(session_id, url_hash)
+    tab_id_time = (time.perf_counter() - start) / queries
+
+    picks = [rng.choice(domains) for _ in range(queries)]
+    start = time.perf_counter()
+    for domain in picks:
+        db.get_xpath_rules(domain, "/page/")
+    rules_time = (time.perf_counter() - start) / queries
+    return tab_id_time, rules_time
+
+
+def time_threads(db: DBHandler, session_id: int, tabs: int, queries: int, threads: int):
+    """Wall time of `threads` threads doing `queries` get_tab_id() calls each"""
+    def reader(seed):
+        rng = random.Random(seed)
+        for _ in range(queries):
+            db.get_tab_id(session_id, f"{rng.randrange(tabs):012x}")
+
+    workers = [threading.Thread(target=reader, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-query overhead of DBHandler")
+    parser.add_argument("--tabs", type=int, default=2000, help="Tabs in xpath_tabs")
+    parser.add_argument("--rules", type=int, default=200, help="XPath rules (10 per domain)")
+    parser.add_argument("--queries", "-q", type=int, default=2000, help="Queries per measurement")
+    parser.add_argument("--threads", "-t", type=int, default=4, help="Reader threads for the concurrent run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        setup = DBHandler(db_path)
+        session_id, domains = fill_database(setup, args.tabs, args.rules)
+        setup.close()
+
+        print(f"{args.tabs} tabs, {len(domains) * 10} rules, {args.queries} queries each")
+        results = {}
+        for name, handler_class in (("before", LegacyDBHandler), ("after", DBHandler)):
+            db = handler_class(db_path)
+            time_queries(db, session_id, domains, args.tabs, 100)   # warm up the page cache
+            tab_id_time, rules_time = time_queries(db, session_id, domains, args.tabs, args.queries)
+            threaded_time = time_threads(db, session_id, args.tabs, args.queries, args.threads)
+            results[name] = (tab_id_time, rules_time, threaded_time)
+            print(f"  {name:6}  get_tab_id {tab_id_time * 1e6:8.1f} us   get_xpath_rules {rules_time * 1e6:8.1f} us"
+                  f"   {args.threads} threads x get_tab_id {threaded_time * 1000:8.1f} ms")
+            db.close()
+
+        before, after = results["before"], results["after"]
+        print(f"  speedup  get_tab_id {before[0] / after[0]:.1f}x   get_xpath_rules {before[1] / after[1]:.1f}x"
+              f"   threads {before[2] / after[2]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Memory saved by SessionParser.intern_favicons()
+
+Parses a session twice and reports what tracemalloc sees for the parsed json + the tab records:
+  - plain:    codec.json_loads() as before, every tab keeps its own favicon string
+  - interned: SessionParser.parse(), tabs with the same favicon share one string
+Also checks that both serialize to the same bytes (what write_jsonlz4() writes).
+Exits with 1 if they differ.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_favicon_memory path/to/sessionstore.jsonlz4
+"""
+
+import os
+import sys
+import gc
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils import codec
+from app.src.session_parser import SessionParser
+
+
+def load_plain(path, decompressed):
+    parser = SessionParser(path)
+    parser.json_data = codec.json_loads(decompressed)
+    parser.get_enriched_tabs_and_groups()
+    return parser
+
+
+def load_interned(path, decompressed):
+    parser = SessionParser(path)
+    parser.parse(decompressed)
+    parser.get_enriched_tabs_and_groups()
+    return parser
+
+
+def measure(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory saved by interning the favicon data: URIs")
+    parser.add_argument("file", help="Session file (.jsonlz4)")
+    args = parser.parse_args()
+
+    reader = SessionParser(args.file)
+    decompressed = reader.decompress(reader.read_compressed())
+
+    plain, plain_bytes = measure(load_plain, args.file, decompressed)
+    plain_json = codec.json_dumps(plain.json_data)
+    del plain
+    interned, interned_bytes = measure(load_interned, args.file, decompressed)
+    stats = interned.favicon_stats
+
+    print(f"{len(interned.enriched_tabs)} tabs, {stats['images']} favicons, {stats['unique']} unique")
+    print(f"  plain:     {plain_bytes / 1024 / 1024:8.1f} MB")
+    print(f"  interned:  {interned_bytes / 1024 / 1024:8.1f} MB")
+    print(f"  saved:     {(plain_bytes - interned_bytes) / 1024 / 1024:8.1f} MB "
+          f"({stats['saved_bytes'] / 1024 / 1024:.1f} MB of duplicate strings)")
+
+    identical = codec.json_dumps(interned.json_data) == plain_json
+    print(f"  same output: {'yes' if identical else 'NO'}")
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
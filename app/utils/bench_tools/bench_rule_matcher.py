@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rule lookup per URL: RuleMatcher.resolve() against the queries it replaces
+(find_matching_url_part + get_xpath_rules, repeated for the www. variant)
+
+The rules are synthetic (a temporary database). With a session file, the rule coverage of its
+tabs is measured as well - against the real user_data database if --db is given.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_rule_matcher [--domains 200] [--urls 5000] [--session path/to/sessionstore.jsonlz4 [--db user_data/sessions.db]]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils.db_handler import DBHandler
+from app.src.rule_matcher import RuleMatcher
+
+PATH_PARTS = ["/p/", "/product/", "/item/", "/category/", "/search?q=", "/blog/", "/news/", "/watch?v=", "/user/", "/dp/"]
+
+
+def fill_rules(db: DBHandler, domains: int, rng: random.Random):
+    for i in range(domains):
+        domain = f"shop{i}.example"
+        for url_contains in [""] + rng.sample(PATH_PARTS, rng.randrange(1, 5)):
+            db.save_xpath_rules(domain, url_contains, [
+                {"name": f"{domain}{url_contains}{k}", "xpath": f"//div[@class='r{k}']", "priority": k, "is_global": k == 0}
+                for k in range(3)
+            ])
+
+
+def queries_resolve(db: DBHandler, url: str):
+    """The lookup of the scrape handlers before the RuleMatcher"""
+    domain = RuleMatcher.normalized_domain(url)
+    url_contains = db.find_matching_url_part(domain, url) or ""
+    rules = db.get_xpath_rules(domain, url_contains)
+    if not rules:
+        alt_domain = "www." + domain
+        url_contains = db.find_matching_url_part(alt_domain, url) or ""
+        rules = db.get_xpath_rules(alt_domain, url_contains)
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule lookup per URL: RuleMatcher vs. queries")
+    parser.add_argument("--domains", type=int, default=200, help="Domains with rules")
+    parser.add_argument("--urls", type=int, default=5000, help="URLs to resolve")
+    parser.add_argument("--session", help="Session file (.jsonlz4) to measure the rule coverage of")
+    parser.add_argument("--db", help="Database for the coverage (default: the synthetic one)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DBHandler(os.path.join(tmp, "bench.db"))
+        fill_rules(db, args.domains, rng)
+        urls = [
+            f"https://{rng.choice(['', 'www.'])}shop{rng.randrange(args.domains * 2)}.example"
+            f"{rng.choice(PATH_PARTS)}{rng.randrange(100000)}"
+            for _ in range(args.urls)
+        ]
+
+        start = time.perf_counter()
+        matcher = db.get_rule_matcher()
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        resolved = [matcher.resolve(url)[2] for url in urls]
+        matcher_time = (time.perf_counter() - start) / len(urls)
+
+        start = time.perf_counter()
+        queried = [queries_resolve(db, url) for url in urls]
+        query_time = (time.perf_counter() - start) / len(urls)
+
+        mismatches = sum(1 for first, second in zip(resolved, queried) if first != second)
+        print(f"{args.domains} domains, matcher built in {build_time * 1000:.1f} ms")
+        print(f"  queries   {query_time * 1e6:8.1f} us per URL")
+        print(f"  matcher   {matcher_time * 1e6:8.1f} us per URL   ({query_time / matcher_time:.1f}x, {mismatches} different results)")
+
+        if args.session:
+            from app.src.session_parser import SessionParser
+            session = SessionParser(args.session)
+            session.load_session()
+            tabs, _groups, _group_list = session.get_enriched_tabs_and_groups()
+            coverage_db = DBHandler(args.db) if args.db else db
+            start = time.perf_counter()
+            coverage = coverage_db.get_rule_matcher().coverage(tabs)
+            print(f"  coverage  {len(coverage.covered)} of {len(tabs)} tabs have rules, "
+                  f"{len(coverage.by_domain)} domains, {(time.perf_counter() - start) * 1000:.1f} ms")
+            for domain, count in coverage.by_domain.most_common(10):
+                print(f"            {count:7}  {domain}")
+            if coverage_db is not db:
+                coverage_db.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tab filter cost per keystroke: SearchIndex.search() + SessionTreeView.set_tab_filter()
+
+The session is shown in an (offscreen) SessionTreeView with its top-level items expanded, then
+each query is typed character by character and deleted again. Every step is what the debounced
+filter does after a keystroke, including the repaint. The summary counts the keystrokes over
+BUDGET (one frame).
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_search path/to/sessionstore.jsonlz4 [--multiply 10] [--query "github" ...]
+"""
+
+import os
+import sys
+import gc
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication
+
+from app.src.session_parser import SessionParser
+from app.src.search_index import SearchIndex
+from app.services.session_populator import SessionPopulator
+from app.services.favicon_cache import FaviconCache
+from app.services.favicon_store import FaviconStore
+from app.ui.helpers import SessionTreeView
+
+DEFAULT_QUERIES = ["https", "page 4", "about thing", "example.com/page/1", "zzz-not-there"]
+BUDGET = 0.016   # one frame at 60 Hz
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tab filter cost per keystroke")
+    parser.add_argument("file", help="Session file (.jsonlz4)")
+    parser.add_argument("--multiply", "-m", type=int, default=1, help="Repeat the windows n times (e.g. to get 50k tabs)")
+    parser.add_argument("--query", "-q", action="append", help="Query to type (can be repeated)")
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    session = SessionParser(args.file)
+    json_data = session.load_session()
+    if args.multiply > 1:
+        json_data["windows"] = json_data.get("windows", []) * args.multiply
+    tabs, _groups, group_list = session.get_enriched_tabs_and_groups()
+
+    start = time.perf_counter()
+    search_index = SearchIndex(tabs)
+    build_time = time.perf_counter() - start
+
+    # favicons go into a throwaway store: opening the real one would migrate and prune it
+    with tempfile.TemporaryDirectory() as favicon_dir:
+        favicons = FaviconCache(FaviconStore(favicon_dir))
+        try:
+            view = SessionTreeView()
+            view.resize(600, 800)
+            view.show()
+            populator = SessionPopulator(favicons, QIcon())
+            populator.populate_session_tree(view, tabs, group_list, args.file)
+            for item in view.iter_items():
+                if item._entries is not None:
+                    item.setExpanded(True)
+            app.processEvents()
+
+            # Load all favicons first, the timings are about filtering (not about decoding icons in the pool)
+            for tab in tabs:
+                populator.tab_icon(tab)
+            domains = {tab.domain or "" for tab in tabs}
+            while any(favicons.is_loading(domain) for domain in domains):
+                app.processEvents()
+                time.sleep(0.001)
+            gc.collect()   # like the app after loading a session
+
+            print(f"{len(tabs)} tabs, search keys built in {build_time * 1000:.1f} ms")
+            all_times = []
+            for query in args.query or DEFAULT_QUERIES:
+                steps = [query[:i] for i in range(1, len(query) + 1)]
+                steps += steps[-2::-1] + [""]   # delete it again
+                times = []
+                for text in steps:
+                    start = time.perf_counter()
+                    view.set_tab_filter(search_index.search(text) if text else None)
+                    app.processEvents()
+                    times.append(time.perf_counter() - start)
+                all_times += times
+                shown = len(search_index.search(query))
+                print(f"  {query!r:24} {shown:7} hits   avg {sum(times) / len(times) * 1000:6.2f} ms   max {max(times) * 1000:6.2f} ms")
+            all_times.sort()
+            over = sum(t > BUDGET for t in all_times)
+            print(f"  median {all_times[len(all_times) // 2] * 1000:.2f} ms   worst {all_times[-1] * 1000:.2f} ms   "
+                  f"over {BUDGET * 1000:.0f} ms: {over} of {len(all_times)} keystrokes")
+        finally:
+            favicons.close()
+            favicons.store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Session tree build time: SessionPopulator.populate_session_tree() on a SessionTreeView
+
+Only window/group rows are created up front, tab rows are fetched by the view. The script reports
+the populate time and what expanding the first group and scrolling through it costs.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_session_tree path/to/sessionstore.jsonlz4 [--multiply 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication
+
+from app.src.session_parser import SessionParser
+from app.services.session_populator import SessionPopulator
+from app.services.favicon_cache import FaviconCache
+from app.services.favicon_store import FaviconStore
+from app.ui.helpers import SessionTreeView
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session tree build time")
+    parser.add_argument("file", help="Session file (.jsonlz4)")
+    parser.add_argument("--multiply", "-m", type=int, default=1, help="Repeat the windows n times (e.g. to get 100k tabs)")
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    session = SessionParser(args.file)
+    json_data = session.load_session()
+    if args.multiply > 1:
+        json_data["windows"] = json_data.get("windows", []) * args.multiply
+    tabs, _groups, group_list = session.get_enriched_tabs_and_groups()
+
+    # favicons go into a throwaway store: opening the real one would migrate and prune it
+    with tempfile.TemporaryDirectory() as favicon_dir:
+        favicons = FaviconCache(FaviconStore(favicon_dir))
+        try:
+            view = SessionTreeView()
+            view.resize(600, 800)
+            view.show()
+            populator = SessionPopulator(favicons, QIcon())
+
+            start = time.perf_counter()
+            populator.populate_session_tree(view, tabs, group_list, args.file)
+            app.processEvents()
+            populate_time = time.perf_counter() - start
+
+            # Biggest group that still has pending tab rows
+            group = max((item for item in view.iter_items() if item._pending), key=lambda item: item.childCount(), default=None)
+
+            print(f"{len(tabs)} tabs")
+            print(f"  populate:        {populate_time * 1000:8.1f} ms")
+            if group is None:
+                return
+
+            start = time.perf_counter()
+            group.setExpanded(True)
+            app.processEvents()
+            print(f"  expand group:    {(time.perf_counter() - start) * 1000:8.1f} ms ({group.text(0)})")
+
+            start = time.perf_counter()
+            scrolls = 0
+            while group._pending and scrolls < 1000:
+                view.scrollToItem(group.child(len(group._children) - 1))
+                app.processEvents()
+                scrolls += 1
+            print(f"  scroll to end:   {(time.perf_counter() - start) * 1000:8.1f} ms ({scrolls} scroll steps, {group.childCount()} rows)")
+        finally:
+            favicons.close()
+            favicons.store.close()
+
+
+if __name__ == "__main__":
+    main()
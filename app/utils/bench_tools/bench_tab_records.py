@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Memory comparison: per-tab dicts (old layout) vs. slotted TabRecords
+
+Builds the tab list of a session twice and reports what tracemalloc sees:
+  - dicts:   14-key enriched dict per tab + the copy that went into every tree item
+             (with 'type', 'data_entries' and 'filterable_values')
+  - records: TabRecord from SessionParser.get_enriched_tabs_and_groups(), stored in the item as-is
+
+The raw session json is loaded before measuring, so only the per-tab overhead is compared.
+(Qt's own copy of the old dicts - QVariantMap in every item - is not visible to tracemalloc and comes on top.)
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.bench_tab_records path/to/sessionstore.jsonlz4 [--multiply 10]
+"""
+
+import os
+import sys
+import gc
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils import extract_domain, generate_url_hash
+from app.src.session_parser import SessionParser
+
+
+def build_dicts(json_data):
+    """The old get_enriched_tabs_and_groups() + SessionPopulator._prepare_tab_data() layout"""
+    enriched_tabs, item_data = [], []
+    for window_index, window in enumerate(json_data.get("windows", [])):
+        groups = {g.get("id"): g.get("name", "") for g in window.get("groups", []) if g.get("id")}
+        for tab in window.get("tabs", []):
+            entries = tab.get("entries", [])
+            if not entries:
+                continue
+            entry = entries[tab.get("index", 1) - 1]
+            url = entry.get("url", "")
+            tab_dict = {
+                "title": entry.get("title", ""),
+                "url": url,
+                "uuid": entry.get("docshellUUID", "").replace("{", "").replace("}", ""),
+                "url_hash": generate_url_hash(url) if url else None,
+                "favicon": tab.get("image", ""),
+                "domain": extract_domain(url) if url else None,
+                "group_id": tab.get("groupId", None),
+                "group_name": groups.get(tab.get("groupId"), "Ungrouped"),
+                "window_index": window_index,
+                "pinned": tab.get("pinned", False),
+                "hidden": tab.get("hidden", False),
+                "last_accessed": tab.get("lastAccessed", 0),
+                "status": "active",
+                "raw_tab": tab,
+            }
+            enriched_tabs.append(tab_dict)
+            copied = tab_dict.copy()
+            copied.update({"type": "tab_item", "data_entries": [], "filterable_values": []})
+            item_data.append(copied)
+    return enriched_tabs, item_data
+
+
+def build_records(parser):
+    records, _groups, _all_groups = parser.get_enriched_tabs_and_groups()
+    # the tree item holds the same object
+    return records, list(records)
+
+
+def measure(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tab memory: dicts vs. TabRecord")
+    parser.add_argument("file", help="Session file (.jsonlz4)")
+    parser.add_argument("--multiply", "-m", type=int, default=1, help="Repeat the windows n times (e.g. to get 50k tabs)")
+    args = parser.parse_args()
+
+    session = SessionParser(args.file)
+    json_data = session.load_session()
+    if args.multiply > 1:
+        json_data["windows"] = json_data.get("windows", []) * args.multiply
+
+    (tabs, _), dict_bytes, dict_peak = measure(build_dicts, json_data)
+    count = len(tabs)
+    del tabs, _
+
+    (records, _), record_bytes, record_peak = measure(build_records, session)
+
+    mb = 1024 * 1024
+    print(f"{count} tabs")
+    print(f"  dicts:   {dict_bytes / mb:8.1f} MiB ({dict_bytes / count:6.0f} B/tab), peak {dict_peak / mb:.1f} MiB")
+    print(f"  records: {record_bytes / mb:8.1f} MiB ({record_bytes / count:6.0f} B/tab), peak {record_peak / mb:.1f} MiB")
+    print(f"  ratio:   {dict_bytes / max(record_bytes, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
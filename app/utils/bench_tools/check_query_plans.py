@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN QUERY PLAN of the DBHandler lookups: every SELECT they run must be answered through an
+index (SEARCH), not by a full table scan (SCAN).
+
+The lookups run against a temporary database with a few synthetic rows; their statements are
+captured with a trace callback (bound values expanded) and explained afterwards.
+Exits with 1 if a statement scans a table.
+
+Usage (from the project root):
+    python -m app.utils.bench_tools.check_query_plans [--verbose]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from app.utils.db_handler import DBHandler
+
+
+def fill_database(db: DBHandler):
+    session_id = db.get_or_create_session_id("check-session.jsonlz4", "check")
+    tab_ids = [db.write_tab_id(session_id, f"{i:012x}", f"https://example.com/page/{i}") for i in range(50)]
+    db.save_xpath_rules("example.com", "/page/", [
+        {"name": f"rule{i}", "xpath": f"//div[@class='r{i}']", "priority": i} for i in range(5)
+    ])
+    rule_id = db.get_xpath_rules("example.com", "/page/")[0]["id"]
+    db.save_extracted_results([(session_id, f"{0:012x}", "https://example.com/page/0", [(rule_id, "value")])])
+    db.save_extended_url(tab_ids[0], "Group", "https://example.com/page/0?extended")
+    return session_id, tab_ids[0], rule_id
+
+
+def lookups(db: DBHandler, session_id: int, tab_id: int, rule_id: int):
+    """The key-based lookups of DBHandler (listings of whole tables are left out on purpose)"""
+    url = "https://example.com/page/0"
+    return {
+        "get_tab_id": lambda: db.get_tab_id(session_id, f"{0:012x}"),
+        "get_tab_id_by_url": lambda: db.get_tab_id_by_url(url),
+        "load_extracted_data_for_url": lambda: db.load_extracted_data_for_url(url),
+        "get_extracted_data_for_tab": lambda: db.get_extracted_data_for_tab(tab_id),
+        "get_extracted_data_for_rule": lambda: db.get_extracted_data_for_rule(tab_id, rule_id),
+        "get_tabs_by_extracted_value": lambda: db.get_tabs_by_extracted_value(rule_id, "value"),
+        "get_xpath_rules (domain)": lambda: db.get_xpath_rules("example.com", ""),
+        "get_xpath_rules (domain + url_contains)": lambda: db.get_xpath_rules("example.com", "/page/"),
+        "find_matching_url_part": lambda: db.find_matching_url_part("example.com", url),
+        "xpath_rules_exist": lambda: db.xpath_rules_exist("example.com", "/page/"),
+        "get_or_create_session_id": lambda: db.get_or_create_session_id("check-session.jsonlz4", "check"),
+        "get_extended_urls_for_tab": lambda: db.get_extended_urls_for_tab(tab_id),
+        "get_urls_by_group": lambda: db.get_urls_by_group("Group"),
+        "count_urls_by_group": lambda: db.count_urls_by_group("Group"),
+        "get_app_info": lambda: db.get_app_info("check"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN of the DBHandler lookups")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DBHandler(os.path.join(tmp, "check.db"))
+        session_id, tab_id, rule_id = fill_database(db)
+
+        scans = 0
+        with db.get_db_connection() as conn:
+            for name, lookup in lookups(db, session_id, tab_id, rule_id).items():
+                statements = []
+                conn.set_trace_callback(statements.append)
+                lookup()
+                conn.set_trace_callback(None)
+
+                for statement in statements:
+                    if not statement.lstrip().upper().startswith("SELECT"):
+                        continue
+                    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+                    scanned = [detail for detail in plan if detail.startswith("SCAN")]
+                    scans += len(scanned)
+                    print(f"{'SCAN' if scanned else 'ok':4}  {name}")
+                    for detail in plan if args.verbose else scanned:
+                        print(f"        {detail}")
+        db.close()
+
+    print(f"{scans} full scan(s)")
+    sys.exit(1 if scans else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+JSON + mozLz4 codec used for reading and writing session files.
+
+orjson is used when installed (pip install orjson), otherwise the stdlib json module.
+Everything that orjson can't represent (indent other than 2, non-str keys, ints > 64 bit, ...)
+silently falls back to stdlib, so callers never have to care which backend is active.
+(orjson reads integers beyond 64 bit as float - same as Firefox itself, which writes these files from JS.)
+"""
+import json
+import lz4.block
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+MOZLZ4_MAGIC = b"mozLz40\0"
+
+# Compression levels for files we write back (Firefox reads all of them)
+LZ4_LEVELS = {
+    "fast": {"mode": "fast", "acceleration": 8},
+    "default": {"mode": "default"},
+    "high": {"mode": "high_compression", "compression": 9},
+    "max": {"mode": "high_compression", "compression": 12},
+}
+DEFAULT_LZ4_LEVEL = "default"
+
+JSON_BACKENDS = ["orjson", "json"] if orjson else ["json"]
+JSON_BACKEND = JSON_BACKENDS[0]
+
+
+# ---------- JSON ----------
+
+def json_loads(data, backend: str = None):
+    """Parses bytes or str. Raises json.JSONDecodeError (orjson's error is a subclass of it)."""
+    if orjson and (backend or JSON_BACKEND) == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. big integers - let stdlib decide (and raise the "real" error)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent: int = None, backend: str = None) -> bytes:
+    """
+    Serializes to UTF-8 bytes (non-ascii characters are kept, like ensure_ascii=False).
+    Strings with lone surrogates (titles cut in the middle of an emoji) can't be UTF-8: then the
+    whole output is ASCII with \\uXXXX escapes, which reads back to the same strings.
+    """
+    if orjson and (backend or JSON_BACKEND) == "orjson" and indent in (None, 2):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    text = json.dumps(obj, indent=indent, ensure_ascii=False)
+    try:
+        return text.encode("utf-8")
+    except UnicodeEncodeError:
+        return json.dumps(obj, indent=indent).encode("ascii")
+
+
+def json_dump_file(obj, path: str, indent: int = None, backend: str = None):
+    with open(path, "wb") as f:
+        f.write(json_dumps(obj, indent=indent, backend=backend))
+
+
+# ---------- mozLz4 ----------
+
+def lz4_compress(data: bytes, level: str = None) -> bytes:
+    return lz4.block.compress(data, **LZ4_LEVELS.get(level or DEFAULT_LZ4_LEVEL, LZ4_LEVELS[DEFAULT_LZ4_LEVEL]))
+
+
+def lz4_decompress(data: bytes) -> bytes:
+    """Raises lz4.block.LZ4BlockError on broken data."""
+    return lz4.block.decompress(data)
+
+
+def read_mozlz4(path: str) -> bytes:
+    """Returns the compressed block of a .jsonlz4 file. Raises ValueError on a wrong magic header."""
+    with open(path, "rb") as f:
+        if f.read(len(MOZLZ4_MAGIC)) != MOZLZ4_MAGIC:
+            raise ValueError("Invalid jsonlz4 file header")
+        return f.read()
+
+
+def load_jsonlz4(path: str, backend: str = None):
+    return json_loads(lz4_decompress(read_mozlz4(path)), backend=backend)
+
+
+def encode_jsonlz4(obj, level: str = None, backend: str = None) -> bytes:
+    return MOZLZ4_MAGIC + lz4_compress(json_dumps(obj, backend=backend), level)
+
+
+def write_jsonlz4(obj, path: str, level: str = None, backend: str = None):
+    data = encode_jsonlz4(obj, level=level, backend=backend)
+    with open(path, "wb") as f:
+        f.write(data)
@@ -2,10 +2,33 @@
 import sqlite3
 import threading
 import time
+import weakref
 from datetime import datetime
 from contextlib import contextmanager
 from collections import defaultdict
 from app.utils import Logger
+from app.src.rule_matcher import RuleMatcher
+
+
+class _PooledConnection:
+    """
+    The connection of one thread. It is closed by close() or as soon as the thread ends
+    (its thread-local data is released then).
+    """
+    __slots__ = ("conn", "depth", "_finalizer", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 0   # nested get_db_connection() calls of the thread
+        self._finalizer = weakref.finalize(self, conn.close)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self):
+        self._finalizer()
+
 
 class DBHandler:
     """
@@ -16,12 +39,37 @@ class DBHandler:
     - Extracted data from web pages using XPath rules
     - Session and tab tracking for Firefox session files
     - Extended URL mappings for enhanced data organization
-    
+
+    Every thread gets its own persistent connection (WAL: readers don't wait for the writer),
+    opened on first use and closed when the thread ends or close() is called.
     """
-    
+    # Applied to every new connection. synchronous=NORMAL is safe with WAL (a power loss can only
+    # lose the last commits, never corrupt the database).
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-16000",      # 16 MB page cache
+        "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped reads
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    )
+    CACHED_STATEMENTS = 256   # prepared statements kept per connection
+
+    # Schema migrations (method names), append only - the position is the version stored in
+    # PRAGMA user_version. Databases from before the versioning start at 0, so every migration
+    # has to cope with a schema that already has its changes.
+    MIGRATIONS = (
+        "_migrate_session_content_hash",
+        "_migrate_lookup_indexes",
+    )
+
     def __init__(self, db_path="sites.db"):
         self.db_path = db_path
-        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = weakref.WeakSet()   # _PooledConnection of all threads, for close()
+        self._pool_lock = threading.Lock()
+        self._rule_matcher = None
+        self._rules_version = 0   # bumped by every rule change, so a matcher built meanwhile is dropped
         self.logger = Logger.get_logger("DBHandler")
         self._initialize_database()
 
@@ -138,28 +186,104 @@ class DBHandler:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_extracted_rule_value ON xpath_extracted_data(rule_id, value);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_extracted_tab ON xpath_extracted_data(tab_id);")
             cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_tab_rule_value ON xpath_extracted_data (tab_id, rule_id, value);")
-        
-            cursor.execute("PRAGMA journal_mode=WAL;")  # Enable WAL for crash resistance
             conn.commit()
-                
 
+            self._apply_migrations(conn)
+
+    def _apply_migrations(self, conn):
+        """
+        Brings the schema up to date: PRAGMA user_version is the number of applied MIGRATIONS.
+        Every migration runs in its own transaction together with the version bump.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, name in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            try:
+                conn.execute("BEGIN")
+                getattr(self, name)(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+                self.logger.info(f"Applied database migration {number}: {name}")
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Database migration {number} ({name}) failed: {e} |#| ({type(e).__name__})", exc_info=True)
+                raise
+
+    def _migrate_session_content_hash(self, cursor):
+        # Older databases: app_sessions without content_hash
+        cursor.execute("PRAGMA table_info(app_sessions)")
+        if "content_hash" not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE app_sessions ADD COLUMN content_hash TEXT")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_app_sessions_content_hash ON app_sessions(content_hash);")
+
+    def _migrate_lookup_indexes(self, cursor):
+        # get_tab_id, get_tab_id_by_url, load_extracted_data_for_url and the extended URL lookups
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_xpath_tabs_session_hash ON xpath_tabs(session_id, url_hash);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_xpath_tabs_url_hash ON xpath_tabs(url_hash);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_xpath_tabs_url ON xpath_tabs(url);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_extended_urls_group ON xpath_extended_urls(group_name);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_extended_urls_tab ON xpath_extended_urls(tab_id);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_xpath_rules_domain ON xpath_rules(domain_id);")
 
     @contextmanager
     def get_db_connection(self):
-        with self._lock:
-            retries = 3
-            for attempt in range(retries):
+        """
+        Yields the connection of the calling thread. A transaction that is still open when the
+        outermost `with` block ends (not committed, or left by an exception) is rolled back.
+        """
+        pooled = self._thread_connection()
+        pooled.depth += 1
+        try:
+            yield pooled.conn
+        finally:
+            pooled.depth -= 1
+            if not pooled.depth and not pooled.closed and pooled.conn.in_transaction:
+                pooled.conn.rollback()
+
+    def close_thread_connection(self):
+        """Closes the connection of the calling thread (a new one is opened on the next use)"""
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is not None:
+            pooled.close()
+            self._local.pooled = None
+
+    def close(self):
+        """Closes the connections of all threads. Call it when no worker uses the database anymore (app exit)"""
+        with self._pool_lock:
+            pooled_connections = list(self._pool)
+        for pooled in pooled_connections:
+            pooled.close()
+        self.logger.info(f"Closed {len(pooled_connections)} database connection(s)")
+
+    def _thread_connection(self) -> _PooledConnection:
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is None or pooled.closed:
+            pooled = self._local.pooled = _PooledConnection(self._connect())
+            with self._pool_lock:
+                self._pool.add(pooled)
+        return pooled
+
+    def _connect(self) -> sqlite3.Connection:
+        retries = 3
+        for attempt in range(retries):
+            try:
+                # check_same_thread=False only so close() may close it from the GUI thread -
+                # a connection is never used by two threads
+                conn = sqlite3.connect(self.db_path, timeout=10, cached_statements=self.CACHED_STATEMENTS,
+                                       check_same_thread=False)
                 try:
-                    conn = sqlite3.connect(self.db_path, timeout=10)  # Add timeout
-                    yield conn
-                    break
-                except sqlite3.OperationalError as e:
-                    if attempt < retries - 1:
-                        self.logger.warning(f"DB connection failed, retrying in 0.5s: {e}")
-                        time.sleep(0.5)
-                    else:
-                        self.logger.error(f"DB connection failed after {retries} attempts: {e} |#| ({type(e).__name__})", exc_info=True)
-                        raise
+                    for pragma in self.CONNECTION_PRAGMAS:
+                        conn.execute(pragma)
+                except sqlite3.Error:
+                    conn.close()
+                    raise
+                return conn
+            except sqlite3.OperationalError as e:
+                if attempt < retries - 1:
+                    self.logger.warning(f"DB connection failed, retrying in 0.5s: {e}")
+                    time.sleep(0.5)
+                else:
+                    self.logger.error(f"DB connection failed after {retries} attempts: {e} |#| ({type(e).__name__})", exc_info=True)
+                    raise
 
     def get_xpath_rules(self, domain: str, url_contains: str):
         with self.get_db_connection() as conn:
@@ -239,26 +363,58 @@ class DBHandler:
         # Ensure value is a string
         value = str(value) if value is not None else ""
 
+        # idx_unique_tab_rule_value rejects duplicates: ignore them, or raise without avoid_duplicates
+        insert = "INSERT OR IGNORE" if avoid_duplicates else "INSERT"
         with self.get_db_connection() as conn:
             cursor = conn.cursor()
             try:
-                conn.execute("BEGIN")  # Start transaction
-                if avoid_duplicates:
-                    cursor.execute("""
-                        SELECT 1 
-                        FROM xpath_extracted_data
-                        WHERE tab_id = ? AND rule_id = ? AND value = ?
-                        LIMIT 1
-                    """, (tab_id, rule_id, value))
-                    if cursor.fetchone():
-                        return  # Value already exists → don't insert again
-
-                cursor.execute("""
-                    INSERT INTO xpath_extracted_data (tab_id, rule_id, value, extracted_at)
+                cursor.execute(f"""
+                    {insert} INTO xpath_extracted_data (tab_id, rule_id, value, extracted_at)
                     VALUES (?, ?, ?, ?)
                 """, (tab_id, rule_id, value, extracted_at))
                 conn.commit()
-                self.logger.info(f"Saved extracted data: tab_id={tab_id}, rule_id={rule_id}")
+                if cursor.rowcount:
+                    self.logger.info(f"Saved extracted data: tab_id={tab_id}, rule_id={rule_id}")
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Failed to save extracted data: {e} |#| ({type(e).__name__})", exc_info=True)
+                raise
+
+    def save_extracted_results(self, results: list[tuple], extracted_at=None) -> list[tuple]:
+        """
+        Saves the extracted values of several tabs in one transaction (group commit).
+
+        results: (session_id, url_hash, url, [(rule_id, value), ...]) per tab; missing tabs are created.
+        Returns (tab_id, number of new rows) per entry.
+        """
+        if extracted_at is None:
+            extracted_at = datetime.utcnow().isoformat()
+
+        with self.get_db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                conn.execute("BEGIN IMMEDIATE")   # take the write lock now, not halfway through
+                saved = []
+                for session_id, url_hash, url, values in results:
+                    cursor.execute("SELECT id FROM xpath_tabs WHERE session_id = ? AND url_hash = ?", (session_id, url_hash))
+                    row = cursor.fetchone()
+                    if row:
+                        tab_id = row[0]
+                    else:
+                        cursor.execute("INSERT INTO xpath_tabs (session_id, url_hash, url) VALUES (?, ?, ?)", (session_id, url_hash, url))
+                        tab_id = cursor.lastrowid
+
+                    cursor.executemany("""
+                        INSERT OR IGNORE INTO xpath_extracted_data (tab_id, rule_id, value, extracted_at)
+                        VALUES (?, ?, ?, ?)
+                    """, [
+                        (tab_id, rule_id, str(value) if value is not None else "", extracted_at)
+                        for rule_id, value in values
+                    ])
+                    saved.append((tab_id, max(cursor.rowcount, 0)))
+                conn.commit()
+                self.logger.info(f"Saved {sum(count for _, count in saved)} extracted values of {len(saved)} tab(s)")
+                return saved
             except Exception as e:
                 conn.rollback()
                 self.logger.error(f"Failed to save extracted data: {e} |#| ({type(e).__name__})", exc_info=True)
@@ -272,9 +428,9 @@ class DBHandler:
             FROM xpath_extracted_data ed
             JOIN xpath_rules r ON ed.rule_id = r.id
             JOIN xpath_tabs t ON ed.tab_id = t.id
-            WHERE t.url LIKE ?
+            WHERE t.url = ?
             ORDER BY r.priority ASC
-            """, (f"%{url}%",))
+            """, (url,))
             rows = cursor.fetchall()
             data = {}
             for rule_id, name, value, is_filter, is_image, priority in rows:
@@ -361,14 +517,26 @@ class DBHandler:
             rows = cursor.fetchall()
         return [r[0] for r in rows if r and r[0] is not None]
 
-    def get_or_create_session_id(self, filepath: str) -> int:
+    def get_or_create_session_id(self, filepath: str, content_hash: str = None) -> int:
+        """
+        A known content hash wins over the path, so a copied backup gets the ID (and the
+        extracted data) of the original. Otherwise the path is used and its hash updated.
+        """
         with self.get_db_connection() as conn:
             cursor = conn.cursor()
+            if content_hash:
+                cursor.execute("SELECT id FROM app_sessions WHERE content_hash = ? ORDER BY id LIMIT 1", (content_hash,))
+                row = cursor.fetchone()
+                if row:
+                    return row[0]
             cursor.execute("SELECT id FROM app_sessions WHERE filepath = ?", (filepath,))
             row = cursor.fetchone()
             if row:
+                if content_hash:
+                    cursor.execute("UPDATE app_sessions SET content_hash = ? WHERE id = ?", (content_hash, row[0]))
+                    conn.commit()
                 return row[0]
-            cursor.execute("INSERT INTO app_sessions (filepath) VALUES (?)", (filepath,))
+            cursor.execute("INSERT INTO app_sessions (filepath, content_hash) VALUES (?, ?)", (filepath, content_hash))
             conn.commit()
             return cursor.lastrowid
 
@@ -468,6 +636,7 @@ class DBHandler:
                         """, (domain_id, name, xpath, is_filter, is_image, priority, is_global))
 
                 conn.commit()
+                self._invalidate_rule_matcher()
                 self.logger.info(f"Saved/updated {len(rules)} XPath rule(s) for domain={domain} (url_contains='{url_contains}')")
             except Exception as e:
                 conn.rollback()
@@ -480,6 +649,26 @@ class DBHandler:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM xpath_rules WHERE id = ?", (rule_id,))
             conn.commit()
+        self._invalidate_rule_matcher()
+
+    def get_rule_matcher(self) -> RuleMatcher:
+        """
+        RuleMatcher over all XPath rules, resolves the rules of a URL without a query.
+        Built on first use and again after save_xpath_rules()/delete_xpath_rule().
+        """
+        matcher = self._rule_matcher
+        if matcher is None:
+            version = self._rules_version
+            with self.get_db_connection() as conn:
+                domains = conn.execute("SELECT domain, url_contains FROM xpath_domains ORDER BY domain, url_contains").fetchall()
+            matcher = RuleMatcher(domains, self.get_xpath_rules("", ""))
+            if version == self._rules_version:
+                self._rule_matcher = matcher
+        return matcher
+
+    def _invalidate_rule_matcher(self):
+        self._rules_version += 1
+        self._rule_matcher = None
 
     def save_extended_url(self, tab_id: int, group_name: str, extended_url: str):
         with self.get_db_connection() as conn:
@@ -738,14 +927,14 @@ class DBHandler:
         """Alle ExtendedUrls für eine bestimmte Gruppe zurückgeben."""
         with self.get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT extended_url FROM xpath_extended_urls WHERE group_name LIKE ?", (f"%{group}%",))
+            cursor.execute("SELECT extended_url FROM xpath_extended_urls WHERE group_name = ?", (group,))
             return [row[0] for row in cursor.fetchall()]
 
     def count_urls_by_group(self, group):
         """Zählt, wie viele Tabs noch keine ExtendedUrl besitzen (für Bonus-Anzeige)."""
         with self.get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM xpath_extended_urls WHERE group_name LIKE ? AND extended_url IS NULL", (f"%{group}%",))
+            cursor.execute("SELECT COUNT(*) FROM xpath_extended_urls WHERE group_name = ? AND extended_url IS NULL", (group,))
             return cursor.fetchone()[0]
 
     def get_extracted_data_for_rule(self, tab_id: int, rule_id: int) -> list:
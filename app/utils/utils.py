@@ -14,6 +14,7 @@ class UtilsHelper:
         self.status_bar = status_bar
         self.session_loader = session_loader
         self.parent_widget = parent_widget
+        self.session_parser = None  # SessionParser of the loaded session (set by the main window)
     
     def extract_domain(self, url: str) -> str:
         """Extrahiert den Hostnamen aus einer URL, ohne 'www.' am Anfang."""
@@ -148,9 +149,9 @@ class UtilsHelper:
     
     def export_as_json(self):
         from PySide6.QtWidgets import QFileDialog
-        import json
+        from app.utils import codec
 
-        self.json_data = self.session_loader.session_processor.json_data
+        self.json_data = self.session_parser.json_data if self.session_parser else None
         if not self.json_data:
             self.status_bar.show_message(tr("No session data loaded to export.", "warning"), message_type="warning")
             return
@@ -166,8 +167,8 @@ class UtilsHelper:
     
         if fileName:
             try:
-                with open(fileName, 'w', encoding='utf-8') as f:
-                    json.dump(self.json_data, f, indent=4)
+                # indent=2 instead of 4: orjson only supports 2, and the file is much faster to write
+                codec.json_dump_file(self.json_data, fileName, indent=2)
                 self.status_bar.show_message(tr("Session saved as JSON successfully.", "info"), message_type="success")
 
             except Exception as e:
@@ -175,114 +176,65 @@ class UtilsHelper:
                 self.logger.error(f"{tr('Could not save file', 'error')} {fileName}: {e} |#| ({type(e).__name__})", exc_info=True)
 
     def apply_search_filter(self, text):
-        from PySide6.QtWidgets import QTreeWidgetItem
+        """Filters the tab tree in place (rows are hidden, the tree is not rebuilt)"""
         text = text.strip().lower()
+        session_widget = self.parent_widget.ccw.session_widget
 
         if not text:
-            self.parent_widget.populate_group_and_tabs(self.parent_widget.session_tabs, self.parent_widget.group_list)
+            session_widget.set_tab_filter(None)
             return
 
-        filtered_tabs = []
-        for tab in self.parent_widget.session_tabs:
-            title = tab.get("title", "").lower()
-            url = tab.get("url", "").lower()
-            uuid = tab.get("uuid", "").lower()
-            if text in title or text in url or text in uuid:
-                filtered_tabs.append(tab)
-
-        if not filtered_tabs:
-            self.parent_widget.ccw.session_widget.clear()
-            QTreeWidgetItem(self.parent_widget.ccw.session_widget, [tr("No results for '{0}'", "search", text)])
-            return
-        self.parent_widget.populate_group_and_tabs(filtered_tabs, self.parent_widget.group_list)
+        matches = self.parent_widget.search_index.search(text)
+        if not session_widget.set_tab_filter(matches) and self.status_bar:
+            self.status_bar.show_message(tr("No results for '{0}'", "search", text), message_type="info")
 
-    def find_duplicates(self):
-        import re
+    def show_duplicate_clusters(self, clusters):
+        """Replaces the tab tree with the clusters of the DedupEngine (one top-level item per cluster)"""
         from collections import defaultdict
-        from PySide6.QtWidgets import QTreeWidgetItem
+        from app.ui.helpers import SessionTreeItem
         from PySide6.QtCore import Qt
 
-        if not self.parent_widget.session_tabs:
-            #QMessageBox.warning(self, "Error", "No Tabs loaded.")
-            return
-
-        if not (self.parent_widget.lcw.dup_title_cb.isChecked() or self.parent_widget.lcw.dup_url_cb.isChecked()):
-            self.parent_widget.populate_group_and_tabs(self.parent_widget.session_tabs, self.parent_widget.group_list)
+        session_widget = self.parent_widget.ccw.session_widget
+        session_widget.clear()
+        if not clusters:
+            SessionTreeItem(session_widget, [tr("No duplications found", "Tools")])
             return
 
-        duplicates = defaultdict(list)
-
-        for tab in self.parent_widget.session_tabs:
-            key_parts = []
-
-            if self.parent_widget.lcw.dup_title_cb.isChecked():
-                key_parts.append(tab.get('title', '').lower().strip())
-
-            if self.parent_widget.lcw.dup_url_cb.isChecked():
-                url_to_compare = tab.get('url', '').strip()
-                if self.parent_widget.lcw.regex_checkbox.isChecked() and self.parent_widget.lcw.regex_input.currentText():
-                    try:
-                        regex_pattern = self.parent_widget.lcw.regex_input.currentText()
-                        match = re.search(regex_pattern, url_to_compare)
-                        if match:
-                            url_key_part = "".join(match.groups())
-                        else:
-                            url_key_part = url_to_compare
-                    except re.error as e:
-                        self.parent_widget.ccw.session_widget.clear()
-                        QTreeWidgetItem(self.parent_widget.ccw.session_widget, [tr("Invalid RegEx: {0}", "Tools", e)])
-
-                        return
+        keep_groups = self.parent_widget.lcw.dup_keep_group.isChecked()
+        with session_widget.bulk_update():
+            for dupe_num, cluster in enumerate(clusters, start=1):
+                key_text = " / ".join([p for p in cluster.key if p])
+                if cluster.kind == "similar":
+                    key_text = f"~ {key_text}"
+                dupe_item = SessionTreeItem(session_widget, [f"Dup: {dupe_num}: {key_text}"])
+
+                if keep_groups:
+                    # Fenster → Gruppen → Tabs
+                    wnd_group_map = defaultdict(lambda: defaultdict(list))
+                    for tab in cluster.tabs:
+                        wnd = tab.get("window_index", 0)
+                        group = tab.get("group_name", tr("Ungrouped", "Groups"))
+                        wnd_group_map[wnd][group].append(tab)
+                    for wnd, group_map in sorted(wnd_group_map.items()):
+                        wnd_label = f"Fenster {wnd + 1}"
+                        wnd_item = SessionTreeItem(dupe_item, [wnd_label])
+                        for group_name, tabs in sorted(group_map.items()):
+                            group_item = SessionTreeItem(wnd_item, [group_name])
+                            for tab in tabs:
+                                title = tab.get("title", "")
+                                url = tab.get("url", "")
+                                label = f"{title} ({url})"
+                                tab_item = SessionTreeItem(group_item, [label])
+                                tab_item.setData(0, Qt.UserRole, tab)
                 else:
-                    url_key_part = url_to_compare
-                key_parts.append(url_key_part)
-
-            if key_parts:
-                duplicates[tuple(key_parts)].append(tab)
-
-        self.parent_widget.ccw.session_widget.clear()
-        dupe_num = 0
-        found_duplicates = False
-
-        for key, tab_list in duplicates.items():
-            if len(tab_list) < 2:
-                continue
-            found_duplicates = True
-            dupe_num += 1
-            
-            key_text = " / ".join([p for p in key if p])
-            dupe_item = QTreeWidgetItem(self.parent_widget.ccw.session_widget,
-                                        [f"Dup: {dupe_num}: {key_text}"])
-
-            if self.parent_widget.lcw.dup_keep_group.isChecked():
-                # Fenster → Gruppen → Tabs
-                wnd_group_map = defaultdict(lambda: defaultdict(list))
-                for tab in tab_list:
-                    wnd = tab.get("window_index", 0)
-                    group = tab.get("group_name", tr("Ungrouped", "Groups"))
-                    wnd_group_map[wnd][group].append(tab)
-                for wnd, group_map in sorted(wnd_group_map.items()):
-                    wnd_label = f"Fenster {wnd + 1}"
-                    wnd_item = QTreeWidgetItem(dupe_item, [wnd_label])
-                    for group_name, tabs in sorted(group_map.items()):
-                        group_item = QTreeWidgetItem(wnd_item, [group_name])
-                        for tab in tabs:
-                            title = tab.get("title", "")
-                            url = tab.get("url", "")
-                            label = f"{title} ({url})"
-                            tab_item = QTreeWidgetItem(group_item, [label])
-                            tab_item.setData(0, Qt.UserRole, tab)
-            else:
-                for tab in tab_list:
-                    title = tab.get('title', '')
-                    group_name = tab.get('group_name', tr("Ungrouped", "Groups"))
-                    label = f"{title} ({group_name})"
-                    tab_item = QTreeWidgetItem(dupe_item, [label])
-                    tab_item.setData(0, Qt.UserRole, tab)
-
-        if not found_duplicates:
-            self.parent_widget.ccw.session_widget.clear()
-            QTreeWidgetItem(self.parent_widget.ccw.session_widget, [tr("No duplications found", "Tools")])
+                    for tab in cluster.tabs:
+                        title = tab.get('title', '')
+                        group_name = tab.get('group_name', tr("Ungrouped", "Groups"))
+                        if isinstance(tab, dict):
+                            group_name = f"{group_name}, {tr('closed', 'Tools')}"
+                        label = f"{title} ({group_name})"
+                        tab_item = SessionTreeItem(dupe_item, [label])
+                        tab_item.setData(0, Qt.UserRole, tab)
 
              
              